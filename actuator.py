@@ -1,20 +1,49 @@
-from time import sleep
-
-import pyautogui
+import heapq
+import threading
+from time import perf_counter, sleep
 
 from base.direc import Direc
+from input_backends import InputBackend, PyAutoGUIBackend
+
+# Ultimos segundos antes de una tecla que se esperan activamente en vez de dormir,
+# para que la tecla salga lo más cerca posible del tiempo programado
+SPIN_TIME = 0.002
+
+
+class KeyEvent:
+    """Registro de una tecla: cuándo se programó y cuándo se envió realmente."""
+
+    def __init__(self, direc: Direc, scheduled: float, sent: float):
+        self.direc = direc
+        self.scheduled = scheduled
+        self.sent = sent
+
+    def __str__(self):
+        return (
+            f"KeyEvent({self.direc.name}, scheduled={self.scheduled:.4f}, "
+            f"late={1000 * self.lateness:.2f}ms)"
+        )
+
+    __repr__ = __str__
+
+    @property
+    def lateness(self):
+        """Segundos de retraso entre el tiempo programado y el envío."""
+        return self.sent - self.scheduled
 
 
 class Actuator:
     """
-    Actuador externo: envía teclas al ambiente con pyautogui.
+    Actuador externo: envía teclas al ambiente con un InputBackend, por defecto pyautogui.
+    Las teclas se programan en una cola que atiende un hilo propio, así que quien
+    llama nunca se bloquea esperando a que se presione la tecla.
     Envía la tecla solo si cambia la acción.
+    Los tiempos son los de time.perf_counter().
     """
 
-    # 0.1235
-    # 0.11
-    def __init__(self, key_delay : int = 0):
+    def __init__(self, key_delay: float = 0, backend: InputBackend = None):
         self.key_delay = key_delay
+        self.backend = backend or PyAutoGUIBackend()
         self.keymap = {
             # Las claves son los OBJETOS de la enumeración Direc
             Direc.UP: "up",
@@ -22,34 +51,189 @@ class Actuator:
             Direc.LEFT: "left",
             Direc.RIGHT: "right",
         }
+        self.log = []  # KeyEvent de cada tecla enviada
 
-    def send(self, direc: Direc):
-        """Envía la dirección indicada al ambiente."""
-        if direc is None:
-            return
+        self._queue = []  # heap de (tiempo, secuencia, direc)
+        self._seq = 0
+        self._sent_direc = None  # Última dirección que el backend envió sin fallar
+        self._sending = None  # Dirección que el hilo está enviando
+        self._epoch = 0  # Cambia en cada reset(), los envíos anteriores ya no cuentan
+        self._cond = threading.Condition()
+        self._running = True
+        self._busy = False  # El hilo está enviando una tecla
+        self._error = None  # Excepción del backend que aún no se reporta
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    @property
+    def stats(self):
+        """Estadísticas de latencia de envío del backend."""
+        return self.backend.stats
+
+    @property
+    def last_direc(self):
+        """Dirección en la que queda el juego: la última de la cola, la que se está
+        enviando o la última que se envió."""
+        with self._cond:
+            return self._newest_direc()
+
+    def _newest_direc(self):
+        if self._queue:
+            return max(self._queue)[2]
+        if self._sending is not None:
+            return self._sending
+        return self._sent_direc
+
+    def reset(self, direc: Direc = None):
+        """
+        Descarta las teclas pendientes, ej: al reiniciar el juego.
+        Parametros:
+        direc (Direc): Dirección en la que ya va el juego, o None si no se sabe
+        """
+        with self._cond:
+            self._queue.clear()
+            self._sending = None
+            self._sent_direc = direc
+            self._epoch += 1
 
-        sleep(self.key_delay)
-        # Obtiene la cadena de la tecla (ej: "up") usando el objeto Direc (ej: Direc.UP)
-        key = self.keymap.get(direc)
+    def schedule(self, direc: Direc, at: float = None) -> bool:
+        """
+        Programa presionar la dirección en el tiempo indicado.
+        Parametros:
+        direc (Direc): Dirección a enviar
+        at (float): Tiempo de perf_counter() en el que se quiere la tecla. Por defecto
+        ahora más key_delay.
+        Regresa:
+        bool: False si la tecla se descartó porque no cambia la dirección
+        Si el backend falló al enviar una tecla anterior, se lanza aquí su excepción.
+        """
+        if direc is None:
+            return False
 
-        if not key:
+        if direc not in self.keymap:
             raise ValueError(f"Dirección no válida '{direc.name}'.")
 
-        # Aquí se presiona la tecla de flecha común (ej: 'up', 'down')
-        pyautogui.press(key)
+        if at is None:
+            at = perf_counter() + self.key_delay
+
+        self._raise_error()
+        with self._cond:
+            if not self._running:
+                raise RuntimeError("El actuador ya se cerro")
+            # La misma dirección que la anterior no cambia nada en el juego
+            if direc == self._newest_direc():
+                return False
+            heapq.heappush(self._queue, (at, self._seq, direc))
+            self._seq += 1
+            self._cond.notify()
+        return True
+
+    def send(self, direc: Direc) -> bool:
+        """Envía la dirección indicada al ambiente sin bloquear a quien llama."""
+        return self.schedule(direc)
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Espera a que se envíen todas las teclas pendientes.
+        Si el backend falló al enviar alguna, se lanza aquí su excepción.
+        """
+        end = None if timeout is None else perf_counter() + timeout
+        with self._cond:
+            while self._queue or self._busy:
+                remaining = None if end is None else end - perf_counter()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        self._raise_error()
+        return True
+
+    def close(self, flush: bool = True):
+        """Detiene el hilo del actuador, por defecto después de enviar lo pendiente.
+        Si el backend falló al enviar alguna tecla, se lanza su excepción al terminar."""
+        try:
+            if flush:
+                self.flush()
+        finally:
+            with self._cond:
+                self._running = False
+                self._queue.clear()
+                self._cond.notify_all()
+            self._worker.join()
+            self.backend.close()
+        self._raise_error()
+
+    def _raise_error(self):
+        with self._cond:
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running:
+                    if self._queue:
+                        wait = self._queue[0][0] - perf_counter()
+                        if wait <= SPIN_TIME:
+                            break
+                        self._cond.wait(wait - SPIN_TIME)
+                    else:
+                        self._cond.wait()
+                if not self._running:
+                    return
+                at, _, direc = heapq.heappop(self._queue)
+                self._busy = True
+                self._sending = direc
+                epoch = self._epoch
+
+            # Espera activa los ultimos instantes fuera del lock
+            while perf_counter() < at:
+                sleep(0)
+
+            # Aquí se presiona la tecla de flecha común (ej: 'up', 'down'). Si el backend
+            # falla, el hilo sigue vivo y la excepción se entrega en schedule(), flush() o
+            # close(). La dirección no cuenta como enviada, así se puede volver a programar
+            try:
+                self.backend.send(self.keymap[direc])
+                self.log.append(KeyEvent(direc, at, perf_counter()))
+                with self._cond:
+                    if epoch == self._epoch:
+                        self._sent_direc = direc
+            except Exception as error:
+                with self._cond:
+                    if self._error is None:
+                        self._error = error
+            finally:
+                with self._cond:
+                    self._busy = False
+                    if epoch == self._epoch:
+                        self._sending = None
+                    self._cond.notify_all()
+
 
 if __name__ == "__main__":
+    import pyautogui
+
     act = Actuator(0.055)
 
     pyautogui.hotkey("alt", "tab")
     sleep(0.3)
 
-
     directions = [Direc.RIGHT, Direc.RIGHT, Direc.DOWN, Direc.DOWN, Direc.LEFT, Direc.LEFT, Direc.UP, Direc.UP]
+    tick = 0.1235
+    start = perf_counter()
     n = 0
     while n < 2:
         for i in range(len(directions)):
-            act.send(directions[i])
+            act.schedule(directions[i], start + tick * (n * len(directions) + i))
 
-        n += 1 
+        n += 1
 
+    act.close()
+    for event in act.log:
+        print(event)
+    print(act.stats.summary())
@@ -0,0 +1,212 @@
+import random
+from collections import deque
+
+from base.direc import DELTAS, MOVES, PREFERRED
+from base.point import PointType
+from base.pos import Pos
+
+_EMPTY = PointType.EMPTY
+_FOOD = PointType.FOOD
+_WALL = PointType.WALL
+
+
+class Bitboard:
+    """
+    Tablero con un bit por casilla guardado en enteros de Python, índice fila * columnas + columna.
+    - free: casillas vacías o con comida.
+    - walls: muros del borde.
+    - food: la comida, si hay.
+
+    Un BFS expande todo el frente a la vez con corrimientos: izquierda/derecha son >> 1 y << 1,
+    arriba/abajo son >> columnas y << columnas. No hacen falta máscaras de borde porque el borde
+    son muros y el frente siempre se filtra con free, así que un bit nunca pasa de una fila a otra.
+    Alcance, área y capas de distancia cuestan O(distancia) operaciones de enteros en vez de
+    un ciclo de Python por casilla.
+    """
+
+    def __init__(self, num_rows, num_cols, free=0, walls=0, food=0):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.free = free
+        self.walls = walls
+        self.food = food
+        self.stale = False
+
+    @classmethod
+    def from_map(cls, game_map):
+        """Crea el tablero de bits a partir de un Map."""
+        board = cls(game_map.num_rows, game_map.num_cols)
+        board.load(game_map)
+        return board
+
+    def load(self, game_map):
+        """Vuelve a leer free, walls y food del mapa. Los bits se arman como un texto de
+        '0' y '1' que se convierte de una vez, así el costo por casilla es el de un join."""
+        free, walls = [], []
+        for row in reversed(game_map.content):
+            for point in reversed(row):
+                t = point.type
+                free.append("1" if t is _EMPTY or t is _FOOD else "0")
+                walls.append("1" if t is _WALL else "0")
+        self.free = int("".join(free), 2)
+        self.walls = int("".join(walls), 2)
+        self.food = 0 if game_map.food is None else self.bit(game_map.food)
+        self.stale = False
+
+    # Avisos del mapa, ver Map.track_bitboard
+    def occupied(self, pos):
+        self.free &= ~(1 << (pos.x * self.num_cols + pos.y))
+
+    def freed(self, pos):
+        self.free |= 1 << (pos.x * self.num_cols + pos.y)
+
+    def food_changed(self, pos):
+        # La comida se vuelve a leer del mapa en Map.bitboard
+        pass
+
+    def reset(self):
+        # Después de un reinicio la serpiente se escribe sin avisos, se relee al consultarlo
+        self.stale = True
+
+    def to_map(self, game_map=None):
+        """
+        Escribe el tablero en un Map, por defecto uno nuevo. El tablero de bits no guarda la
+        forma de la serpiente, las casillas ocupadas quedan como PointType.BODY_HOR.
+        """
+        if game_map is None:
+            from base.map import Map
+
+            game_map = Map(self.num_rows, self.num_cols)
+        game_map.rm_food()
+        cols = self.num_cols
+        for i, row in enumerate(game_map.content):
+            for j, point in enumerate(row):
+                bit = 1 << (i * cols + j)
+                if self.walls & bit:
+                    point.type = _WALL
+                elif self.free & bit:
+                    point.type = _EMPTY
+                else:
+                    point.type = PointType.BODY_HOR
+        if self.food:
+            idx = self.food.bit_length() - 1
+            game_map.create_food(self.pos(idx))
+        return game_map
+
+    def index(self, pos):
+        return pos.x * self.num_cols + pos.y
+
+    def bit(self, pos):
+        return 1 << (pos.x * self.num_cols + pos.y)
+
+    def pos(self, idx):
+        return Pos(idx // self.num_cols, idx % self.num_cols)
+
+    def is_free(self, pos):
+        return (self.free >> (pos.x * self.num_cols + pos.y)) & 1 == 1
+
+    def expand(self, bits):
+        """Bits vecinos de bits en las cuatro direcciones, sin filtrar."""
+        cols = self.num_cols
+        return (bits << 1) | (bits >> 1) | (bits << cols) | (bits >> cols)
+
+    def reachable(self, src, passable=None):
+        """
+        Casillas libres alcanzables desde src, como entero de bits.
+        Parametros:
+        src (Pos o int): Posición o bits de inicio, pueden estar ocupados (ej: la cabeza)
+        passable (int): Casillas transitables, por defecto free
+        """
+        passable = self.free if passable is None else passable
+        seen = src if isinstance(src, int) else self.bit(src)
+        frontier = seen
+        while frontier:
+            frontier = self.expand(frontier) & passable & ~seen
+            seen |= frontier
+        return seen & passable
+
+    def area(self, src, passable=None):
+        """Cantidad de casillas libres alcanzables desde src."""
+        return self.reachable(src, passable).bit_count()
+
+    def distance_layers(self, src, passable=None, stop=0):
+        """
+        Capas del BFS desde src: la capa k tiene las casillas a distancia k. Termina cuando
+        el frente se vacía o cuando toca algún bit de stop.
+        """
+        passable = self.free if passable is None else passable
+        frontier = src if isinstance(src, int) else self.bit(src)
+        seen = frontier
+        layers = [frontier]
+        while frontier and not frontier & stop:
+            frontier = self.expand(frontier) & passable & ~seen
+            if not frontier:
+                break
+            seen |= frontier
+            layers.append(frontier)
+        return layers
+
+    def distance(self, src, des, passable=None):
+        """Distancia del camino más corto de src a des, -1 si no hay. des puede estar ocupada."""
+        dbit = self.bit(des)
+        passable = (self.free if passable is None else passable) | dbit
+        layers = self.distance_layers(src, passable, dbit)
+        return len(layers) - 1 if layers[-1] & dbit else -1
+
+    def path(self, src, des, first_direc=None, passable=None, straight=True):
+        """
+        Camino más corto de src a des como cola de direcciones, vacía si no hay.
+        Con las capas del BFS se marcan de des hacia atrás las casillas que están en algún
+        camino más corto, y se recorre desde src prefiriendo seguir derecho, empezando por
+        first_direc. Con straight=False los empates se rompen al azar.
+        """
+        dbit = self.bit(des)
+        passable = (self.free if passable is None else passable) | dbit
+        layers = self.distance_layers(src, passable, dbit)
+        if not layers[-1] & dbit or len(layers) == 1:
+            return deque()
+
+        on_path = [0] * len(layers)
+        on_path[-1] = dbit
+        for k in range(len(layers) - 2, 0, -1):
+            on_path[k] = layers[k] & self.expand(on_path[k + 1])
+
+        cols = self.num_cols
+        path = deque()
+        cur = self.index(src)
+        prev_direc = first_direc
+        for k in range(1, len(layers)):
+            if not straight:
+                order = random.sample(MOVES, 4)
+            else:
+                order = MOVES if prev_direc is None else PREFERRED[prev_direc._value_]
+            for direc in order:
+                dx, dy = DELTAS[direc._value_]
+                nxt = cur + dx * cols + dy
+                if (on_path[k] >> nxt) & 1:
+                    break
+            path.append(direc)
+            cur, prev_direc = nxt, direc
+        return path
+
+    def copy(self):
+        return Bitboard(self.num_rows, self.num_cols, self.free, self.walls, self.food)
+
+    def __str__(self):
+        rows = []
+        for i in range(self.num_rows):
+            line = []
+            for j in range(self.num_cols):
+                bit = 1 << (i * self.num_cols + j)
+                if self.walls & bit:
+                    line.append("#")
+                elif self.food & bit:
+                    line.append("*")
+                elif self.free & bit:
+                    line.append(".")
+                else:
+                    line.append("o")
+            rows.append("".join(line))
+        return "\n".join(rows)
+
+    __repr__ = __str__
@@ -0,0 +1,196 @@
+from base.point import PointType
+
+_EMPTY = PointType.EMPTY
+_FOOD = PointType.FOOD
+
+
+class Connectivity:
+    """
+    Regiones conectadas de casillas libres (vacías o con comida) mantenidas con union-find.
+    Se registra como observador del mapa: Snake.move avisa cuando la cabeza ocupa una casilla
+    y cuando la cola libera otra.
+
+    - Liberar una casilla la une con sus vecinas libres, O(α).
+    - Ocupar una casilla solo resta uno al área de su región si la prueba local del anillo de
+      8 vecinas muestra que no puede partir la región. Si puede partirla, las regiones se
+      reconstruyen con una pasada por el mapa en la siguiente consulta.
+
+    Los cambios hechos directo con point().type no se avisan, en ese caso hay que llamar
+    invalidate().
+    """
+
+    def __init__(self, game_map):
+        self._map = game_map
+        self._cols = game_map.num_cols
+        num = game_map.num_rows * game_map.num_cols
+        self._node = [-1] * num  # Nodo del union-find de cada casilla libre, -1 si ocupada
+        self._parent = []
+        self._size = []  # Casillas libres de cada región, solo es válido en la raíz
+        self._max_nodes = 4 * num
+        cols = self._cols
+        # Anillo de vecinas en orden: N, NE, E, SE, S, SW, W, NW
+        self._ring = (-cols, -cols + 1, 1, cols + 1, cols, cols - 1, -1, -cols - 1)
+        self._dirty = True
+        self.rebuilds = 0
+
+    @property
+    def map(self):
+        return self._map
+
+    def invalidate(self):
+        """Marca las regiones para reconstruirlas en la siguiente consulta."""
+        self._dirty = True
+
+    # Avisos del mapa
+    def reset(self):
+        self._dirty = True
+
+    def occupied(self, pos):
+        if self._dirty:
+            return
+        idx = pos.x * self._cols + pos.y
+        node = self._node[idx]
+        if node == -1:
+            return
+        if not self._is_simple(idx):
+            self._dirty = True
+            return
+        self._node[idx] = -1
+        self._size[self._find(node)] -= 1
+
+    def freed(self, pos):
+        if self._dirty:
+            return
+        idx = pos.x * self._cols + pos.y
+        if self._node[idx] != -1:
+            return
+        if len(self._parent) >= self._max_nodes:
+            # Cada casilla liberada crea un nodo nuevo, se compacta de vez en cuando
+            self._dirty = True
+            return
+        node = self._new_node(idx)
+        cols = self._cols
+        for nxt in (idx - cols, idx + 1, idx + cols, idx - 1):
+            other = self._node[nxt]
+            if other != -1:
+                node = self._union(node, other)
+
+    def food_changed(self, pos):
+        # La comida cuenta como casilla libre, poner o quitarla no cambia las regiones
+        pass
+
+    # Consultas
+    def region(self, pos):
+        """Identificador de la región de una casilla libre, -1 si está ocupada."""
+        self._ensure()
+        node = self._node[pos.x * self._cols + pos.y]
+        return -1 if node == -1 else self._find(node)
+
+    def region_size(self, pos):
+        """Casillas libres de la región de pos, 0 si está ocupada."""
+        region = self.region(pos)
+        return 0 if region == -1 else self._size[region]
+
+    def same_region(self, p1, p2):
+        region = self.region(p1)
+        return region != -1 and region == self.region(p2)
+
+    def regions_around(self, pos):
+        """Regiones de la casilla y de sus vecinas libres."""
+        self._ensure()
+        cols = self._cols
+        idx = pos.x * cols + pos.y
+        regions = set()
+        for nxt in (idx, idx - cols, idx + 1, idx + cols, idx - 1):
+            node = self._node[nxt]
+            if node != -1:
+                regions.add(self._find(node))
+        return regions
+
+    def may_reach(self, src, des):
+        """
+        Indica si puede existir un camino por casillas libres desde src hasta des. Las dos
+        puntas pueden estar ocupadas, ej: de la cabeza a la cola.
+        """
+        if abs(src.x - des.x) + abs(src.y - des.y) == 1:
+            return True
+        return not self.regions_around(src).isdisjoint(self.regions_around(des))
+
+    # Union-find
+    def _new_node(self, idx):
+        node = len(self._parent)
+        self._parent.append(node)
+        self._size.append(1)
+        self._node[idx] = node
+        return node
+
+    def _find(self, node):
+        parent = self._parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def _union(self, a, b):
+        a, b = self._find(a), self._find(b)
+        if a == b:
+            return a
+        if self._size[a] < self._size[b]:
+            a, b = b, a
+        self._parent[b] = a
+        self._size[a] += self._size[b]
+        return a
+
+    def _is_simple(self, idx):
+        """
+        Prueba local: ocupar la casilla no parte su región si las vecinas libres del anillo
+        de 8 forman a lo más un tramo que toque una vecina ortogonal. Es suficiente pero no
+        necesaria, si falla se reconstruye.
+        """
+        node = self._node
+        free = [node[idx + step] != -1 for step in self._ring]
+        if all(free):
+            return True
+        # Se empieza justo después de una casilla ocupada para no partir un tramo en dos
+        start = free.index(False)
+        runs = 0
+        in_run = touches = False
+        for k in range(1, 9):
+            i = (start + k) % 8
+            if free[i]:
+                in_run = True
+                touches = touches or i % 2 == 0
+            else:
+                if in_run and touches:
+                    runs += 1
+                in_run = touches = False
+        if in_run and touches:
+            runs += 1
+        return runs <= 1
+
+    def _ensure(self):
+        if self._dirty:
+            self._rebuild()
+
+    def _rebuild(self):
+        """Etiqueta todas las regiones con una pasada uniendo cada casilla libre con la de
+        arriba y la de la izquierda."""
+        cols = self._cols
+        node = self._node
+        self._parent = []
+        self._size = []
+        for i, row in enumerate(self._map.content):
+            base = i * cols
+            for j, point in enumerate(row):
+                idx = base + j
+                t = point.type
+                if t is _EMPTY or t is _FOOD:
+                    cur = self._new_node(idx)
+                    if node[idx - cols] != -1:
+                        cur = self._union(cur, node[idx - cols])
+                    if node[idx - 1] != -1:
+                        self._union(cur, node[idx - 1])
+                else:
+                    node[idx] = -1
+        self._dirty = False
+        self.rebuilds += 1
@@ -12,12 +12,30 @@ class Direc(Enum):
 
     @staticmethod
     def opposite(direc):
-        if direc == Direc.LEFT:
-            return Direc.RIGHT
-        if direc == Direc.RIGHT:
-            return Direc.LEFT
-        if direc == Direc.UP:
-            return Direc.DOWN
-        if direc == Direc.DOWN:
-            return Direc.UP
-        return Direc.NONE
\ No newline at end of file
+        return OPPOSITE[direc._value_]
+
+
+# Tablas indexadas por el valor de la dirección, se usan en los ciclos de movimiento y
+# búsqueda en lugar de comparar miembros del enum uno por uno
+OPPOSITE = (Direc.NONE, Direc.RIGHT, Direc.DOWN, Direc.LEFT, Direc.UP)
+
+# Cambio (fila, columna) de cada dirección, None para NONE
+DELTAS = (None, (0, -1), (-1, 0), (0, 1), (1, 0))
+
+# Direcciones de movimiento en el orden del enum, sin NONE
+MOVES = (Direc.LEFT, Direc.UP, Direc.RIGHT, Direc.DOWN)
+
+# Orden de prueba de las direcciones empezando por la indicada, para preferir seguir derecho
+PREFERRED = (MOVES,) + tuple((d,) + tuple(m for m in MOVES if m is not d) for d in MOVES)
+
+# Direcciones perpendiculares a cada dirección
+PERPENDICULAR = (
+    (),
+    (Direc.UP, Direc.DOWN),
+    (Direc.LEFT, Direc.RIGHT),
+    (Direc.UP, Direc.DOWN),
+    (Direc.LEFT, Direc.RIGHT),
+)
+
+# Dirección para llegar a una casilla adyacente según la diferencia (fila, columna)
+DIREC_BY_DELTA = {DELTAS[d._value_]: d for d in MOVES}
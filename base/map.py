@@ -1,5 +1,7 @@
 import random
 
+from base.bitboard import Bitboard
+from base.connectivity import Connectivity
 from base.point import Point, PointType
 from base.pos import Pos
 
@@ -20,29 +22,37 @@ class Map:
         self._num_cols = num_cols
         self._capacity = (num_rows - 2) * (num_cols - 2)
         self._content = [[Point() for _ in range(num_cols)] for _ in range(num_rows)]
+        self._watchers = []
+        self._connectivity = None
+        self._bitboard = None
         self.reset()
 
     def reset(self):
         """Reinicia el mapa a su estado inicial."""
         self._food = None
-        for i in range(self._num_rows):
-            for j in range(self._num_cols):
-                if (
-                    i == 0
-                    or i == self._num_rows - 1
-                    or j == 0
-                    or j == self._num_cols - 1
-                ):
-                    self._content[i][j].type = PointType.WALL
-                else:
-                    self._content[i][j].type = PointType.EMPTY
+        for watcher in self._watchers:
+            watcher.reset()
+        last = self._num_rows - 1
+        for i, row in enumerate(self._content):
+            if i == 0 or i == last:
+                for point in row:
+                    point.type = PointType.WALL
+                continue
+            for point in row:
+                point.type = PointType.EMPTY
+            row[0].type = row[-1].type = PointType.WALL
 
     def copy(self):
-        """Crea una copia del mapa."""
-        m_copy = Map(self._num_rows, self._num_cols)
-        for i in range(self._num_rows):
-            for j in range(self._num_cols):
-                m_copy._content[i][j].type = self._content[i][j].type
+        """Crea una copia del mapa, sin sus observadores."""
+        m_copy = Map.__new__(Map)
+        m_copy._num_rows = self._num_rows
+        m_copy._num_cols = self._num_cols
+        m_copy._capacity = self._capacity
+        m_copy._content = [[Point(point.type) for point in row] for row in self._content]
+        m_copy._watchers = []
+        m_copy._connectivity = None
+        m_copy._bitboard = None
+        m_copy._food = self._food
         return m_copy
 
     @property
@@ -61,6 +71,56 @@ class Map:
     def food(self):
         return self._food
 
+    @property
+    def content(self):
+        """Matriz de puntos indexada [fila][columna], incluye los muros. Sirve para
+        recorrer el mapa completo sin crear un Pos por casilla."""
+        return self._content
+
+    @property
+    def watchers(self):
+        """Observadores con los métodos occupied(pos), freed(pos), reset() y food_changed(pos).
+        Snake.move llama a los primeros cuando una casilla libre queda ocupada o se libera;
+        food_changed(pos) avisa que se puso o se quitó la comida en pos."""
+        return self._watchers
+
+    def add_watcher(self, watcher):
+        self._watchers.append(watcher)
+
+    def remove_watcher(self, watcher):
+        self._watchers.remove(watcher)
+
+    @property
+    def connectivity(self):
+        """Regiones libres mantenidas en cada movimiento, None si no se activó."""
+        return self._connectivity
+
+    def track_connectivity(self):
+        """Activa el seguimiento de las regiones libres y lo regresa. Las copias del mapa no lo tienen."""
+        if self._connectivity is None:
+            self._connectivity = Connectivity(self)
+            self.add_watcher(self._connectivity)
+        return self._connectivity
+
+    @property
+    def bitboard(self):
+        """Bitboard con las casillas libres al día, None si no se activó con track_bitboard."""
+        board = self._bitboard
+        if board is not None:
+            if board.stale:
+                board.load(self)
+            else:
+                board.food = 0 if self._food is None else board.bit(self._food)
+        return board
+
+    def track_bitboard(self):
+        """Activa un Bitboard que se actualiza con los avisos de Snake.move en vez de
+        recorrer el mapa en cada consulta, y lo regresa. Las copias del mapa no lo tienen."""
+        if self._bitboard is None:
+            self._bitboard = Bitboard.from_map(self)
+            self.add_watcher(self._bitboard)
+        return self.bitboard
+
     def point(self, pos):
         """Devuelve un punto del mapa en la posición dada.
         Pos tiene que ser una instancia de la clase Pos."""
@@ -87,7 +147,8 @@ class Map:
         )
 
     def is_full(self):
-        """Verifica si el mapa está lleno del cuerpo de la serpiente."""
+        """Verifica si el mapa está lleno del cuerpo de la serpiente. Recorre el mapa, en cada
+        movimiento es mejor comparar el largo de la serpiente con capacity (Snake.is_full)."""
         for i in range(1, self.num_rows - 1):
             for j in range(1, self.num_cols - 1):
                 t = self._content[i][j].type
@@ -101,24 +162,34 @@ class Map:
     def rm_food(self):
         """Elimina la comida del mapa."""
         if self.has_food():
-            self.point(self._food).type = PointType.EMPTY
+            food = self._food
+            self.point(food).type = PointType.EMPTY
             self._food = None
+            for watcher in self._watchers:
+                watcher.food_changed(food)
 
     def create_food(self, pos):
         """Agrega comida en la posición dada."""
         self.point(pos).type = PointType.FOOD
         self._food = pos
+        for watcher in self._watchers:
+            watcher.food_changed(pos)
         return self._food
 
     def create_rand_food(self):
-        empty_pos = []
+        """Pone la comida en una casilla vacía al azar. Solo se crea el Pos de la elegida."""
+        cols = self._num_cols
+        empty = []
         for i in range(1, self._num_rows - 1):
-            for j in range(1, self._num_cols - 1):
-                t = self._content[i][j].type
-                if t == PointType.EMPTY:
-                    empty_pos.append(Pos(i, j))
-                elif t == PointType.FOOD:
+            row = self._content[i]
+            base = i * cols
+            for j in range(1, cols - 1):
+                t = row[j].type
+                if t is PointType.EMPTY:
+                    empty.append(base + j)
+                elif t is PointType.FOOD:
                     return None  # Stop if food exists
-        if empty_pos:
-            return self.create_food(random.choice(empty_pos))
+        if empty:
+            idx = random.choice(empty)
+            return self.create_food(Pos(idx // cols, idx % cols))
         return None
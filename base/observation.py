@@ -0,0 +1,150 @@
+"""Observación del tablero como planos de características para políticas aprendidas.
+
+No se exporta en base/__init__ para que importar base no cargue numpy.
+"""
+
+import numpy as np
+
+from base.direc import DELTAS
+from base.point import PointType
+
+# Índice de cada plano en la observación
+BODY, HEAD, TAIL, FOOD, WALLS, DIRECTION = range(6)
+PLANES = ("body", "head", "tail", "food", "walls", "direction")
+
+_EMPTY = PointType.EMPTY
+_FOOD = PointType.FOOD
+_WALL = PointType.WALL
+
+
+class Observation:
+    """
+    Planos (len(PLANES), alto, ancho) del estado de una serpiente:
+    - body: todas las casillas de la serpiente, cabeza y cola incluidas.
+    - head, tail, food: una casilla cada uno.
+    - walls: muros del borde. Con recorte, lo que queda fuera del mapa también cuenta como muro.
+    - direction: la casilla frente a la cabeza, hacia donde se mueve.
+
+    Se registra como observador del mapa y mantiene la rejilla del cuerpo con los avisos de
+    Snake.move, así que write() no recorre el mapa: copia la rejilla y marca tres casillas.
+    Con crop=r la ventana es de (2r + 1) x (2r + 1) centrada en la cabeza; las rejillas
+    guardan un borde de r casillas para que la ventana sea una vista sin copias.
+    """
+
+    def __init__(self, snake, crop=None, dtype=np.float32):
+        """
+        Args:
+        snake (Snake): Serpiente observada, se observa su mapa.
+        crop (int): Radio de la ventana egocéntrica, None para el tablero completo.
+        dtype: Tipo de las rejillas, conviene que sea el del buffer para copiar sin convertir.
+        """
+        if crop is not None and crop < 1:
+            raise ValueError(f"El radio del recorte tiene que ser al menos 1, no {crop}")
+        self.snake = snake
+        self._map = snake.map
+        self.crop = crop
+        self._pad = crop or 0
+        rows, cols = self._map.num_rows, self._map.num_cols
+        size = (rows + 2 * self._pad, cols + 2 * self._pad)
+        self._body = np.zeros(size, dtype=dtype)
+        self._walls = np.ones(size, dtype=dtype)
+        self.dtype = np.dtype(dtype)
+        self._stale = True
+        self._map.add_watcher(self)
+
+    @property
+    def shape(self):
+        if self.crop is None:
+            return (len(PLANES), self._map.num_rows, self._map.num_cols)
+        side = 2 * self.crop + 1
+        return (len(PLANES), side, side)
+
+    def new_buffer(self, batch=None):
+        """Buffer en ceros para write(), con una dimensión de lote si se da batch."""
+        shape = self.shape if batch is None else (batch,) + self.shape
+        return np.zeros(shape, dtype=self.dtype)
+
+    def close(self):
+        """Deja de observar el mapa."""
+        self._map.remove_watcher(self)
+
+    # Avisos del mapa
+    def occupied(self, pos):
+        self._body[pos.x + self._pad, pos.y + self._pad] = 1
+
+    def freed(self, pos):
+        self._body[pos.x + self._pad, pos.y + self._pad] = 0
+
+    def reset(self):
+        # Después de un reinicio la serpiente se escribe sin avisos, se relee en el siguiente write
+        self._stale = True
+
+    def food_changed(self, pos):
+        # El plano de la comida se marca en cada write() con Map.food
+        pass
+
+    def _load(self):
+        """Lee el cuerpo y los muros del mapa, solo al empezar y después de un reinicio."""
+        pad = self._pad
+        self._body.fill(0)
+        self._walls.fill(1)
+        for i, row in enumerate(self._map.content):
+            for j, point in enumerate(row):
+                t = point.type
+                if t is not _WALL:
+                    self._walls[i + pad, j + pad] = 0
+                    if t is not _EMPTY and t is not _FOOD:
+                        self._body[i + pad, j + pad] = 1
+        self._stale = False
+
+    def write(self, out=None):
+        """
+        Escribe la observación actual en out sin reservar memoria.
+        Parametros:
+        out (ndarray): Buffer con forma shape, ej: new_buffer() o una fila de new_buffer(n)
+        Regresa:
+        ndarray: out
+        """
+        if out is None:
+            out = self.new_buffer()
+        if self._stale:
+            self._load()
+
+        head = self.snake.head()
+        if self.crop is None:
+            x0 = y0 = 0
+            np.copyto(out[BODY], self._body)
+            np.copyto(out[WALLS], self._walls)
+        else:
+            # La ventana empieza r casillas antes de la cabeza, que en la rejilla con borde es head
+            x0, y0 = head.x - self.crop, head.y - self.crop
+            side = 2 * self.crop + 1
+            rows = slice(head.x, head.x + side)
+            cols = slice(head.y, head.y + side)
+            np.copyto(out[BODY], self._body[rows, cols])
+            np.copyto(out[WALLS], self._walls[rows, cols])
+
+        for plane in (HEAD, TAIL, FOOD, DIRECTION):
+            out[plane].fill(0)
+        self._mark(out[HEAD], head, x0, y0)
+        self._mark(out[TAIL], self.snake.tail(), x0, y0)
+        self._mark(out[FOOD], self._map.food, x0, y0)
+        delta = DELTAS[self.snake.direc._value_]
+        if delta is not None:
+            self._mark(out[DIRECTION], head, x0 - delta[0], y0 - delta[1])
+        return out
+
+    @staticmethod
+    def _mark(plane, pos, x0, y0):
+        if pos is None:
+            return
+        i, j = pos.x - x0, pos.y - y0
+        if 0 <= i < plane.shape[0] and 0 <= j < plane.shape[1]:
+            plane[i, j] = 1
+
+
+def write_batch(observations, out):
+    """Escribe una observación por fila de out, ej: varios tableros que se juegan a la vez."""
+    for k, observation in enumerate(observations):
+        observation.write(out[k])
+    return out
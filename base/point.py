@@ -23,8 +23,11 @@ class PointType(Enum):
 class Point:
     """Punto en el juego. Se almacena solamente el tipo de punto ya que la posicion la clase pos"""
 
-    def __init__(self):
-        self._type = PointType.EMPTY
+    # El mapa tiene un punto por casilla, sin __dict__ cada uno pesa menos de la mitad
+    __slots__ = ("_type",)
+
+    def __init__(self, type=PointType.EMPTY):
+        self._type = type
 
     @property
     def type(self):
@@ -1,4 +1,7 @@
-from base.direc import Direc
+from base.direc import DELTAS, DIREC_BY_DELTA, Direc
+
+# Acceder a Direc.NONE pasa por la metaclase del enum, se guarda una vez
+_NONE = Direc.NONE
 
 
 class Pos:
@@ -6,6 +9,9 @@ class Pos:
     El origen (0, 0) está en la esquina superior izquierda.
     """
 
+    # Sin __dict__ por instancia: el mapa, los caminos y las serpientes crean muchas posiciones
+    __slots__ = ("_x", "_y")
+
     def __init__(self, x=0, y=0):
         self._x = x
         self._y = y
@@ -46,40 +52,19 @@ class Pos:
 
     def direc_to(self, adj_pos):
         """Regresa la posición en la que se encuentra un nodo adjacente."""
-        if self._x == adj_pos.x:
-            diff = self._y - adj_pos.y
-            if diff == 1:
-                return Direc.LEFT
-            if diff == -1:
-                return Direc.RIGHT
-        elif self._y == adj_pos.y:
-            diff = self._x - adj_pos.x
-            if diff == 1:
-                return Direc.UP
-            if diff == -1:
-                return Direc.DOWN
-        return Direc.NONE
+        return DIREC_BY_DELTA.get((adj_pos._x - self._x, adj_pos._y - self._y), _NONE)
 
     def adj(self, direc):
         """Regresa la posición adyacente según la dirección dada."""
-        if direc == Direc.LEFT:
-            return Pos(self._x, self._y - 1)
-        elif direc == Direc.RIGHT:
-            return Pos(self._x, self._y + 1)
-        elif direc == Direc.UP:
-            return Pos(self._x - 1, self._y)
-        elif direc == Direc.DOWN:
-            return Pos(self._x + 1, self._y)
-        else:
+        delta = DELTAS[direc._value_]
+        if delta is None:
             return None
+        return Pos(self._x + delta[0], self._y + delta[1])
 
     def all_adj(self):
         """Regresa una lista con todas las posiciones adyacentes."""
-        adjs = []
-        for direc in Direc:
-            if direc != Direc.NONE:
-                adjs.append(self.adj(direc))
-        return adjs
+        x, y = self._x, self._y
+        return [Pos(x, y - 1), Pos(x - 1, y), Pos(x, y + 1), Pos(x + 1, y)]
 
     @property
     def x(self):
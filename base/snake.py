@@ -1,13 +1,29 @@
 from collections import deque
 from typing import List
 
-from base.direc import Direc
+from base.direc import OPPOSITE, Direc
 from base.map import Map
 from base.point import Point, PointType
 from base.pos import Pos
 
+# Los miembros de los enums se guardan una vez porque leerlos del enum es lento
+_NONE = Direc.NONE
+_FOOD = PointType.FOOD
+_EMPTY = PointType.EMPTY
+
 
 class Snake:
+    __slots__ = (
+        "_map",
+        "_init_direc",
+        "_init_bodies",
+        "_init_types",
+        "_dead",
+        "_direc",
+        "_direc_next",
+        "_bodies",
+    )
+
     def __init__(
         self,
         game_map: Map,
@@ -39,14 +55,41 @@ class Snake:
             self._map.point(pos).type = self._init_types[i]
 
     def copy(self):
+        """Copia la serpiente y su mapa. No se llama a setup() porque reiniciaría el mapa copiado."""
         m_copy = self._map.copy()
-        s_copy = Snake(m_copy, Direc.NONE, [], [])
+        s_copy = Snake.__new__(Snake)
+        s_copy._map = m_copy
+        s_copy._init_direc = self._init_direc
+        s_copy._init_bodies = self._init_bodies
+        s_copy._init_types = self._init_types
         s_copy._dead = self._dead
         s_copy._direc = self._direc
         s_copy._direc_next = self._direc_next
         s_copy._bodies = deque(self._bodies)
         return s_copy, m_copy
 
+    def rebuild(self, bodies: List[Pos]):
+        """
+        Reemplaza el cuerpo sin reiniciar la posición inicial ni la comida, ej: cuando el
+        modelo se resincroniza con lo que se ve en pantalla. Los observadores del mapa se
+        reinician y se vuelven a leer en su siguiente uso.
+        Parametros:
+        bodies (List[Pos]): Casillas contiguas de la cabeza a la cola
+        """
+        for pos in self._bodies:
+            self._map.point(pos).type = _EMPTY
+        if self._map.food in bodies:
+            self._map.rm_food()
+        for pos, point_type in zip(bodies, body_types(bodies)):
+            self._map.point(pos).type = point_type
+        self._bodies = deque(bodies)
+        if len(bodies) > 1:
+            self._direc = bodies[1].direc_to(bodies[0])
+        self._direc_next = _NONE
+        self._dead = False
+        for watcher in self._map.watchers:
+            watcher.reset()
+
     @property
     def map(self):
         return self._map
@@ -78,6 +121,10 @@ class Snake:
     def len(self):
         return len(self._bodies)
 
+    def is_full(self):
+        """La serpiente ocupa todo el tablero. Es O(1), a diferencia de Map.is_full."""
+        return len(self._bodies) >= self._map.capacity
+
     def head(self):
         if not self._bodies:
             return None
@@ -98,9 +145,9 @@ class Snake:
 
         if (
             self._dead
-            or self._direc_next == Direc.NONE
-            or self._map.is_full()
-            or self._direc_next == Direc.opposite(self._direc)
+            or self._direc_next is _NONE
+            or len(self._bodies) >= self._map.capacity
+            or self._direc_next is OPPOSITE[self._direc._value_]
         ):
             return
 
@@ -111,7 +158,7 @@ class Snake:
 
         if not self._map.is_safe(new_head):
             self._dead = True
-        if self._map.point(new_head).type == PointType.FOOD:
+        if self._map.point(new_head).type is _FOOD:
             self._map.rm_food()
         else:
             self._rm_tail()
@@ -119,47 +166,62 @@ class Snake:
         self._map.point(new_head).type = new_head_type
         self._direc = self._direc_next
 
+        for watcher in self._map.watchers:
+            if self._dead:
+                watcher.reset()
+            else:
+                watcher.occupied(new_head)
+
     def _rm_tail(self):
-        self._map.point(self.tail()).type = PointType.EMPTY
-        self._bodies.pop()
+        tail = self._bodies.pop()
+        self._map.point(tail).type = _EMPTY
+        for watcher in self._map.watchers:
+            watcher.freed(tail)
 
     def _new_types(self):
         """Decide que tipo de celda debe tener cabeza y el resto cuerpo cuando la serpiente se mueve."""
-        old_head_type, new_head_type = None, None
-
-        # Posiciones de la cabeza despues del movimiento
-        if self._direc_next == Direc.LEFT:
-            new_head_type = PointType.HEAD_L
-        elif self._direc_next == Direc.UP:
-            new_head_type = PointType.HEAD_U
-        elif self._direc_next == Direc.RIGHT:
-            new_head_type = PointType.HEAD_R
-        elif self._direc_next == Direc.DOWN:
-            new_head_type = PointType.HEAD_D
-
-        # Poscion del cuerpo que era cabeza antes del movimiento
-        if (self._direc == Direc.LEFT and self._direc_next == Direc.LEFT) or (
-            self._direc == Direc.RIGHT and self._direc_next == Direc.RIGHT
-        ):
-            old_head_type = PointType.BODY_HOR
-        elif (self._direc == Direc.UP and self._direc_next == Direc.UP) or (
-            self._direc == Direc.DOWN and self._direc_next == Direc.DOWN
-        ):
-            old_head_type = PointType.BODY_VER
-        elif (self._direc == Direc.RIGHT and self._direc_next == Direc.UP) or (
-            self._direc == Direc.DOWN and self._direc_next == Direc.LEFT
-        ):
-            old_head_type = PointType.BODY_LU
-        elif (self._direc == Direc.LEFT and self._direc_next == Direc.UP) or (
-            self._direc == Direc.DOWN and self._direc_next == Direc.RIGHT
-        ):
-            old_head_type = PointType.BODY_UR
-        elif (self._direc == Direc.LEFT and self._direc_next == Direc.DOWN) or (
-            self._direc == Direc.UP and self._direc_next == Direc.RIGHT
-        ):
-            old_head_type = PointType.BODY_RD
-        elif (self._direc == Direc.RIGHT and self._direc_next == Direc.DOWN) or (
-            self._direc == Direc.UP and self._direc_next == Direc.LEFT
-        ):
-            old_head_type = PointType.BODY_DL
-        return old_head_type, new_head_type
+        return _NEW_TYPES[self._direc._value_][self._direc_next._value_]
+
+
+def _build_new_types():
+    """Tabla [dirección anterior][dirección nueva] -> (tipo de la cabeza anterior, tipo de la
+    cabeza nueva). Las combinaciones sin giro válido dejan el cuerpo en None."""
+    head = {
+        Direc.LEFT: PointType.HEAD_L,
+        Direc.UP: PointType.HEAD_U,
+        Direc.RIGHT: PointType.HEAD_R,
+        Direc.DOWN: PointType.HEAD_D,
+    }
+    body = {
+        (Direc.LEFT, Direc.LEFT): PointType.BODY_HOR,
+        (Direc.RIGHT, Direc.RIGHT): PointType.BODY_HOR,
+        (Direc.UP, Direc.UP): PointType.BODY_VER,
+        (Direc.DOWN, Direc.DOWN): PointType.BODY_VER,
+        (Direc.RIGHT, Direc.UP): PointType.BODY_LU,
+        (Direc.DOWN, Direc.LEFT): PointType.BODY_LU,
+        (Direc.LEFT, Direc.UP): PointType.BODY_UR,
+        (Direc.DOWN, Direc.RIGHT): PointType.BODY_UR,
+        (Direc.LEFT, Direc.DOWN): PointType.BODY_RD,
+        (Direc.UP, Direc.RIGHT): PointType.BODY_RD,
+        (Direc.RIGHT, Direc.DOWN): PointType.BODY_DL,
+        (Direc.UP, Direc.LEFT): PointType.BODY_DL,
+    }
+    return tuple(
+        tuple((body.get((old, new)), head.get(new)) for new in Direc) for old in Direc
+    )
+
+
+_NEW_TYPES = _build_new_types()
+
+
+def body_types(bodies: List[Pos]) -> List[PointType]:
+    """Tipo de cada casilla de un cuerpo contiguo dado de la cabeza a la cola."""
+    if len(bodies) < 2:
+        return [PointType.HEAD_R] * len(bodies)
+    # Dirección de cada casilla hacia la anterior, como la recorrió la serpiente
+    direcs = [bodies[i + 1].direc_to(bodies[i]) for i in range(len(bodies) - 1)]
+    types = [_NEW_TYPES[direcs[0]._value_][direcs[0]._value_][1]]
+    for i in range(1, len(bodies)):
+        old = direcs[i] if i < len(direcs) else direcs[i - 1]
+        types.append(_NEW_TYPES[old._value_][direcs[i - 1]._value_][0])
+    return types
@@ -0,0 +1,112 @@
+"""Mide el ciclo completo percibir-planear-actuar de main.Agent contra el juego local.
+
+Uso:
+    python -m benchmarks.closed_loop --seed 1 --tick 0.1 --max-ticks 2000
+    python -m benchmarks.closed_loop --seed 0 1 2 --drop-keys 0.02
+
+No necesita pantalla: el Scanner lee el buffer del juego local y el Actuator usa el
+backend falso conectado al juego. Con --drop-keys el juego pierde esa fracción de las
+teclas, así el modelo del agente se desincroniza y se mide cuántas veces se resincroniza.
+"""
+
+import argparse
+import random
+from time import perf_counter
+
+from actuator import Actuator
+from local_game import LocalGame
+from main import Agent
+
+
+def _percentiles(values, qs=(50, 99)):
+    if not values:
+        return {q: 0.0 for q in qs}
+    ordered = sorted(values)
+    return {q: ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))] for q in qs}
+
+
+def run(
+    seed=None, tick=0.1235, rows=15, cols=17, block=32, max_ticks=None, drop_keys=0.0
+) -> dict:
+    game = LocalGame(rows, cols, block, tick, seed, max_ticks)
+    backend = game.backend()
+    if drop_keys > 0:
+        rng = random.Random(seed)
+
+        def lossy(key, t):
+            # Teclas que el juego no recibe, como un evento perdido por el navegador
+            if rng.random() >= drop_keys:
+                game.on_key(key, t)
+
+        backend.listener = lossy
+    actuator = Actuator(backend=backend)
+    agent = Agent(game.geometry, game.source(), actuator, verbose=False)
+
+    decisions = []  # Latencia desde el cuadro hasta programar la tecla
+    expected = {}  # tick -> cabeza que espera el modelo del agente
+    frames = 0
+
+    game.start()
+    start = perf_counter()
+    try:
+        while not game.finished:
+            t0 = perf_counter()
+            head = agent.snake.head()
+            if not agent.step():
+                break
+            frames += 1
+            if agent.snake.head() != head:
+                decisions.append(perf_counter() - t0)
+                # El modelo se adelanta un tick a lo que se ve en pantalla
+                expected[game.ticks + 1] = agent.snake.head()
+    finally:
+        game.stop()
+        actuator.close(flush=False)
+    elapsed = perf_counter() - start
+
+    # Un tick perdido es uno donde la cabeza real no quedo donde la esperaba el agente
+    missed = sum(
+        1 for t, pos in expected.items() if t < len(game.heads) and game.heads[t] != pos
+    )
+    dec = _percentiles(decisions)
+    late = _percentiles([e.lateness for e in actuator.log])
+    return {
+        "seed": seed,
+        "score": game.score,
+        "ticks": game.ticks,
+        "dead": game.snake.dead,
+        "missed_ticks": missed,
+        "late_game_ticks": game.late_ticks,
+        "frames_per_sec": frames / elapsed if elapsed > 0 else 0.0,
+        "decision_p50_ms": 1000 * dec[50],
+        "decision_p99_ms": 1000 * dec[99],
+        "key_late_p50_ms": 1000 * late[50],
+        "key_late_p99_ms": 1000 * late[99],
+        "tick_period_est_ms": 1000 * agent.scheduler.estimator.period,
+        "resyncs": agent.resyncs,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, nargs="*", default=[0])
+    parser.add_argument("--tick", type=float, default=0.1235)
+    parser.add_argument("--rows", type=int, default=15)
+    parser.add_argument("--cols", type=int, default=17)
+    parser.add_argument("--block", type=int, default=32)
+    parser.add_argument("--max-ticks", type=int, default=None)
+    parser.add_argument("--drop-keys", type=float, default=0.0, help="Fracción de teclas perdidas")
+    args = parser.parse_args(argv)
+
+    results = []
+    for seed in args.seed:
+        res = run(
+            seed, args.tick, args.rows, args.cols, args.block, args.max_ticks, args.drop_keys
+        )
+        results.append(res)
+        print(" ".join(f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}" for k, v in res.items()))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Tiempo de importación de cada punto de entrada y qué dependencias pesadas carga.
+
+Uso:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --modules solver simulation --repeat 10 --top 8
+
+Cada importación corre en un intérprete nuevo con python -X importtime, como un proceso del
+pool de simulaciones. Se reporta la mediana del tiempo total, las dependencias pesadas que
+quedaron cargadas y los módulos con más tiempo propio. Los puntos de entrada sin pantalla
+(HEADLESS) no deben cargar ninguna dependencia de visión, teclado o dibujo.
+Con PYTHONDONTWRITEBYTECODE los .pyc viejos no se reescriben y la compilación se suma al
+tiempo propio del módulo; conviene correr antes python -m compileall -q .
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ENTRY_POINTS = (
+    "base",
+    "solver",
+    "simulation",
+    "game",
+    "benchmarks.sweep",
+    "benchmarks.tune",
+    "actuator",
+    "local_game",
+    "main",
+    "trigger",
+)
+HEADLESS = ("base", "solver", "simulation", "game", "benchmarks.sweep", "benchmarks.tune")
+GUI_MODULES = ("cv2", "mss", "pyautogui", "pygame")
+HEAVY_MODULES = GUI_MODULES + ("numpy", "multiprocessing", "logging")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_once(module):
+    """
+    Importa el módulo en un intérprete nuevo.
+    Regresa:
+    tuple: (microsegundos totales, {módulo: microsegundos propios}, dependencias pesadas cargadas)
+    """
+    code = (
+        f"import {module}, sys; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    total, own = 0, {}
+    for line in proc.stderr.splitlines():
+        # "import time: propio | acumulado | nombre", el nombre indentado según la profundidad
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        own[name.strip()] = int(self_us)
+        if name.strip() == module and not name.startswith("  "):
+            total = int(cumulative)
+    loaded = [m for m in proc.stdout.strip().split(",") if m]
+    return total, own, loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=list(ENTRY_POINTS))
+    parser.add_argument("--repeat", type=int, default=5, help="Importaciones por módulo")
+    parser.add_argument("--top", type=int, default=5, help="Módulos más lentos a mostrar")
+    args = parser.parse_args(argv)
+
+    failed = []
+    for module in args.modules:
+        try:
+            runs = [import_once(module) for _ in range(args.repeat)]
+        except subprocess.CalledProcessError as err:
+            last = err.stderr.strip().splitlines()[-1] if err.stderr else ""
+            print(f"{module}: no se pudo importar ({last})")
+            continue
+        total = statistics.median(run[0] for run in runs) / 1000
+        loaded = runs[-1][2]
+        gui = [m for m in loaded if m in GUI_MODULES]
+        if module in HEADLESS and gui:
+            failed.append(module)
+        print(f"{module}: {total:.1f} ms, pesados: {', '.join(loaded) or 'ninguno'}")
+        own = {}
+        for _, times, _ in runs:
+            for name, us in times.items():
+                own.setdefault(name, []).append(us)
+        slowest = sorted(own.items(), key=lambda item: -statistics.median(item[1]))
+        for name, times in slowest[: args.top]:
+            print(f"    {name:<32} {statistics.median(times) / 1000:>7.2f} ms propios")
+
+    if failed:
+        print(f"Cargan dependencias de pantalla sin necesitarlas: {', '.join(failed)}")
+        sys.exit(1)
+    print("Los puntos de entrada sin pantalla no cargan cv2, mss, pyautogui ni pygame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Mide la latencia de envío de cada backend de teclado disponible en esta máquina.
+
+Uso:
+    python -m benchmarks.input_latency --samples 200 [--backends xtest pyautogui]
+
+Se presiona shift para no mover nada en la ventana activa.
+"""
+
+import argparse
+from time import sleep
+
+from input_backends import available_backends, create_backend
+
+
+def measure(name: str, samples: int, key: str = "shift", gap: float = 0.005) -> dict:
+    backend = create_backend(name)
+    try:
+        for _ in range(samples):
+            backend.send(key)
+            sleep(gap)
+    finally:
+        backend.close()
+    return backend.stats.summary()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=100)
+    parser.add_argument("--backends", nargs="*", help="Por defecto todos los disponibles")
+    parser.add_argument("--include-fake", action="store_true", help="Incluye el backend recording")
+    args = parser.parse_args(argv)
+
+    names = args.backends or available_backends(args.include_fake)
+    results = {name: measure(name, args.samples) for name in names}
+
+    print(f"{'backend':>10} {'mean_ms':>8} {'p50_ms':>8} {'p99_ms':>8} {'max_ms':>8}")
+    for name, res in sorted(results.items(), key=lambda kv: kv[1]["p99_ms"]):
+        print(
+            f"{name:>10} {res['mean_ms']:8.3f} {res['p50_ms']:8.3f} "
+            f"{res['p99_ms']:8.3f} {res['max_ms']:8.3f}"
+        )
+    if results:
+        print(f"Mas rapido: {min(results, key=lambda n: results[n]['p99_ms'])}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Memoria por tablero y por instancia de solver, medida con tracemalloc.
+
+Uso:
+    python -m benchmarks.memory
+    python -m benchmarks.memory --sizes 15x17 200x200
+
+Por cada tamaño se reportan los bytes que quedan reservados al crear el mapa con su
+serpiente, su copia (lo que cuesta una serpiente virtual) y cada solver creado sobre ese
+mapa. Sirve para estimar cuántas simulaciones caben en paralelo en una máquina.
+"""
+
+import argparse
+import tracemalloc
+
+from benchmarks.scaling import parse_size
+from simulation import new_game
+from solver import GreedySolver, HamiltonSolver, LookaheadSolver, PathSolver
+
+# Solvers que se miden: nombre -> función que lo crea a partir de la serpiente
+SOLVERS = {
+    "greedy": lambda snake: GreedySolver(snake),
+    "greedy sin bitboard": lambda snake: GreedySolver(snake, reuse_field=False, bitboard=False),
+    "path": lambda snake: PathSolver(snake),
+    "hamilton": lambda snake: HamiltonSolver(snake),
+    "lookahead": lambda snake: LookaheadSolver(snake),
+}
+
+
+def traced_bytes(factory):
+    """Bytes que siguen reservados después de llamar factory(), y su resultado."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = factory()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return size, obj
+
+
+def measure(rows, cols):
+    board, (game_map, snake) = traced_bytes(lambda: new_game(rows, cols))
+    copy, _ = traced_bytes(snake.copy)
+    result = {"mapa": board, "copia": copy}
+    for name, factory in SOLVERS.items():
+        # Juego nuevo por solver: lo que un solver deja en el mapa (ej: su Bitboard) se cuenta en él
+        _, snake = new_game(rows, cols)
+        result[name], _ = traced_bytes(lambda: factory(snake))
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", nargs="+", default=["15x17", "50x50", "100x100", "200x200"],
+        help="Tableros sin muros como FILASxCOLUMNAS",
+    )
+    args = parser.parse_args(argv)
+
+    for size in args.sizes:
+        rows, cols = parse_size(size)
+        cells = (rows + 2) * (cols + 2)
+        print(f"Tablero {rows}x{cols} ({cells} casillas con muros)")
+        for name, size_bytes in measure(rows, cols).items():
+            print(f"  {name:<20} {size_bytes / 1024:>10.1f} KB {size_bytes / cells:>8.1f} B/casilla")
+
+
+if __name__ == "__main__":
+    main()
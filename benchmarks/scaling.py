@@ -0,0 +1,140 @@
+"""Latencia por decisión y memoria de GreedySolver según el tamaño del tablero y el largo de la serpiente.
+
+Uso:
+    python -m benchmarks.scaling
+    python -m benchmarks.scaling --sizes 15x17 100x100 200x200 --fills 0 0.25 0.5 --decisions 50
+
+Por cada tablero y fracción de llenado se arma una serpiente en zig-zag desde la esquina
+superior izquierda que ocupa esa fracción de las casillas, se corren --decisions decisiones
+moviendo la serpiente y se reporta la mediana, el p99 y el máximo de la latencia. La memoria
+se mide con tracemalloc en una pasada aparte: los bytes que quedan reservados por el mapa y la
+serpiente, los del solver y el pico durante las decisiones. La primera decisión, que arma el
+campo de distancias, se cuenta en la latencia.
+"""
+
+import argparse
+import random
+import tracemalloc
+from time import perf_counter
+
+from base import Map, PointType, Pos, Snake
+from solver import GreedySolver
+
+# Objetivo documentado en el README: p99 por decisión en tableros de hasta 200 x 200
+TARGET_P99_MS = 50.0
+
+_HEAD_TYPES = {
+    (0, -1): PointType.HEAD_L,
+    (-1, 0): PointType.HEAD_U,
+    (0, 1): PointType.HEAD_R,
+    (1, 0): PointType.HEAD_D,
+}
+
+
+def parse_size(text):
+    rows, _, cols = text.lower().partition("x")
+    return int(rows), int(cols)
+
+
+def long_snake(rows, cols, length):
+    """Mapa con una serpiente de largo length que recorre las filas en zig-zag desde arriba."""
+    game_map = Map(rows + 2, cols + 2)
+    cells = []
+    for i in range(1, rows + 1):
+        cols_order = range(1, cols + 1) if i % 2 else range(cols, 0, -1)
+        cells.extend(Pos(i, j) for j in cols_order)
+        if len(cells) >= length:
+            break
+    bodies = cells[:length][::-1]
+    head, neck = bodies[0], bodies[1]
+    delta = (head.x - neck.x, head.y - neck.y)
+    types = [_HEAD_TYPES[delta]] + [PointType.BODY_HOR] * (length - 1)
+    snake = Snake(game_map, neck.direc_to(head), bodies, types)
+    game_map.create_rand_food()
+    return game_map, snake
+
+
+def run_decisions(game_map, snake, solver, decisions):
+    """Segundos de cada decisión. La serpiente se mueve y la comida se repone."""
+    times = []
+    for _ in range(decisions):
+        if not game_map.has_food():
+            game_map.create_rand_food()
+        start = perf_counter()
+        direc = solver.next_direc()
+        times.append(perf_counter() - start)
+        snake.move(direc)
+        if snake.dead or snake.is_full():
+            break
+    return times
+
+
+def measure(rows, cols, fill, decisions, seed=0):
+    length = max(4, min(int(fill * rows * cols), rows * cols - 1))
+
+    random.seed(seed)
+    game_map, snake = long_snake(rows, cols, length)
+    solver = GreedySolver(snake)
+    times = sorted(run_decisions(game_map, snake, solver, decisions))
+
+    # Memoria en otra pasada porque tracemalloc hace más lenta cada reserva
+    random.seed(seed)
+    tracemalloc.start()
+    game_map, snake = long_snake(rows, cols, length)
+    board_bytes = tracemalloc.get_traced_memory()[0]
+    solver = GreedySolver(snake)
+    solver_bytes = tracemalloc.get_traced_memory()[0] - board_bytes
+    tracemalloc.reset_peak()
+    run_decisions(game_map, snake, solver, min(decisions, 10))
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "size": f"{rows}x{cols}",
+        "length": length,
+        "decisions": len(times),
+        "p50_ms": 1000 * times[len(times) // 2],
+        "p99_ms": 1000 * times[min(len(times) - 1, int(0.99 * len(times)))],
+        "max_ms": 1000 * times[-1],
+        "board_kb": board_bytes / 1024,
+        "solver_kb": solver_bytes / 1024,
+        "peak_kb": peak_bytes / 1024,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", nargs="+", default=["15x17", "50x50", "100x100", "200x200"],
+        help="Tableros sin muros como FILASxCOLUMNAS",
+    )
+    parser.add_argument(
+        "--fills", nargs="+", type=float, default=[0.0, 0.1, 0.25, 0.5],
+        help="Fracción del tablero que ocupa la serpiente",
+    )
+    parser.add_argument("--decisions", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    header = (
+        f"{'tablero':>9} {'largo':>6} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+        f"{'mapa KB':>9} {'solver KB':>10} {'pico KB':>9}"
+    )
+    print(header)
+    worst = 0.0
+    for size in args.sizes:
+        rows, cols = parse_size(size)
+        for fill in args.fills:
+            r = measure(rows, cols, fill, args.decisions, args.seed)
+            worst = max(worst, r["p99_ms"])
+            print(
+                f"{r['size']:>9} {r['length']:>6} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} "
+                f"{r['max_ms']:>8.2f} {r['board_kb']:>9.0f} {r['solver_kb']:>10.0f} "
+                f"{r['peak_kb']:>9.0f}"
+            )
+    verdict = "cumple" if worst <= TARGET_P99_MS else "NO cumple"
+    print(f"Peor p99: {worst:.2f} ms, objetivo {TARGET_P99_MS:.0f} ms: {verdict}")
+
+
+if __name__ == "__main__":
+    main()
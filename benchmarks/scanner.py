@@ -0,0 +1,75 @@
+"""Mide la velocidad y precisión del Scanner sobre cuadros grabados, sin pantalla.
+
+Uso:
+    python -m benchmarks.scanner frames.npy --rows 15 --cols 17 [--labels apples.npy]
+    python -m benchmarks.scanner screenshots --rows 15 --cols 17
+
+labels es un .npy de forma (N, 2) con la posición (x, y) de la manzana en cada cuadro,
+en las mismas coordenadas que regresa Scanner.apple_coords.
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from frames import DirectorySource, StackSource
+from scanner import COLS, ROWS, Scanner
+
+
+def open_source(path: str):
+    if os.path.isdir(path):
+        # Se lee un cuadro para conocer el tamaño y se vuelve a abrir la carpeta
+        height, width = DirectorySource(path).read().shape[:2]
+        return DirectorySource(path), (width, height)
+    source = StackSource(path)
+    height, width = source.frame_shape[:2]
+    return source, (width, height)
+
+
+def run(scanner: Scanner, labels=None) -> dict:
+    """Procesa todos los cuadros de la fuente del scanner y regresa las metricas."""
+    n, hits = 0, 0
+    start = time.perf_counter()
+    while True:
+        frame = scanner.capture_region()
+        if frame is None:
+            break
+        pos = scanner.apple_coords(frame)
+        if labels is not None and (pos.x, pos.y) == tuple(labels[n]):
+            hits += 1
+        n += 1
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "frames": n,
+        "seconds": elapsed,
+        "fps": n / elapsed if elapsed > 0 else float("inf"),
+        "ms_per_frame": 1000 * elapsed / n if n else 0.0,
+    }
+    if labels is not None and n:
+        result["accuracy"] = hits / n
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("frames", help="Archivo .npy o carpeta con imagenes")
+    parser.add_argument("--rows", type=int, default=ROWS)
+    parser.add_argument("--cols", type=int, default=COLS)
+    parser.add_argument("--labels", help="Archivo .npy con la posición real de la manzana")
+    args = parser.parse_args(argv)
+
+    source, (width, height) = open_source(args.frames)
+    scanner = Scanner((0, 0, width, height), args.rows, args.cols, source=source)
+    labels = np.load(args.labels) if args.labels else None
+
+    result = run(scanner, labels)
+    for key, val in result.items():
+        print(f"{key:>14}: {val:.4f}" if isinstance(val, float) else f"{key:>14}: {val}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""Barrido de parámetros y torneo de configuraciones de los solvers en un pool de procesos.
+
+Uso:
+    python -m benchmarks.sweep --grid survival=space,manhattan --grid tie_break=straight,random \\
+        --seeds 30 --workers 4 --out sweep.csv
+    python -m benchmarks.sweep --grid bitboard=true,false --grid rows=15,21 --random 3 --seeds 10
+    python -m benchmarks.sweep --out sweep.csv --summary-only
+
+Cada partida se agrega al CSV en cuanto termina. Si el archivo ya existe se saltan los pares
+(configuración, semilla) que ya están, así un barrido interrumpido sigue donde iba; una fila
+que quedó a medias se descarta y su partida se vuelve a jugar.
+Al final se imprime por configuración la media con intervalo de confianza del 95% del puntaje,
+los pasos por manzana, la latencia de decisión y la tasa de victorias.
+"""
+
+import argparse
+import csv
+import itertools
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from simulation import DEFAULT_CONFIG, play_game
+
+RESULT_KEYS = (
+    "score",
+    "steps",
+    "steps_per_apple",
+    "decision_ms",
+    "decision_p99_ms",
+    "won",
+    "dead",
+)
+FIELDS = ("config",) + tuple(DEFAULT_CONFIG) + ("seed",) + RESULT_KEYS
+
+# Valor crítico de la t de Student al 95% (dos colas) por grados de libertad
+_T95 = {1: 12.71, 2: 4.30, 3: 3.18, 4: 2.78, 5: 2.57, 6: 2.45, 7: 2.36, 8: 2.31, 9: 2.26,
+        10: 2.23, 15: 2.13, 20: 2.09, 25: 2.06, 30: 2.04, 60: 2.00, 120: 1.98}
+
+
+def _parse_value(text):
+    low = text.lower()
+    if low in ("true", "false"):
+        return low == "true"
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def parse_grid(items):
+    """Convierte ["llave=v1,v2", ...] en {llave: [v1, v2]}."""
+    grid = {}
+    for item in items:
+        key, _, values = item.partition("=")
+        if key not in DEFAULT_CONFIG:
+            raise ValueError(f"Parámetro desconocido '{key}', opciones: {list(DEFAULT_CONFIG)}")
+        grid[key] = [_parse_value(v) for v in values.split(",")]
+    return grid
+
+
+def configs(grid, num_random=None, seed=0):
+    """Todas las combinaciones de la rejilla, o num_random elegidas al azar sin repetir."""
+    keys = list(grid)
+    combos = [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+    if num_random is not None and num_random < len(combos):
+        combos = random.Random(seed).sample(combos, num_random)
+    return [dict(DEFAULT_CONFIG, **combo) for combo in combos]
+
+
+def config_key(config):
+    return ";".join(f"{k}={config[k]}" for k in DEFAULT_CONFIG)
+
+
+def _run(config, seed):
+    return config, seed, play_game(config, seed)
+
+
+def _t95(df):
+    best = 1.96
+    for k in sorted(_T95):
+        if df >= k:
+            best = _T95[k]
+    return best
+
+
+def mean_ci(values):
+    """Media y medio ancho del intervalo de confianza del 95%."""
+    values = [v for v in values if not math.isnan(v)]
+    n = len(values)
+    if n == 0:
+        return float("nan"), float("nan")
+    mean = sum(values) / n
+    if n == 1:
+        return mean, float("nan")
+    var = sum((v - mean) ** 2 for v in values) / (n - 1)
+    return mean, _t95(n - 1) * math.sqrt(var / n)
+
+
+def _complete(row):
+    """La fila tiene todas las columnas y sus valores se pueden leer."""
+    if None in row or any(not row.get(key) for key in FIELDS):
+        return False
+    try:
+        int(row["seed"])
+        for key in RESULT_KEYS[:-2]:
+            float(row[key])
+    except ValueError:
+        return False
+    return all(row[key] in ("True", "False") for key in RESULT_KEYS[-2:])
+
+
+def read_results(path, repair=False):
+    """
+    Filas del CSV de resultados. Un barrido interrumpido a mitad de una escritura deja la
+    última fila incompleta: esa fila se ignora. Cualquier otra fila dañada, o un encabezado
+    distinto de FIELDS (ej: un CSV de otra versión), es un error y el archivo no se toca.
+    Parametros:
+    path (str): Ruta del CSV
+    repair (bool): Quita del archivo la última fila incompleta, antes de seguir agregando
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+        header = reader.fieldnames
+    if header is None or (not rows and ",".join(FIELDS).startswith(",".join(header))):
+        # Vacío o interrumpido mientras se escribía el encabezado
+        if repair:
+            _write_prefix(path, b"")
+        return []
+    if header != list(FIELDS):
+        raise ValueError(
+            f"{path} tiene otras columnas que las de este barrido. Usa otro --out o mueve el "
+            "archivo antes de seguir"
+        )
+    bad = [i for i, row in enumerate(rows) if not _complete(row)]
+    if bad and bad != [len(rows) - 1]:
+        raise ValueError(f"{path} tiene filas dañadas antes de la última (fila {bad[0] + 2})")
+    if bad:
+        rows.pop()
+        if repair:
+            with open(path, "rb") as f:
+                data = f.read()
+            # La fila incompleta es la última línea del archivo
+            _write_prefix(path, data[: data.rstrip(b"\r\n").rfind(b"\n") + 1])
+            print(f"Última fila incompleta descartada de {path}")
+    return rows
+
+
+def _write_prefix(path, data):
+    """Reemplaza el archivo por data. Se escribe aparte y se reemplaza, así otra interrupción
+    no deja el archivo a medias."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def summarize(rows):
+    """Resumen por configuración ordenado por puntaje medio."""
+    groups = {}
+    for row in rows:
+        groups.setdefault(row["config"], []).append(row)
+    table = []
+    for key, group in groups.items():
+        entry = {"config": key, "games": len(group)}
+        for col in ("score", "steps_per_apple", "decision_ms"):
+            entry[col] = mean_ci([float(r[col]) for r in group])
+        entry["win_rate"] = mean_ci([1.0 if r["won"] == "True" else 0.0 for r in group])
+        table.append(entry)
+    table.sort(key=lambda e: -e["score"][0])
+    return table
+
+
+def print_summary(table, grid_keys=None):
+    def fmt(pair, digits):
+        mean, half = pair
+        return f"{mean:.{digits}f} ± {half:.{digits}f}"
+
+    for entry in table:
+        config = dict(part.split("=", 1) for part in entry["config"].split(";"))
+        if grid_keys:
+            config = {k: config[k] for k in grid_keys if k in config}
+        label = " ".join(f"{k}={v}" for k, v in config.items())
+        print(
+            f"{label:50s} n={entry['games']:<4d} score {fmt(entry['score'], 1):>14s}  "
+            f"pasos/manzana {fmt(entry['steps_per_apple'], 1):>14s}  "
+            f"decisión ms {fmt(entry['decision_ms'], 2):>14s}  "
+            f"victorias {fmt(entry['win_rate'], 2)}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--grid", action="append", default=[], help="llave=v1,v2,...")
+    parser.add_argument("--random", type=int, default=None, help="Configuraciones al azar de la rejilla")
+    parser.add_argument("--seeds", type=int, default=10, help="Semillas 0..N-1 por configuración")
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="sweep.csv")
+    parser.add_argument("--summary-only", action="store_true")
+    args = parser.parse_args(argv)
+
+    grid = parse_grid(args.grid)
+    if not args.summary_only:
+        try:
+            previous = read_results(args.out, repair=True)
+        except ValueError as error:
+            parser.error(str(error))
+        done = {(row["config"], int(row["seed"])) for row in previous}
+        seeds = range(args.first_seed, args.first_seed + args.seeds)
+        jobs = [
+            (config, seed)
+            for config in configs(grid, args.random)
+            for seed in seeds
+            if (config_key(config), seed) not in done
+        ]
+        print(f"{len(jobs)} partidas por correr, {len(done)} ya estaban en {args.out}")
+
+        new_file = not os.path.exists(args.out) or os.path.getsize(args.out) == 0
+        with open(args.out, "a", newline="") as f, ProcessPoolExecutor(args.workers) as pool:
+            writer = csv.DictWriter(f, FIELDS)
+            if new_file:
+                writer.writeheader()
+            futures = [pool.submit(_run, config, seed) for config, seed in jobs]
+            for k, future in enumerate(as_completed(futures), 1):
+                config, seed, result = future.result()
+                writer.writerow(dict(config, config=config_key(config), seed=seed, **result))
+                f.flush()
+                if k % 10 == 0 or k == len(futures):
+                    print(f"{k}/{len(futures)}")
+
+    table = summarize(read_results(args.out))
+    print_summary(table, list(grid) or None)
+    return table
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Búsqueda evolutiva de los pesos de GreedySolver en un pool de procesos.
+
+Uso:
+    python -m benchmarks.tune --generations 10 --population 16 --seeds 20 --out solver.json
+    python -m benchmarks.tune --rows 21 --cols 21 --workers 8 --min-games 6
+
+Algoritmo genético simple sobre DEFAULT_WEIGHTS: los mejores (--elite) pasan tal cual, el
+resto sale de torneos de tres, cruce uniforme y mutación gaussiana dentro de BOUNDS. Todos
+los candidatos de una generación juegan las mismas semillas (números aleatorios comunes) y
+cada generación usa un bloque de semillas nuevo para no sobreajustar. Las partidas se
+reparten en orden de semilla; cuando un candidato lleva --min-games partidas y la diferencia
+pareada con el líder es negativa con 95% de confianza, sus partidas pendientes se cancelan.
+Cada generación se compara con semillas distintas, así que al final los líderes de todas las
+generaciones vuelven a jugar un bloque común de --holdout semillas que la búsqueda no usó, y el
+mejor ahí se guarda con solver.config.save, el archivo que cargan main.py, trigger.py y mein.py.
+El archivo guarda el tamaño del tablero y solo se carga en tableros de ese tamaño.
+"""
+
+import argparse
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from benchmarks.sweep import mean_ci
+from simulation import DEFAULT_CONFIG, play_game
+from solver import GreedySolver
+from solver.config import CONFIG_FILE, save
+from solver.greedy import DEFAULT_WEIGHTS
+
+# Primera semilla de la búsqueda, las anteriores quedan para comparar a los líderes al final
+SEARCH_SEED = 1000
+
+# Rango de búsqueda de cada peso
+BOUNDS = {
+    "tail": (0.0, 2.0),
+    "area": (0.0, 2.0),
+    "food": (-1.0, 1.0),
+    "straight": (-1.0, 1.0),
+    "straight_path": (0.0, 1.0),
+}
+
+
+def _run(index, weights, config, seed):
+    factory = lambda snake: GreedySolver(snake, weights=weights)  # noqa: E731
+    return index, seed, play_game(config, seed, factory)["score"]
+
+
+def _clip(key, value):
+    low, high = BOUNDS[key]
+    return min(high, max(low, value))
+
+
+def mutate(rng, weights, sigma):
+    """Copia de weights con ruido gaussiano de sigma veces el rango de cada peso."""
+    return {
+        key: _clip(key, value + rng.gauss(0, sigma * (BOUNDS[key][1] - BOUNDS[key][0])))
+        for key, value in weights.items()
+    }
+
+
+def crossover(rng, a, b):
+    """Cada peso sale de a o de b al azar."""
+    return {key: a[key] if rng.random() < 0.5 else b[key] for key in a}
+
+
+def next_generation(rng, ranked, size, elite, sigma):
+    """
+    Población nueva a partir de la anterior ordenada de mejor a peor.
+    Parametros:
+    ranked (list): Pesos de cada candidato, el mejor primero
+    size (int): Tamaño de la población
+    elite (int): Mejores que pasan sin cambios
+    sigma (float): Fracción del rango de cada peso que usa la mutación
+    """
+    def tournament():
+        return ranked[min(rng.sample(range(len(ranked)), min(3, len(ranked))))]
+
+    population = ranked[:elite]
+    while len(population) < size:
+        population.append(mutate(rng, crossover(rng, tournament(), tournament()), sigma))
+    return population
+
+
+def evaluate(pool, population, config, seeds, min_games):
+    """
+    Juega cada candidato en las mismas semillas y descarta los que ya son peores que el líder.
+    Regresa:
+    list: {semilla: puntaje} de cada candidato, solo con las partidas que terminó
+    """
+    scores = [{} for _ in population]
+    dropped = set()
+    futures = {}
+    for seed in seeds:
+        for index, weights in enumerate(population):
+            future = pool.submit(_run, index, weights, config, seed)
+            futures.setdefault(index, []).append(future)
+
+    all_futures = [f for group in futures.values() for f in group]
+    for future in as_completed(all_futures):
+        if future.cancelled():
+            continue
+        index, seed, score = future.result()
+        scores[index][seed] = score
+
+        leader = max(
+            (i for i in range(len(population)) if i not in dropped),
+            key=lambda i: mean_ci(list(scores[i].values()))[0] if scores[i] else float("-inf"),
+        )
+        for i in range(len(population)):
+            if i == leader or i in dropped:
+                continue
+            common = [s for s in scores[i] if s in scores[leader]]
+            if len(common) < min_games:
+                continue
+            mean, half = mean_ci([scores[i][s] - scores[leader][s] for s in common])
+            if mean + half < 0:
+                dropped.add(i)
+                for pending in futures[i]:
+                    pending.cancel()
+    return scores
+
+
+def rank(scores, num_seeds):
+    """
+    Índices de los candidatos de mejor a peor. Los descartados tienen menos partidas y quedan
+    detrás de los que las jugaron todas.
+    """
+    fitness = [
+        (len(s) == num_seeds, mean_ci(list(s.values()))[0] if s else float("-inf"))
+        for s in scores
+    ]
+    return sorted(range(len(scores)), key=lambda i: fitness[i], reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--generations", type=int, default=10)
+    parser.add_argument("--population", type=int, default=16)
+    parser.add_argument("--elite", type=int, default=2, help="Mejores que pasan sin cambios")
+    parser.add_argument("--sigma", type=float, default=0.15, help="Mutación, fracción del rango")
+    parser.add_argument("--seeds", type=int, default=20, help="Partidas por candidato y generación")
+    parser.add_argument("--min-games", type=int, default=5, help="Partidas antes de descartar")
+    parser.add_argument(
+        "--holdout", type=int, default=20, help="Semillas 0..N-1 para elegir entre los líderes"
+    )
+    parser.add_argument("--rows", type=int, default=DEFAULT_CONFIG["rows"])
+    parser.add_argument("--cols", type=int, default=DEFAULT_CONFIG["cols"])
+    parser.add_argument("--max-steps", type=int, default=DEFAULT_CONFIG["max_steps"])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0, help="Semilla de la búsqueda")
+    parser.add_argument("--out", default=CONFIG_FILE)
+    args = parser.parse_args(argv)
+    if not 0 < args.holdout <= SEARCH_SEED:
+        parser.error(f"--holdout debe estar entre 1 y {SEARCH_SEED}")
+
+    rng = random.Random(args.seed)
+    config = {"rows": args.rows, "cols": args.cols, "max_steps": args.max_steps}
+    population = [dict(DEFAULT_WEIGHTS)]
+    while len(population) < args.population:
+        population.append(mutate(rng, DEFAULT_WEIGHTS, 0.5))
+
+    leaders = []  # (generación, pesos) del líder de cada generación, sin repetidos
+    with ProcessPoolExecutor(args.workers) as pool:
+        for gen in range(args.generations):
+            first = SEARCH_SEED + gen * args.seeds
+            seeds = range(first, first + args.seeds)
+            scores = evaluate(pool, population, config, seeds, args.min_games)
+            order = rank(scores, args.seeds)
+            played = sum(len(s) for s in scores)
+            top = order[0]
+            mean, half = mean_ci(list(scores[top].values()))
+            print(
+                f"generación {gen:>3} partidas {played:>4}/{len(population) * args.seeds} "
+                f"mejor {mean:.1f} ± {half:.1f} "
+                + " ".join(f"{k}={v:.3f}" for k, v in population[top].items())
+            )
+            if all(population[top] != weights for _, weights in leaders):
+                leaders.append((gen, population[top]))
+            ranked = [population[i] for i in order]
+            population = next_generation(rng, ranked, args.population, args.elite, args.sigma)
+
+        # Los promedios de cada generación son con semillas distintas y no se comparan entre sí
+        seeds = range(args.holdout)
+        scores = evaluate(pool, [weights for _, weights in leaders], config, seeds, args.min_games)
+
+    best = rank(scores, args.holdout)[0]
+    gen, weights = leaders[best]
+    mean, half = mean_ci(list(scores[best].values()))
+    save(
+        {"survival": "space", "reuse_field": True, "bitboard": True, "weights": weights},
+        args.out, score=mean, score_ci=half, games=len(scores[best]), generation=gen,
+        rows=args.rows, cols=args.cols,
+    )
+    print(
+        f"Mejor de {len(leaders)} líderes en {args.holdout} semillas apartadas: generación {gen} "
+        f"({mean:.1f} ± {half:.1f}) en {args.out}"
+    )
+    return weights, mean, half, gen
+
+
+if __name__ == "__main__":
+    main()
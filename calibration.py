@@ -0,0 +1,313 @@
+import json
+import os
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+CACHE_FILE = "calibration.json"
+
+# Rango HSV de los dos verdes del tablero de ajedrez de Google Snake.
+# El valor minimo deja por fuera el marco verde oscuro que rodea al tablero
+GREEN_RANGE = ([30, 60, 170], [50, 255, 255])
+
+# Diferencia minima de gris entre dos casillas vecinas del tablero
+EDGE_THRESHOLD = 3
+
+# Desviaciones estándar del error de los promedios que debe superar el salto entre casillas
+STEP_SIGMAS = 2
+
+# Pixeles que se promedian a lo largo de cada borde antes de medirlo, para bajar el ruido
+# sin suavizar el salto de tono entre casillas
+EDGE_SMOOTH = 7
+
+
+class BoardGeometry:
+    """Geometría del tablero en pantalla: origen, tamaño de bloque, filas y columnas.
+    La región que se obtiene siempre es un múltiplo exacto del tamaño de bloque.
+    """
+
+    def __init__(self, x: int, y: int, block_size: int, rows: int, cols: int):
+        self.x = x
+        self.y = y
+        self.block_size = block_size
+        self.rows = rows
+        self.cols = cols
+
+    def __str__(self):
+        return (
+            f"BoardGeometry(x={self.x}, y={self.y}, block={self.block_size}, "
+            f"rows={self.rows}, cols={self.cols})"
+        )
+
+    __repr__ = __str__
+
+    def __eq__(self, other):
+        if isinstance(other, BoardGeometry):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    @property
+    def width(self):
+        return self.block_size * self.cols
+
+    @property
+    def height(self):
+        return self.block_size * self.rows
+
+    @property
+    def region(self) -> Tuple[int, int, int, int]:
+        """Región (x, y, width, height) alineada a los bloques para el Scanner."""
+        return (self.x, self.y, self.width, self.height)
+
+    def cell_region(self, row: int, col: int) -> Tuple[int, int, int, int]:
+        """Región en pantalla de un solo bloque. row y col empiezan en 0."""
+        return (
+            self.x + col * self.block_size,
+            self.y + row * self.block_size,
+            self.block_size,
+            self.block_size,
+        )
+
+    def to_dict(self):
+        return {
+            "x": self.x,
+            "y": self.y,
+            "block_size": self.block_size,
+            "rows": self.rows,
+            "cols": self.cols,
+        }
+
+    @staticmethod
+    def from_dict(data):
+        return BoardGeometry(
+            int(data["x"]),
+            int(data["y"]),
+            int(data["block_size"]),
+            int(data["rows"]),
+            int(data["cols"]),
+        )
+
+
+def _green_mask(img_bgr: np.ndarray) -> np.ndarray:
+    hsv = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2HSV)
+    lower, upper = GREEN_RANGE
+    return cv2.inRange(hsv, np.array(lower), np.array(upper))
+
+
+def _edge_peaks(profile: np.ndarray) -> np.ndarray:
+    """Posiciones donde el perfil de bordes supera la mitad de su máximo."""
+    if profile.max() <= 0:
+        return np.empty(0, dtype=np.int64)
+    strong = profile >= profile.max() / 2
+    idx = np.flatnonzero(strong)
+    if idx.size == 0:
+        return idx
+    # Se agrupan posiciones consecutivas y se toma el centro de cada grupo
+    groups = np.split(idx, np.flatnonzero(np.diff(idx) > 1) + 1)
+    return np.array([int(round(g.mean())) for g in groups])
+
+
+def _edge_profile(board: np.ndarray, green: np.ndarray, axis: int) -> np.ndarray:
+    """
+    Perfil de bordes entre casillas a lo largo de columnas (axis=1) o filas (axis=0).
+    El gris se promedia en la dirección del borde y se toma la diferencia entre pixeles
+    vecinos. La mediana de esas diferencias es el nivel de ruido del cuadro: a cada pixel se
+    le resta y solo cuenta lo que sobra, así que el perfil no depende de un umbral fijo.
+    """
+    kernel = (1, EDGE_SMOOTH) if axis == 1 else (EDGE_SMOOTH, 1)
+    smooth = cv2.blur(board, kernel)
+    # Solo pixeles cuya ventana es toda verde: la serpiente no se mezcla con el tablero
+    green = cv2.erode(green.astype(np.uint8), np.ones(kernel[::-1], np.uint8)) > 0
+    if axis == 1:
+        valid = green[:, 1:] & green[:, :-1]
+    else:
+        valid = green[1:, :] & green[:-1, :]
+    if not valid.any():
+        return np.zeros(board.shape[axis] - 1, dtype=np.float32)
+    diff = np.abs(np.diff(smooth, axis=axis))
+    excess = np.clip(diff - np.median(diff[valid]), 0, None)
+    excess[~valid] = 0
+    return excess.sum(axis=1 - axis)
+
+
+def _cell_size(peaks: np.ndarray) -> Optional[float]:
+    if peaks.size < 2:
+        return None
+    return float(np.median(np.diff(peaks)))
+
+
+def find_board(
+    img_bgr: np.ndarray, offset: Tuple[int, int] = (0, 0)
+) -> BoardGeometry:
+    """
+    Encuentra el tablero de ajedrez verde dentro de una imagen y calcula su geometría.
+    Parametros:
+    img_bgr (np.ndarray): Captura de pantalla o imagen guardada en formato BGR
+    offset (Tuple[int, int]): Posición (x, y) de la imagen en la pantalla
+    Regresa:
+    BoardGeometry: Origen, tamaño de bloque, filas y columnas del tablero
+    """
+    mask = _green_mask(img_bgr)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, np.ones((5, 5), np.uint8))
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        raise ValueError("No se encontro el tablero en la imagen")
+
+    # El tablero es la zona verde más grande de la imagen
+    bx, by, bw, bh = cv2.boundingRect(max(contours, key=cv2.contourArea))
+    board = cv2.cvtColor(img_bgr[by : by + bh, bx : bx + bw], cv2.COLOR_BGR2GRAY)
+    board = board.astype(np.float32)
+    green = mask[by : by + bh, bx : bx + bw] > 0
+
+    # En un tablero de ajedrez cada borde entre casillas cambia el tono de verde,
+    # así que los bordes se acumulan en los perfiles de columnas y filas
+    sizes = [
+        s
+        for s in (
+            _cell_size(_edge_peaks(_edge_profile(board, green, axis=1))),
+            _cell_size(_edge_peaks(_edge_profile(board, green, axis=0))),
+        )
+        if s is not None
+    ]
+    if not sizes:
+        raise ValueError("No se pudo medir el tamaño de las casillas")
+
+    block = int(round(sum(sizes) / len(sizes)))
+    cols = int(round(bw / block))
+    rows = int(round(bh / block))
+    if block <= 0 or rows < 3 or cols < 3:
+        raise ValueError(f"Geometria invalida: bloque {block}, {rows}x{cols}")
+
+    return BoardGeometry(offset[0] + bx, offset[1] + by, block, rows, cols)
+
+
+def validate(geometry: BoardGeometry, img_bgr: np.ndarray) -> bool:
+    """
+    Verifica de forma barata que la geometría coincide con la imagen de la región.
+    Solo revisa los centros de la primera fila, la primera columna y la esquina opuesta,
+    que deben ser verdes y alternar de tono con su vecino como en un tablero de ajedrez.
+    Un bloque equivocado termina poniendo dos centros seguidos en la misma casilla, o un
+    centro sobre el borde entre dos. Cada centro es el promedio de un cuadro de 3/4 de casilla (6
+    pixeles como mínimo), y el salto de tono que se pide crece con el ruido de la imagen.
+    Parametros:
+    geometry (BoardGeometry): Geometría a validar
+    img_bgr (np.ndarray): Captura de geometry.region en formato BGR
+    Regresa:
+    bool: True si la geometría sigue siendo válida
+    """
+    if img_bgr.shape[:2] != (geometry.height, geometry.width):
+        return False
+
+    rows, cols, block = geometry.rows, geometry.cols, geometry.block_size
+    half = block // 2
+    patch = max(min(3, half), block * 3 // 8)
+    pairs = [((0, c), (0, c + 1)) for c in range(cols - 1)]
+    pairs += [((r, 0), (r + 1, 0)) for r in range(rows - 1)]
+    corner = (rows - 1, cols - 1)
+    pairs += [(corner, (rows - 1, cols - 2)), (corner, (rows - 2, cols - 1))]
+    cells = [cell for pair in pairs for cell in pair]
+
+    patches = [
+        img_bgr[
+            r * block + half - patch : r * block + half + patch,
+            c * block + half - patch : c * block + half + patch,
+        ]
+        for r, c in cells
+    ]
+    colors = np.array([[p.mean(axis=(0, 1))] for p in patches]).round().astype(np.uint8)
+    green = _green_mask(colors)[:, 0] > 0
+    grays = [cv2.cvtColor(p, cv2.COLOR_BGR2GRAY).astype(np.float32) for p in patches]
+    means = np.array([g.mean() for g in grays])
+    variances = np.array([g.var() for g in grays])
+    if not green.any():
+        return False
+
+    # Ruido del cuadro: la mayoría de los cuadros caen dentro de una sola casilla
+    noise = float(np.median(variances[green]))
+    # Un cuadro que cruza el borde de dos casillas mezcla los dos tonos y no es uniforme
+    uniform = variances <= 4 * noise + 1
+    # El salto de tono tiene que sobresalir del error del promedio de cada cuadro
+    step = max(EDGE_THRESHOLD, STEP_SIGMAS * np.sqrt(2 * noise / grays[0].size))
+
+    checked = 0
+    for i in range(0, len(cells), 2):
+        # La serpiente o la manzana pueden tapar alguna casilla, se ignora ese par
+        if not (green[i] and green[i + 1]):
+            continue
+        if not (uniform[i] and uniform[i + 1]) or abs(means[i] - means[i + 1]) < step:
+            return False
+        checked += 1
+    return checked > 0
+
+
+def save(geometry: BoardGeometry, path: str = CACHE_FILE) -> None:
+    with open(path, "w") as f:
+        json.dump(geometry.to_dict(), f, indent=2)
+
+
+def load(path: str = CACHE_FILE) -> Optional[BoardGeometry]:
+    """Carga la geometría guardada en disco, o None si no existe o está dañada."""
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path) as f:
+            return BoardGeometry.from_dict(json.load(f))
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _screen_capture():
+    # mss se carga solo al capturar la pantalla, calibrar desde una imagen no lo necesita
+    from mss import mss
+
+    return mss()
+
+
+def _grab(sct, region: Tuple[int, int, int, int]) -> np.ndarray:
+    left, top, width, height = region
+    shot = sct.grab({"left": left, "top": top, "width": width, "height": height})
+    return cv2.cvtColor(np.array(shot), cv2.COLOR_BGRA2BGR)
+
+
+def calibrate(sct=None, monitor: int = 1) -> BoardGeometry:
+    """Busca el tablero en una captura completa del monitor indicado."""
+    sct = sct or _screen_capture()
+    mon = sct.monitors[monitor]
+    frame = _grab(sct, (mon["left"], mon["top"], mon["width"], mon["height"]))
+    return find_board(frame, (mon["left"], mon["top"]))
+
+
+def load_or_calibrate(path: str = CACHE_FILE, sct=None) -> BoardGeometry:
+    """
+    Carga la geometría del disco y la valida con una captura de su región.
+    Si no existe o ya no es válida (la ventana se movió) se recalibra y se guarda.
+    Parametros:
+    path (str): Ruta del archivo de caché
+    Regresa:
+    BoardGeometry: Geometría válida del tablero
+    """
+    sct = sct or _screen_capture()
+    geometry = load(path)
+    if geometry is not None and validate(geometry, _grab(sct, geometry.region)):
+        return geometry
+
+    geometry = calibrate(sct)
+    save(geometry, path)
+    print(f"Tablero calibrado: {geometry}")
+    return geometry
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1:
+        # Calibra a partir de una imagen guardada, ej: calibrate_board.png
+        img = cv2.imread(sys.argv[1], cv2.IMREAD_COLOR)
+        if img is None:
+            raise FileNotFoundError(f"No se pudo cargar la imagen en {sys.argv[1]}")
+        print(find_board(img))
+    else:
+        geometry = calibrate()
+        save(geometry)
+        print(f"Tablero calibrado: {geometry}")
@@ -0,0 +1,172 @@
+import os
+from time import sleep
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class FrameSource:
+    """Fuente de cuadros en formato BGR para el Scanner.
+    read() regresa None cuando la fuente se termina."""
+
+    def read(self) -> Optional[np.ndarray]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __iter__(self):
+        while True:
+            frame = self.read()
+            if frame is None:
+                return
+            yield frame
+
+
+class ScreenSource(FrameSource):
+    """Captura en vivo de una región de la pantalla con mss.
+    El diccionario del monitor y el cuadro BGR se crean una sola vez: cada lectura
+    convierte la memoria que entrega mss directamente en el mismo buffer, así que el
+    cuadro regresado se sobreescribe en la siguiente lectura (copiarlo si se guarda)."""
+
+    def __init__(self, region: Tuple[int, int, int, int], sct=None):
+        """Region es una tupla (x, y, width, height)"""
+        self._region = region
+        if sct is None:
+            # mss se carga solo para capturar la pantalla, leer de disco o memoria no lo necesita
+            from mss import mss
+
+            sct = mss()
+        self._sct = sct
+        left, top, width, height = region
+        self._monitor = {"left": left, "top": top, "width": width, "height": height}
+        self._bgr = np.empty((height, width, 3), dtype=np.uint8)
+
+    @property
+    def region(self):
+        return self._region
+
+    def move_to(self, left: int, top: int) -> None:
+        """Mueve la región sin cambiar su tamaño, reutilizando el diccionario del monitor."""
+        self._monitor["left"] = left
+        self._monitor["top"] = top
+        self._region = (left, top, self._region[2], self._region[3])
+
+    def read(self) -> np.ndarray:
+        shot = self._sct.grab(self._monitor)
+        # Vista BGRA sobre los bytes de mss, sin copiarlos a un arreglo nuevo
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(
+            shot.height, shot.width, 4
+        )
+        if bgra.shape[:2] != self._bgr.shape[:2]:
+            # Pantallas con escala: mss entrega otro tamaño, se ajusta el buffer una vez
+            self._bgr = np.empty((shot.height, shot.width, 3), dtype=np.uint8)
+        cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=self._bgr)
+        return self._bgr
+
+
+class DirectorySource(FrameSource):
+    """Lee en orden las imágenes guardadas en una carpeta, ej: screenshots."""
+
+    def __init__(self, folder: str, loop: bool = False):
+        if not os.path.isdir(folder):
+            raise ValueError(f"No existe la carpeta {folder}")
+        self._files = sorted(
+            os.path.join(folder, f)
+            for f in os.listdir(folder)
+            if f.lower().endswith((".png", ".jpg", ".bmp"))
+        )
+        if not self._files:
+            raise ValueError(f"La carpeta {folder} esta vacia")
+        self._loop = loop
+        self._idx = 0
+
+    def __len__(self):
+        return len(self._files)
+
+    def read(self) -> Optional[np.ndarray]:
+        if self._idx >= len(self._files):
+            if not self._loop:
+                return None
+            self._idx = 0
+        file_path = self._files[self._idx]
+        self._idx += 1
+        img = cv2.imread(file_path, cv2.IMREAD_COLOR)
+        if img is None:
+            raise FileNotFoundError(f"No se pudo cargar la imagen en {file_path}")
+        return img
+
+
+class StackSource(FrameSource):
+    """Lee cuadros de un arreglo .npy de forma (N, H, W, 3) mapeado en memoria.
+    Cada cuadro es una vista del archivo, no se copia ni se decodifica."""
+
+    def __init__(self, path: str, loop: bool = False):
+        self._stack = np.load(path, mmap_mode="r")
+        if self._stack.ndim != 4 or self._stack.shape[3] != 3:
+            raise ValueError(f"{path} no es una pila de cuadros BGR (N, H, W, 3)")
+        self._loop = loop
+        self._idx = 0
+
+    def __len__(self):
+        return self._stack.shape[0]
+
+    @property
+    def frame_shape(self):
+        return self._stack.shape[1:]
+
+    def __getitem__(self, idx):
+        return self._stack[idx]
+
+    def read(self) -> Optional[np.ndarray]:
+        if self._idx >= len(self):
+            if not self._loop:
+                return None
+            self._idx = 0
+        frame = self._stack[self._idx]
+        self._idx += 1
+        return frame
+
+    def close(self) -> None:
+        # Se suelta el mapeo para que el archivo se pueda reescribir
+        self._stack = self._stack[:0]
+
+
+def record_stack(
+    source: FrameSource, path: str, num: int, delay: float = 0.0
+) -> int:
+    """
+    Graba num cuadros de una fuente directamente en un archivo .npy mapeado en memoria.
+    Parametros:
+    source (FrameSource): Fuente de donde se leen los cuadros
+    path (str): Ruta del archivo .npy a crear
+    num (int): Cuantos cuadros se quieren grabar
+    delay (float): Segundos de espera entre cuadros
+    Regresa:
+    int: Numero de cuadros grabados, puede ser menor si la fuente se termina
+    """
+    first = source.read()
+    if first is None:
+        raise ValueError("La fuente no tiene cuadros")
+
+    stack = np.lib.format.open_memmap(
+        path, mode="w+", dtype=np.uint8, shape=(num,) + first.shape
+    )
+    stack[0] = first
+    n = 1
+    while n < num:
+        sleep(delay)
+        frame = source.read()
+        if frame is None:
+            break
+        stack[n] = frame
+        n += 1
+    stack.flush()
+    del stack
+
+    if n < num:
+        # Se recorta el archivo a los cuadros que si se grabaron
+        frames = np.load(path)[:n]
+        np.save(path, frames)
+    return n
@@ -1,16 +1,28 @@
-import sys
+"""Simulador del juego con pygame para probar los solvers.
+
+Modos: realtime a FPS pasos por segundo, turbo sin limite de pasos y fixed a un ritmo fijo.
+En turbo y fixed la simulación va separada del dibujo, que se limita con --render-every o
+--render-fps. Con --headless no se abre ninguna ventana.
+"""
 
-import pygame
-from pygame.locals import K_ESCAPE, KEYDOWN, QUIT, K_p, K_r
+import argparse
+import sys
+from time import perf_counter, sleep
 
-from base import Direc, Map, PointType, Pos, Snake
+from base import Map, PointType, Pos, Snake
+from simulation import initial_layout
 from solver import GreedySolver
 
 MAP_ROWS = 15  # 15
 MAP_COLS = 17  # 17
 CELL_PIX = 40
+MAX_WINDOW_PIX = 800  # En tableros grandes las casillas se achican para que quepa la ventana
 FPS = 10
 
+# pygame se importa al abrir la ventana (load_pygame), así --headless y los procesos que solo
+# simulan no pagan su carga
+pygame = None
+
 COLOR_BODY_BLUE = (0, 102, 204)
 COLOR_HEAD_WHITE = (255, 255, 255)
 COLOR_APPLE_RED = (200, 0, 0)
@@ -19,7 +31,201 @@ COLOR_GREEN_DARK = (183, 225, 193)
 COLOR_TEXT = (250, 250, 250)
 
 
+_HEAD_TYPES = {PointType.HEAD_L, PointType.HEAD_U, PointType.HEAD_R, PointType.HEAD_D}
+_BODY_TYPES = {
+    PointType.BODY_LU,
+    PointType.BODY_UR,
+    PointType.BODY_RD,
+    PointType.BODY_DL,
+    PointType.BODY_HOR,
+    PointType.BODY_VER,
+}
+
+
+class Renderer:
+    """
+    Dibuja el juego actualizando solo las casillas que cambiaron.
+    El tablero de ajedrez, los textos y las capas de pausa y fin de juego se dibujan una
+    sola vez y se reutilizan. Cada cuadro solo se copian y actualizan los rectángulos sucios.
+    Se registra como observador del mapa: los avisos de Snake.move y de la comida marcan las
+    casillas sucias, así que cualquiera que mueva la serpiente deja la pantalla al día.
+    """
+
+    def __init__(self, screen, game_map, cell_w, cell_h):
+        self._screen = screen
+        self._map = game_map
+        self._cell_w, self._cell_h = cell_w, cell_h
+        self._width, self._height = screen.get_size()
+
+        self._background = pygame.Surface((self._width, self._height))
+        draw_board(self._background, game_map, cell_w, cell_h)
+
+        pad_food = int(min(cell_w, cell_h) * 0.15)
+        pad_snake = int(min(cell_w, cell_h) * 0.12)
+        self._content = {PointType.FOOD: (COLOR_APPLE_RED, pad_food)}
+        for t in _HEAD_TYPES:
+            self._content[t] = (COLOR_HEAD_WHITE, pad_snake)
+        for t in _BODY_TYPES:
+            self._content[t] = (COLOR_BODY_BLUE, pad_snake)
+
+        self._font = pygame.font.SysFont("Arial", 20)
+        # Textos fijos arriba a la izquierda: nombre -> [texto, superficie, rect]
+        self._labels = {}
+        self._overlays = {}
+        self._dirty = set()
+        self._full = True
+        self._shown = None  # (capa, puntaje) del ultimo cuadro dibujado
+        game_map.add_watcher(self)
+
+    def mark(self, pos):
+        """Marca una casilla del mapa para volver a dibujarla."""
+        if pos is not None:
+            self._dirty.add(pos)
+
+    def mark_all(self):
+        self._full = True
+
+    # Avisos del mapa
+    def occupied(self, pos):
+        self.mark(pos)
+        # La cabeza anterior pasa a ser cuerpo sin aviso, es una de las vecinas de la nueva
+        for adj in pos.all_adj():
+            if self._map.is_inside(adj):
+                self.mark(adj)
+
+    def freed(self, pos):
+        self.mark(pos)
+
+    def reset(self):
+        self.mark_all()
+
+    def food_changed(self, pos):
+        self.mark(pos)
+
+    def _cell_rect(self, pos):
+        return pygame.Rect(
+            (pos.y - 1) * self._cell_w, (pos.x - 1) * self._cell_h, self._cell_w, self._cell_h
+        )
+
+    def _draw_cell(self, pos):
+        rect = self._cell_rect(pos)
+        self._screen.blit(self._background, rect, rect)
+        content = self._content.get(self._map.point(pos).type)
+        if content is not None:
+            color, pad = content
+            pygame.draw.rect(self._screen, color, rect.inflate(-2 * pad, -2 * pad))
+        return rect
+
+    def _cells_in(self, rect):
+        """Posiciones del mapa cuyas casillas tocan el rectángulo."""
+        i0, i1 = rect.top // self._cell_h, (rect.bottom - 1) // self._cell_h
+        j0, j1 = rect.left // self._cell_w, (rect.right - 1) // self._cell_w
+        return [
+            Pos(i + 1, j + 1)
+            for i in range(max(i0, 0), min(i1, self._map.num_rows - 3) + 1)
+            for j in range(max(j0, 0), min(j1, self._map.num_cols - 3) + 1)
+        ]
+
+    def _overlay(self, kind, score):
+        key = (kind, score if kind == "over" else None)
+        surf = self._overlays.get(key)
+        if surf is not None:
+            return surf
+        surf = pygame.Surface((self._width, self._height), pygame.SRCALPHA)
+        cx, cy = self._width // 2, self._height // 2
+        if kind == "over":
+            surf.fill((0, 0, 0, 160))
+            large, small = (
+                pygame.font.SysFont("Arial", 48),
+                pygame.font.SysFont("Arial", 20),
+            )
+            y0 = cy - 60
+            for text, font, color, dy in (
+                ("GAME OVER", large, (255, 255, 255), 0),
+                ("Presiona R para reiniciar o ESC para salir", small, (220, 220, 220), 50),
+                (f"Puntaje final: {score}", small, (220, 220, 220), 85),
+            ):
+                label = font.render(text, True, color)
+                surf.blit(label, label.get_rect(center=(cx, y0 + dy)))
+        else:
+            surf.fill((0, 0, 0, 120))
+            label = pygame.font.SysFont("Arial", 36).render("PAUSA", True, (255, 255, 255))
+            surf.blit(label, label.get_rect(center=(cx, cy)))
+        self._overlays = {key: surf}  # Solo se guarda la ultima capa usada
+        return surf
+
+    def _draw_label(self, row, text, rects):
+        """
+        Dibuja un texto encima de las casillas. Solo se vuelve a copiar si cambió o si se
+        redibujó algo debajo, porque el texto con antialiasing no se puede copiar dos veces.
+        Parametros:
+        row (int): Renglón del texto
+        text (str): Texto a mostrar
+        rects (list): Rectángulos ya actualizados, None si se redibujó toda la pantalla
+        """
+        label = self._labels.get(row)
+        redraw = rects is None
+        if label is None or label[0] != text:
+            surf = self._font.render(text, True, COLOR_TEXT)
+            rect = surf.get_rect(topleft=(8, 8 + 24 * row))
+            if rects is not None:
+                area = rect if label is None else rect.union(label[2])
+                for pos in self._cells_in(area):
+                    rects.append(self._draw_cell(pos))
+            label = self._labels[row] = [text, surf, rect]
+            redraw = True
+        elif rects is not None and label[2].collidelist(rects) != -1:
+            for pos in self._cells_in(label[2]):
+                rects.append(self._draw_cell(pos))
+            redraw = True
+        if redraw:
+            self._screen.blit(label[1], label[2])
+
+    def draw(self, score, paused=False, game_over=False, stats=None):
+        """
+        Dibuja lo que cambió y actualiza solo esos rectángulos de la pantalla.
+        Parametros:
+        score (int): Puntaje actual
+        paused, game_over (bool): Muestran la capa de pausa o de fin de juego
+        stats (str): Texto opcional debajo del puntaje, ej: pasos por segundo
+        """
+        overlay = "over" if game_over else ("pause" if paused else None)
+        if overlay is not None:
+            if not self._full and not self._dirty and self._shown == (overlay, score):
+                return
+            self._full = True
+
+        if self._full:
+            self._screen.blit(self._background, (0, 0))
+            for i in range(1, self._map.num_rows - 1):
+                for j in range(1, self._map.num_cols - 1):
+                    pos = Pos(i, j)
+                    if self._map.point(pos).type in self._content:
+                        self._draw_cell(pos)
+            rects = None
+        else:
+            rects = [self._draw_cell(pos) for pos in self._dirty]
+
+        lines = [f"Puntaje: {score}"]
+        if stats is not None:
+            lines.append(stats)
+        for row, text in enumerate(lines):
+            self._draw_label(row, text, rects)
+
+        if overlay is not None:
+            self._screen.blit(self._overlay(overlay, score), (0, 0))
+        self._shown = (overlay, score)
+
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+        self._dirty.clear()
+        self._full = False
+
+
 def draw_board(screen, game_map, cell_w, cell_h):
+    """Dibuja el tablero de ajedrez vacío."""
     rows, cols = game_map.num_rows - 2, game_map.num_cols - 2
     for i in range(rows):
         for j in range(cols):
@@ -27,147 +233,187 @@ def draw_board(screen, game_map, cell_w, cell_h):
             color = COLOR_GREEN_DARK if (i + j) % 2 == 0 else COLOR_GREEN_LIGHT
             pygame.draw.rect(screen, color, (x, y, cell_w, cell_h))
 
-    for i in range(1, game_map.num_rows - 1):
-        for j in range(1, game_map.num_cols - 1):
-            if game_map.point(Pos(i, j)).type.name == "FOOD":
-                pad = int(min(cell_w, cell_h) * 0.15)
-                x, y = (j - 1) * cell_w, (i - 1) * cell_h
-                pygame.draw.rect(
-                    screen,
-                    COLOR_APPLE_RED,
-                    (x + pad, y + pad, cell_w - 2 * pad, cell_h - 2 * pad),
-                )
-
-
-def draw_snake(screen, snake, cell_w, cell_h):
-    head = {"HEAD_L", "HEAD_U", "HEAD_R", "HEAD_D"}
-    body = {"BODY_LU", "BODY_UR", "BODY_RD", "BODY_DL", "BODY_HOR", "BODY_VER"}
-    pad = int(min(cell_w, cell_h) * 0.12)
-
-    for i in range(1, snake.map.num_rows - 1):
-        for j in range(1, snake.map.num_cols - 1):
-            t = snake.map.point(Pos(i, j)).type.name
-            if t in head or t in body:
-                x, y = (j - 1) * cell_w, (i - 1) * cell_h
-                color = COLOR_HEAD_WHITE if t in head else COLOR_BODY_BLUE
-                pygame.draw.rect(
-                    screen,
-                    color,
-                    (x + pad, y + pad, cell_w - 2 * pad, cell_h - 2 * pad),
-                )
-
-
-def main():
-    pygame.init()
-    game_map = Map(MAP_ROWS + 2, MAP_COLS + 2)
-
-    if MAP_ROWS == 15 and MAP_COLS == 17:
-        init_bodies = [Pos(8, 4), Pos(8, 3), Pos(8, 2), Pos(8, 1)]
-        init_types = [PointType.HEAD_D] + [PointType.BODY_HOR] * (len(init_bodies) - 1)
-
-        init_direc = Direc.RIGHT
-
-        snake = Snake(game_map, init_direc, init_bodies, init_types)
-
-        game_map.create_food(Pos(8, 13))
+
+class StepStats:
+    """Pasos por segundo y tiempo del solver por paso en ventanas de tiempo."""
+
+    def __init__(self, window: float = 0.5):
+        self.window = window
+        self.steps = 0
+        self.solver_time = 0.0
+        self.steps_per_sec = 0.0
+        self.solver_ms = 0.0
+        self._start = perf_counter()
+        self._win_steps = 0
+        self._win_solver = 0.0
+
+    def add(self, solver_secs: float):
+        self.steps += 1
+        self.solver_time += solver_secs
+        self._win_steps += 1
+        self._win_solver += solver_secs
+
+    def update(self, now: float) -> bool:
+        """Cierra la ventana si ya pasó su tiempo. Regresa True si cambiaron los valores."""
+        elapsed = now - self._start
+        if elapsed < self.window:
+            return False
+        self.steps_per_sec = self._win_steps / elapsed
+        self.solver_ms = 1000 * self._win_solver / self._win_steps if self._win_steps else 0.0
+        self._start, self._win_steps, self._win_solver = now, 0, 0.0
+        return True
+
+    def __str__(self):
+        return f"{self.steps_per_sec:.0f} pasos/s, solver {self.solver_ms:.2f} ms/paso"
+
+
+def load_pygame():
+    """Importa pygame una vez y lo deja en el módulo para el Renderer y draw_board."""
+    global pygame
+    if pygame is None:
+        import pygame as module
+
+        pygame = module
+    return pygame
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--mode",
+        choices=("realtime", "turbo", "fixed"),
+        default="realtime",
+        help="realtime: FPS pasos/s dibujando cada paso, turbo: sin limite, "
+        "fixed: --steps-per-sec pasos/s",
+    )
+    parser.add_argument("--steps-per-sec", type=float, default=100.0)
+    parser.add_argument(
+        "--render-every", type=int, default=1, help="Dibuja uno de cada N pasos"
+    )
+    parser.add_argument(
+        "--render-fps", type=float, default=None, help="Limita los cuadros dibujados por segundo"
+    )
+    parser.add_argument(
+        "--headless", action="store_true", help="No abre ventana, solo imprime el resultado"
+    )
+    parser.add_argument("--max-steps", type=int, default=None)
+    parser.add_argument("--rows", type=int, default=MAP_ROWS, help="Filas sin muros")
+    parser.add_argument("--cols", type=int, default=MAP_COLS, help="Columnas sin muros")
+    args = parser.parse_args(argv)
+
+    if args.mode == "realtime":
+        step_time = 1 / FPS
+    elif args.mode == "fixed":
+        step_time = 1 / args.steps_per_sec
     else:
-        raise ValueError("Valor incorrecto de filas y columnas")
+        step_time = 0.0
+    if args.mode == "turbo" and args.render_fps is None and args.render_every == 1:
+        # Dibujar cada paso limitaria la simulación a la velocidad de la pantalla
+        args.render_fps = 30.0
+    render_time = 1 / args.render_fps if args.render_fps else 0.0
+
+    game_map = Map(args.rows + 2, args.cols + 2)
+    init_direc, init_bodies, init_types, init_food = initial_layout(args.rows, args.cols)
+    snake = Snake(game_map, init_direc, init_bodies, init_types)
+
+    def place_food():
+        if init_food is not None:
+            game_map.create_food(init_food)
+        else:
+            game_map.create_rand_food()
+
+    place_food()
 
+    # Las regiones libres se siguen en cada movimiento para descartar búsquedas imposibles
+    game_map.track_connectivity()
     solver = GreedySolver(snake)
 
-    cell_w = cell_h = CELL_PIX
-    screen = pygame.display.set_mode((MAP_COLS * cell_w, MAP_ROWS * cell_h))
-    pygame.display.set_caption("Snake - Pygame")
+    renderer = None
+    if not args.headless:
+        load_pygame()
+        pygame.init()
+        cell_w = cell_h = max(1, min(CELL_PIX, MAX_WINDOW_PIX // max(args.rows, args.cols)))
+        screen = pygame.display.set_mode((args.cols * cell_w, args.rows * cell_h))
+        pygame.display.set_caption("Snake - Pygame")
+        renderer = Renderer(screen, game_map, cell_w, cell_h)
 
-    clock, font = pygame.time.Clock(), pygame.font.SysFont("Arial", 20)
+    stats = StepStats()
+    show_stats = args.mode != "realtime"
     prev_len, score, running, paused, game_over = snake.len(), 0, True, False, False
+    next_step = next_render = perf_counter()
+    drawn_step = None
 
     while running:
-        for ev in pygame.event.get():
-            if ev.type == QUIT or (ev.type == KEYDOWN and ev.key == K_ESCAPE):
-                running = False
-            elif ev.type == KEYDOWN and ev.key == K_r:
-                snake.reset()
-                if MAP_ROWS == 15 and MAP_COLS == 17:
-                    snake.map.create_food(Pos(7, 13))
-                score, prev_len, game_over, paused = 0, snake.len(), False, False
-            elif ev.type == KEYDOWN and ev.key == K_p:
-                paused = not paused
-
-        if not paused and not game_over:
-            if not game_map.has_food():
-                game_map.create_rand_food()
-
-            snake.direc_next = solver.next_direc()
-            snake.move()
-
-            cur_len = snake.len()
-            if cur_len > prev_len:
-                score += cur_len - prev_len
-                prev_len = cur_len
-
-            if snake.dead or game_map.is_full():
-                game_over = True
-
-        draw_board(screen, game_map, cell_w, cell_h)
-        draw_snake(screen, snake, cell_w, cell_h)
-        screen.blit(font.render(f"Puntaje: {score}", True, COLOR_TEXT), (8, 8))
-
-        if game_over:
-            overlay = pygame.Surface(
-                (MAP_COLS * cell_w, MAP_ROWS * cell_h), pygame.SRCALPHA
-            )
-            overlay.fill((0, 0, 0, 160))
-            screen.blit(overlay, (0, 0))
-            go_text = [
-                "GAME OVER",
-                "Presiona R para reiniciar o ESC para salir",
-                f"Puntaje final: {score}",
-            ]
-            large, small = (
-                pygame.font.SysFont("Arial", 48),
-                pygame.font.SysFont("Arial", 20),
-            )
-            y0 = (MAP_ROWS * cell_h) // 2 - 60
-            screen.blit(
-                large.render(go_text[0], True, (255, 255, 255)),
-                large.render(go_text[0], True, (255, 255, 255)).get_rect(
-                    center=((MAP_COLS * cell_w) // 2, y0)
-                ),
-            )
-            screen.blit(
-                small.render(go_text[1], True, (220, 220, 220)),
-                small.render(go_text[1], True, (220, 220, 220)).get_rect(
-                    center=((MAP_COLS * cell_w) // 2, y0 + 50)
-                ),
-            )
-            screen.blit(
-                small.render(go_text[2], True, (220, 220, 220)),
-                small.render(go_text[2], True, (220, 220, 220)).get_rect(
-                    center=((MAP_COLS * cell_w) // 2, y0 + 85)
-                ),
+        now = perf_counter()
+        stats.update(now)
+        # Cada paso se dibuja a lo más una vez, y solo uno de cada render_every
+        pending = renderer is not None and (
+            paused or game_over or (
+                stats.steps != drawn_step and stats.steps % args.render_every == 0
             )
+        )
+        draw_now = pending and now >= next_render
 
-        if paused and not game_over:
-            overlay = pygame.Surface(
-                (MAP_COLS * cell_w, MAP_ROWS * cell_h), pygame.SRCALPHA
-            )
-            overlay.fill((0, 0, 0, 120))
-            screen.blit(overlay, (0, 0))
-            pause_text = pygame.font.SysFont("Arial", 36).render(
-                "PAUSA", True, (255, 255, 255)
-            )
-            screen.blit(
-                pause_text,
-                pause_text.get_rect(
-                    center=(MAP_COLS * cell_w // 2, MAP_ROWS * cell_h // 2)
-                ),
-            )
+        if draw_now:
+            for ev in pygame.event.get():
+                if ev.type == pygame.QUIT or (
+                    ev.type == pygame.KEYDOWN and ev.key == pygame.K_ESCAPE
+                ):
+                    running = False
+                elif ev.type == pygame.KEYDOWN and ev.key == pygame.K_r:
+                    snake.setup()
+                    place_food()
+                    score, prev_len, game_over, paused = 0, snake.len(), False, False
+                elif ev.type == pygame.KEYDOWN and ev.key == pygame.K_p:
+                    paused = not paused
+                    renderer.mark_all()
+            renderer.draw(score, paused, game_over, str(stats) if show_stats else None)
+            next_render = now + render_time
+            drawn_step = stats.steps
+            pending = False
+
+        if paused or game_over:
+            if renderer is None:
+                break
+            sleep(1 / 30)
+            next_step = perf_counter()
+            continue
+
+        if now < next_step:
+            # Se duerme hasta el siguiente paso o el siguiente cuadro, lo que llegue antes
+            wake = min(next_step, next_render) if pending else next_step
+            if wake > now:
+                sleep(wake - now)
+            continue
+        # Si la simulación se atrasa no se intenta recuperar los pasos perdidos
+        next_step = max(next_step + step_time, now)
+
+        # El Renderer observa el mapa: la cabeza, la cola y la comida se marcan solas
+        if not game_map.has_food():
+            game_map.create_rand_food()
+
+        start = perf_counter()
+        snake.direc_next = solver.next_direc()
+        stats.add(perf_counter() - start)
+        snake.move()
+
+        cur_len = snake.len()
+        if cur_len > prev_len:
+            score += cur_len - prev_len
+            prev_len = cur_len
 
-        pygame.display.flip()
-        clock.tick(FPS)
+        if snake.dead or snake.is_full():
+            game_over = True
+        if args.max_steps is not None and stats.steps >= args.max_steps:
+            game_over = True
 
-    pygame.quit()
+    if renderer is not None:
+        pygame.quit()
+    solver_ms = 1000 * stats.solver_time / stats.steps if stats.steps else 0.0
+    print(
+        f"Pasos: {stats.steps}, puntaje: {score}, muerta: {snake.dead}, "
+        f"solver: {solver_ms:.3f} ms/paso"
+    )
     sys.exit()
 
 
@@ -0,0 +1,229 @@
+import importlib.util
+import os
+from time import perf_counter
+
+# Teclas que usa el agente; shift sirve para medir la latencia sin mover la serpiente
+KEYS = ("up", "down", "left", "right", "shift")
+
+
+class LatencyStats:
+    """Estadísticas de cuánto tarda cada envío de tecla."""
+
+    def __init__(self, max_samples: int = 4096):
+        self._samples = []
+        self._max_samples = max_samples
+        self._next = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, secs: float):
+        self.count += 1
+        self.total += secs
+        self.max = max(self.max, secs)
+        # Se guardan las ultimas max_samples muestras para los percentiles
+        if len(self._samples) < self._max_samples:
+            self._samples.append(secs)
+        else:
+            self._samples[self._next] = secs
+            self._next = (self._next + 1) % self._max_samples
+
+    def percentile(self, q: float) -> float:
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        idx = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+        return ordered[idx]
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self) -> dict:
+        """Resumen en milisegundos."""
+        return {
+            "count": self.count,
+            "mean_ms": 1000 * self.mean,
+            "p50_ms": 1000 * self.percentile(50),
+            "p99_ms": 1000 * self.percentile(99),
+            "max_ms": 1000 * self.max,
+        }
+
+
+class InputBackend:
+    """Interfaz para enviar teclas al sistema. Las subclases implementan press()."""
+
+    name = "base"
+
+    def __init__(self):
+        self.stats = LatencyStats()
+
+    @staticmethod
+    def available() -> bool:
+        """Indica si el backend se puede usar en esta máquina."""
+        return False
+
+    def send(self, key: str):
+        """Envía una tecla y registra cuánto tardó."""
+        start = perf_counter()
+        self.press(key)
+        self.stats.add(perf_counter() - start)
+
+    def press(self, key: str):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PyAutoGUIBackend(InputBackend):
+    """Backend original con pyautogui. Se quita la pausa que pyautogui agrega después de cada llamada."""
+
+    name = "pyautogui"
+
+    def __init__(self, pause: float = 0.0):
+        super().__init__()
+        import pyautogui
+
+        pyautogui.PAUSE = pause
+        self._pyautogui = pyautogui
+
+    @staticmethod
+    def available() -> bool:
+        return importlib.util.find_spec("pyautogui") is not None
+
+    def press(self, key: str):
+        self._pyautogui.press(key)
+
+
+class XTestBackend(InputBackend):
+    """Envía las teclas directo al servidor X11 con la extensión XTEST (python-xlib)."""
+
+    name = "xtest"
+
+    def __init__(self):
+        super().__init__()
+        from Xlib import XK, X, display
+        from Xlib.ext import xtest
+
+        self._X = X
+        self._xtest = xtest
+        self._display = display.Display()
+        keysyms = {
+            "up": XK.XK_Up,
+            "down": XK.XK_Down,
+            "left": XK.XK_Left,
+            "right": XK.XK_Right,
+            "shift": XK.XK_Shift_L,
+        }
+        self._keycodes = {
+            key: self._display.keysym_to_keycode(sym) for key, sym in keysyms.items()
+        }
+
+    @staticmethod
+    def available() -> bool:
+        return bool(os.environ.get("DISPLAY")) and (
+            importlib.util.find_spec("Xlib") is not None
+        )
+
+    def press(self, key: str):
+        code = self._keycodes[key]
+        self._xtest.fake_input(self._display, self._X.KeyPress, code)
+        self._xtest.fake_input(self._display, self._X.KeyRelease, code)
+        self._display.sync()
+
+    def close(self):
+        self._display.close()
+
+
+class UInputBackend(InputBackend):
+    """Teclado virtual del kernel con /dev/uinput (python-evdev). Funciona también en Wayland."""
+
+    name = "uinput"
+
+    def __init__(self):
+        super().__init__()
+        from evdev import UInput, ecodes
+
+        self._ecodes = ecodes
+        self._keycodes = {
+            "up": ecodes.KEY_UP,
+            "down": ecodes.KEY_DOWN,
+            "left": ecodes.KEY_LEFT,
+            "right": ecodes.KEY_RIGHT,
+            "shift": ecodes.KEY_LEFTSHIFT,
+        }
+        self._ui = UInput({ecodes.EV_KEY: list(self._keycodes.values())})
+
+    @staticmethod
+    def available() -> bool:
+        return importlib.util.find_spec("evdev") is not None and os.access(
+            "/dev/uinput", os.W_OK
+        )
+
+    def press(self, key: str):
+        code = self._keycodes[key]
+        self._ui.write(self._ecodes.EV_KEY, code, 1)
+        self._ui.syn()
+        self._ui.write(self._ecodes.EV_KEY, code, 0)
+        self._ui.syn()
+
+    def close(self):
+        self._ui.close()
+
+
+class RecordingBackend(InputBackend):
+    """Backend falso en el mismo proceso: guarda cada tecla con su tiempo de perf_counter().
+    Si se da un listener, se llama con (key, tiempo) en cada tecla, ej: un juego local."""
+
+    name = "recording"
+
+    def __init__(self, listener=None):
+        super().__init__()
+        self.events = []
+        self.listener = listener
+
+    @staticmethod
+    def available() -> bool:
+        return True
+
+    def press(self, key: str):
+        now = perf_counter()
+        self.events.append((now, key))
+        if self.listener is not None:
+            self.listener(key, now)
+
+
+BACKENDS = {
+    PyAutoGUIBackend.name: PyAutoGUIBackend,
+    XTestBackend.name: XTestBackend,
+    UInputBackend.name: UInputBackend,
+    RecordingBackend.name: RecordingBackend,
+}
+
+
+def available_backends(include_fake: bool = False):
+    """Nombres de los backends que se pueden usar en esta máquina."""
+    return [
+        name
+        for name, cls in BACKENDS.items()
+        if cls.available() and (include_fake or cls is not RecordingBackend)
+    ]
+
+
+def create_backend(name: str = None) -> InputBackend:
+    """
+    Crea un backend por nombre. Sin nombre se usa el primero disponible con menor
+    latencia esperada: uinput, xtest y por último pyautogui.
+    """
+    if name is None:
+        for candidate in (UInputBackend, XTestBackend, PyAutoGUIBackend):
+            if candidate.available():
+                return candidate()
+        raise RuntimeError("No hay ningun backend de teclado disponible")
+
+    if name not in BACKENDS:
+        raise ValueError(f"Backend desconocido '{name}', opciones: {list(BACKENDS)}")
+    if not BACKENDS[name].available():
+        raise RuntimeError(f"El backend '{name}' no esta disponible en esta maquina")
+    return BACKENDS[name]()
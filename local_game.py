@@ -0,0 +1,167 @@
+"""Juego local que reemplaza al Snake de Google en el navegador.
+
+Corre las reglas de base a un ritmo de ticks configurable en un hilo propio, dibuja cada
+tick con el aspecto de Google Snake en un buffer compartido en memoria que el Scanner lee
+como si fuera la pantalla, y recibe las teclas del backend falso del Actuator.
+"""
+
+import random
+import threading
+from time import perf_counter, sleep
+from typing import Optional
+
+import numpy as np
+
+from base import Direc, Map, PointType, Pos, Snake
+from calibration import BoardGeometry
+from frames import FrameSource
+from input_backends import RecordingBackend
+from synthetic import render_frame
+
+_KEYS = {"up": Direc.UP, "down": Direc.DOWN, "left": Direc.LEFT, "right": Direc.RIGHT}
+
+
+class LocalScreenSource(FrameSource):
+    """Lee el último cuadro del juego local como si fuera una captura de pantalla.
+    Cada lectura copia el cuadro a un buffer propio que se reutiliza."""
+
+    def __init__(self, game: "LocalGame"):
+        self._game = game
+        self._frame = np.empty_like(game._front)
+
+    def read(self) -> Optional[np.ndarray]:
+        if self._game.finished:
+            return None
+        with self._game._frame_lock:
+            np.copyto(self._frame, self._game._front)
+        return self._frame
+
+
+class LocalGame:
+    def __init__(
+        self,
+        rows: int = 15,
+        cols: int = 17,
+        block_size: int = 32,
+        tick: float = 0.1235,
+        seed: Optional[int] = None,
+        max_ticks: Optional[int] = None,
+    ):
+        """
+        Args:
+        rows, cols (int): Tamaño del tablero sin muros.
+        block_size (int): Tamaño en pixeles de cada casilla.
+        tick (float): Segundos entre ticks.
+        seed (int): Semilla para la posición de las manzanas.
+        max_ticks (int): Termina el juego después de estos ticks.
+        """
+        self.geometry = BoardGeometry(0, 0, block_size, rows, cols)
+        self.tick = tick
+        self.max_ticks = max_ticks
+        self._rng = random.Random(seed)
+
+        # Misma posición inicial que el Agent y el juego de Google
+        self.map = Map(rows + 2, cols + 2)
+        mid = rows // 2 + 1
+        self._init_bodies = [Pos(mid, 5), Pos(mid, 4), Pos(mid, 3), Pos(mid, 2)]
+        self.snake = Snake(
+            self.map,
+            Direc.RIGHT,
+            self._init_bodies,
+            [PointType.HEAD_R] + [PointType.BODY_HOR] * 3,
+        )
+        self.map.create_food(Pos(mid, min(13, cols)))
+
+        height, width = rows * block_size, cols * block_size
+        self._front = np.empty((height, width, 3), dtype=np.uint8)
+        self._back = np.empty_like(self._front)
+        self._frame_lock = threading.Lock()
+        render_frame(self.map, block_size, self._front)
+
+        self._keys = []  # Direcciones pendientes, se aplica una por tick como en Google
+        self._key_lock = threading.Lock()
+        self._thread = None
+        self._running = False
+
+        self.ticks = 0
+        self.score = 0
+        self.late_ticks = 0  # Ticks que el hilo del juego no alcanzo a correr a tiempo
+        self.heads = [self.snake.head()]  # Cabeza después de cada tick
+        self.tick_times = []
+        self.keys_received = []  # (tiempo, tick en el que se aplica, direc)
+
+    @property
+    def finished(self):
+        return self.snake.dead or (
+            self.max_ticks is not None and self.ticks >= self.max_ticks
+        ) or (self._thread is not None and not self._running)
+
+    def source(self) -> LocalScreenSource:
+        return LocalScreenSource(self)
+
+    def backend(self) -> RecordingBackend:
+        """Backend falso del Actuator conectado a este juego."""
+        return RecordingBackend(listener=self.on_key)
+
+    def on_key(self, key: str, t: float):
+        direc = _KEYS.get(key)
+        if direc is None:
+            return
+        with self._key_lock:
+            self._keys.append(direc)
+            self.keys_received.append((t, self.ticks + len(self._keys), direc))
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def step(self):
+        """Avanza un tick con la siguiente tecla pendiente."""
+        with self._key_lock:
+            direc = self._keys.pop(0) if self._keys else self.snake.direc
+        # Una tecla en sentido contrario se ignora y la serpiente sigue derecho
+        if direc == Direc.opposite(self.snake.direc):
+            direc = self.snake.direc
+
+        prev_len = self.snake.len()
+        self.snake.move(direc)
+        if self.snake.len() > prev_len:
+            self.score += 1
+        if not self.map.has_food() and not self.snake.dead:
+            self._spawn_food()
+
+        self.ticks += 1
+        self.heads.append(self.snake.head())
+
+        render_frame(self.map, self.geometry.block_size, self._back)
+        with self._frame_lock:
+            self._front, self._back = self._back, self._front
+
+    def _spawn_food(self):
+        empty = [
+            Pos(i, j)
+            for i in range(1, self.map.num_rows - 1)
+            for j in range(1, self.map.num_cols - 1)
+            if self.map.is_empty(Pos(i, j))
+        ]
+        if empty:
+            self.map.create_food(self._rng.choice(empty))
+
+    def _loop(self):
+        next_tick = perf_counter() + self.tick
+        while self._running and not self.finished:
+            wait = next_tick - perf_counter()
+            if wait > 0:
+                sleep(wait)
+            elif -wait > self.tick / 2:
+                self.late_ticks += 1
+            self.tick_times.append(perf_counter())
+            self.step()
+            next_tick += self.tick
+        self._running = False
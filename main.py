@@ -1,39 +1,62 @@
 import os
 import time
-from typing import Tuple
 
 import cv2
-import pyautogui
 
 from actuator import Actuator
 from base import Direc, Map, PointType, Pos, Snake
-from scanner import Scanner
-from solver import GreedySolver
+from calibration import BoardGeometry, load_or_calibrate
+from frames import FrameSource
+from scanner import BLUE_COLOR_RANGES, Scanner
+from solver.config import make_solver
+from tick import ControlScheduler
 
-X, Y = 411, 237
-# x2, y2 = 955, 717
-
-WIDTH = 544
-HEIGHT = 480
-
-ROWS = 15
-COLS = 17
-
-CELL_SIZE = WIDTH // COLS
+# Proporción de azul de los sondeos de consistencia. Es más baja que la del Scanner porque
+# la cola del juego de Google es más delgada que el resto del cuerpo
+PROBE_THRESHOLD = 0.2
+# Revisiones seguidas con diferencias antes de resincronizar, un cuadro a medio dibujar no basta
+DRIFT_CONFIRM = 2
+# Ticks estimados sin ver la cabeza del modelo en pantalla antes de revisar el tablero completo
+STALL_TICKS = 2
 
 
 class Agent:
-    def __init__(self, region: Tuple):
-        self.scanner = Scanner(region)
-        self.actuator = Actuator()
-        self.map = Map(17, 19)
+    def __init__(
+        self,
+        geometry: BoardGeometry,
+        source: FrameSource = None,
+        actuator: Actuator = None,
+        verbose: bool = True,
+    ):
+        """
+        Args:
+        geometry (BoardGeometry): Geometría calibrada del tablero.
+        source (FrameSource): Fuente de cuadros, por defecto la pantalla.
+        actuator (Actuator): Actuador, por defecto uno con pyautogui.
+        verbose (bool): Imprime cada decisión.
+        """
+        self.geometry = geometry
+        self.scanner = Scanner(geometry.region, geometry.rows, geometry.cols, source)
+        self.actuator = actuator or Actuator()
+        self.verbose = verbose
+        self.map = Map(geometry.rows + 2, geometry.cols + 2)
+        mid = geometry.rows // 2 + 1
         self.snake = Snake(
             self.map,
             Direc.RIGHT,
-            [Pos(8, 5), Pos(8, 4), Pos(8, 3), Pos(8, 2)],
+            [Pos(mid, 5), Pos(mid, 4), Pos(mid, 3), Pos(mid, 2)],
             [PointType.HEAD_D] + [PointType.BODY_HOR] * 3,
         )
-        self.solver = GreedySolver(self.snake)
+        self.solver = make_solver(self.snake)
+        # Las teclas se programan según la fase de los ticks medida en pantalla
+        self.scheduler = ControlScheduler(self.actuator)
+        self._seen_head = None
+
+        # Detección de diferencias entre el modelo y la pantalla
+        self.resyncs = 0  # Veces que el modelo se reconstruyó desde la pantalla en esta partida
+        self._mismatches = 0
+        self._freed = None  # Casilla que la cola del modelo dejó libre en el último movimiento
+        self._last_advance = None
 
     def generate_screenshots(self):
         delay = 0.1235
@@ -52,10 +75,11 @@ class Agent:
                         os.path.join(folder_name, file_name)
                     )
                     food_pos = self.scanner.apple_coords(img_bgr)
-                    x = (food_pos.y - 1) * CELL_SIZE
-                    y = (food_pos.x - 1) * CELL_SIZE
+                    cell_size = self.geometry.block_size
+                    x = (food_pos.y - 1) * cell_size
+                    y = (food_pos.x - 1) * cell_size
 
-                    self.add_black_rectangle(file_name, (x, y, CELL_SIZE, CELL_SIZE))
+                    self.add_black_rectangle(file_name, (x, y, cell_size, cell_size))
         else:
             raise ValueError("No hay carpeta screenshots")
 
@@ -76,51 +100,142 @@ class Agent:
         """
         # Caso 1: El sensor le envio una posición
         if isinstance(percept, Pos):
-            # La serpiente econtro la comida
-            self.map.rm_food()
-            self.map.create_food(percept)
+            self._set_food(percept)
 
-            print(f"Food: {self.map.food}")
             new_direc = self.solver.next_direc()
-            print(f"Cabeza: {self.snake.head()}")
-            print(f"Direc: {new_direc}")
+            if self.verbose:
+                print(f"Food: {self.map.food}")
+                print(f"Cabeza: {self.snake.head()}")
+                print(f"Direc: {new_direc}")
 
-            self.snake.move(new_direc)
+            self._move(new_direc)
 
             return new_direc
         else:
             print(f"Percepcion: {percept}")
             raise "Percepcion no esperada"
 
-    def run(self):
-        self.generate_screenshots()
-        self.test_scanner_accuracy()
+    def _set_food(self, pos: Pos):
+        # La serpiente econtro la comida. Si la manzana no se ve o está debajo de la
+        # serpiente del modelo (se la está comiendo) se deja la comida anterior
+        if pos != self.map.food and self.map.is_empty(pos):
+            self.map.rm_food()
+            self.map.create_food(pos)
 
-        n = 0
-        while n < 0:
-            print(f"\nIntento numero {n}")
-            # start_time = time.time()
-            img_bgr = self.scanner.capture_region()
+    def _move(self, direc: Direc):
+        """Mueve el modelo y recuerda la casilla que dejó libre la cola para el siguiente sondeo."""
+        tail = self.snake.tail()
+        self.snake.move(direc)
+        self._freed = tail if self.snake.tail() != tail else None
+
+    def step(self) -> bool:
+        """
+        Procesa un cuadro. Cuando la cabeza en pantalla llega a la cabeza del modelo se
+        revisa que la cola también coincida y se calcula la siguiente dirección, que se
+        programa dentro de la ventana del siguiente tick. Si el modelo ya no coincide con la
+        pantalla, o su cabeza no aparece en varios ticks, se reconstruye con el tablero completo.
+        Regresa:
+        bool: False si la fuente de cuadros se termino o la serpiente del modelo murió
+        """
+        if self.snake.dead:
+            return False
+        img_bgr = self.scanner.capture_region()
+        now = time.perf_counter()
+        if img_bgr is None:
+            return False
+
+        head = self.snake.head()
+        seen = head if self.scanner.snake_in_cell(img_bgr, head) else self._seen_head
+        self.scheduler.observe(now, seen)
+        if seen != self._seen_head:
+            if not self._consistent(img_bgr):
+                self._resync(img_bgr)
+            advance = True
+        elif self._stalled(now):
+            # La cabeza del modelo no aparece, la serpiente real va por otro lado. Se está a
+            # mitad de un tick y una tecla ya no llega a tiempo: en el siguiente tick la
+            # serpiente real sigue derecho, el modelo da ese paso y se decide al verlo
+            self._last_advance = now
+            if self._resync(img_bgr):
+                self._seen_head = self.snake.head()
+                self._set_food(self.scanner.apple_coords(img_bgr))
+                self._move(self.snake.direc)
+            advance = False
+        else:
+            advance = False
+
+        if advance:
+            self._seen_head = self.snake.head()
+            self._last_advance = now
             food_pos = self.scanner.apple_coords(img_bgr)
             action = self.compute(food_pos)
-            # print(action)
-            # end_time = time.time()
-            self.actuator.send(action)
-            # execution_time = end_time - start_time
-            # print(f"Tiempo de ejecución {execution_time}\n")
-            time.sleep(0.04)
+            self.scheduler.schedule(action, now)
+        return True
+
+    def _consistent(self, img_bgr) -> bool:
+        """
+        Sondeo barato de cada tick: la cola del modelo se ve azul y la casilla que dejó
+        libre ya no. Solo se reporta la diferencia si se repite DRIFT_CONFIRM veces seguidas.
+        """
+        tail = self.snake.tail()
+        tail_ok = self.scanner.cell_ratio(img_bgr, tail, BLUE_COLOR_RANGES) > PROBE_THRESHOLD
+        freed = self._freed
+        freed_ok = (
+            freed is None
+            or freed == self.snake.head()
+            or self.scanner.cell_ratio(img_bgr, freed, BLUE_COLOR_RANGES) < PROBE_THRESHOLD
+        )
+        if tail_ok and freed_ok:
+            self._mismatches = 0
+            return True
+        self._mismatches += 1
+        return self._mismatches < DRIFT_CONFIRM
+
+    def _stalled(self, now: float) -> bool:
+        if self._last_advance is None:
+            return False
+        return now - self._last_advance > STALL_TICKS * self.scheduler.estimator.period
+
+    def _resync(self, img_bgr) -> bool:
+        """
+        Reconstruye la serpiente del modelo con la que se ve en el cuadro y descarta las
+        teclas pendientes, que eran del plan viejo.
+        Regresa:
+        bool: True si el modelo cambió
+        """
+        self._mismatches = 0
+        model = list(self.snake.bodies)
+        body = self.scanner.snake_body(img_bgr, model)
+        # El modelo va un tick adelante: la pantalla puede mostrar todavía su estado anterior
+        if len(body) < 2 or body == model or body[: len(model) - 1] == model[1:]:
+            return False
+        self.snake.rebuild(body)
+        self.actuator.reset(self.snake.direc)
+        self._freed = None
+        self.resyncs += 1
+        if self.verbose:
+            print(f"Resincronizado ({self.resyncs}): cabeza {body[0]}, largo {len(body)}")
+        return True
+
+    def run(self, max_steps: int = None):
+        n = 0
+        while (max_steps is None or n < max_steps) and not self.snake.dead:
+            if not self.step():
+                break
             n += 1
 
+        ticks = self.scheduler.estimator
+        print(f"Periodo estimado: {1000 * ticks.period:.1f} ms, ticks: {ticks.ticks}")
+        print(f"Resincronizaciones: {self.resyncs}")
 
-if __name__ == "__main__":
-    x1, y1 = 411, 237
-    x2, y2 = 955, 717
-    board_width = x2 - x1
-    board_height = y2 - y1
 
-    agent = Agent((x1, y1, board_width, board_height))
+if __name__ == "__main__":
+    import pyautogui
 
     pyautogui.hotkey("alt", "tab")
     time.sleep(1)
 
+    # Se usa la geometria guardada si sigue siendo valida, si no se recalibra
+    agent = Agent(load_or_calibrate())
+
     agent.run()
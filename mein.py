@@ -1,20 +1,13 @@
 import os
 import time
-from typing import Tuple
-
-import cv2
-import pyautogui
-
-from actuator import Actuator
-from base import Direc, Map, PointType, Pos, Snake
-from scanner import Scanner
-from solver import GreedySolver
 
 import cv2
 import mss
-import sys
 import numpy as np
-import pyautogui
+
+from base import Direc, Map, PointType, Pos, Snake
+from calibration import find_board, load_or_calibrate
+from solver.config import make_solver
 
 ROWS, COLS = 15, 17
 BLUE_THRESHOLD = 150
@@ -89,6 +82,7 @@ def ratio_blocks(masks_stack, block_size=(35, 35), grid_shape=(ROWS, COLS)):
 def calibrate_region(screen_region):
     frame = capture_region(screen_region)
     cv2.imwrite("calibrate_board.png", frame)
+    return find_board(frame, screen_region[:2])
 
 def target_in_apple_zone(target_coord, apple_coord):
     return abs(target_coord[0]-apple_coord[0]) <= 2 and abs(target_coord[1]-apple_coord[1]) <= 2
@@ -104,7 +98,7 @@ class Agent:
             [Pos(8, 5), Pos(8, 4), Pos(8, 3), Pos(8, 2)],
             [PointType.HEAD_D] + [PointType.BODY_HOR] * 3,
         )
-        self.solver = GreedySolver(self.snake)
+        self.solver = make_solver(self.snake)
 
     def generate_screenshots(self):
         delay = 0.1235
@@ -184,15 +178,20 @@ class Agent:
 
 
 def main():
+    # pyautogui necesita una pantalla solo para importarse, se carga al usarlo
+    import pyautogui
+
     agent = Agent()
 
     targets = [(14, 16), (14, 0), (0, 0), (0,16)]
     instructions = ["left", "up", "right", "down"]
 
-    screen_region = (691, 346, 595, 525)
-    target_region = (35 * targets[0][1] + 691, 35 * targets[0][0] + 346,  35, 35)
+    geometry = load_or_calibrate()
+    screen_region = geometry.region
+    target_region = geometry.cell_region(*targets[0])
 
-    block_size = ((35, 35))
+    block_size = (geometry.block_size, geometry.block_size)
+    grid_shape = (geometry.rows, geometry.cols)
 
     red_mask = np.zeros((1, screen_region[3], screen_region[2]), dtype=np.uint8)
     blue_mask = np.zeros((1, block_size[0], block_size[1]), dtype=np.uint8)
@@ -201,7 +200,7 @@ def main():
     while(True):
         frame = capture_region(screen_region)
         get_color_masks(frame, red_color_ranges, red_mask)
-        red_cells_ratios = ratio_blocks(red_mask, block_size)
+        red_cells_ratios = ratio_blocks(red_mask, block_size, grid_shape)
         apple_coord = np.unravel_index(np.argmax(red_cells_ratios), red_cells_ratios.shape)
 
         trap_frame = capture_region(target_region)
@@ -210,7 +209,7 @@ def main():
 
         if(blue_mean > BLUE_THRESHOLD):
             pyautogui.press(instructions[i%len(instructions)])
-            target_region = (35 * targets[(i+1)%(len(instructions))][1] + 691, 35 * targets[(i+1)%(len(instructions))][0] + 346,  35, 35)
+            target_region = geometry.cell_region(*targets[(i+1)%(len(instructions))])
             #print(target_region)
             if (target_in_apple_zone(targets[(i+1)%(len(instructions))],apple_coord)):
                 BLUE_THRESHOLD = 190
@@ -218,83 +217,15 @@ def main():
                 BLUE_THRESHOLD = 120
             i = i+1
 
-def direc_to_str(direc):
-    match direc:
-        case direc.UP:
-            return "up"
-
-        case direc.DOWN:
-            return "down"
-
-        case direc.LEFT:
-            return "left"
-
-        case direc.RIGHT:
-            return "right"
-
 if __name__ == '__main__':
-    agent = Agent()
-    agent.map.create_food(Pos(8, 13))
-    last_direc = Direc.RIGHT
-    next_direc = Direc.RIGHT
-
-    while(next_direc == last_direc):
-        agent.snake.move(next_direc)
-        next_direc = agent.solver.next_direc()
-    last_direc = next_direc
-
-    targets = []
-    instructions = []
+    # El ciclo de puntos de giro ahora vive en trigger.TriggerAgent
+    import pyautogui
 
-    targets.append((agent.snake.head().x - 1, agent.snake.head().y - 1))
-    instructions.append(direc_to_str(next_direc))
+    from trigger import TriggerAgent
 
-    screen_region = (691, 346, 595, 525)
-    target_region = (35 * targets[0][1] + 691, 35 * targets[0][0] + 346,  35, 35)
+    pyautogui.hotkey("alt", "tab")
+    time.sleep(1)
 
-    block_size = ((35, 35))
-
-    red_mask = np.zeros((1, screen_region[3], screen_region[2]), dtype=np.uint8)
-    blue_mask = np.zeros((1, block_size[0], block_size[1]), dtype=np.uint8)
-
-    print(next_direc)
-    print(targets[0])
-    print("---")
-
-    while(True):
-        trap_frame = capture_region(target_region)
-        get_color_masks(trap_frame, blue_color_ranges, blue_mask)
-        blue_mean = blue_mask.mean()
-
-        if(blue_mean > BLUE_THRESHOLD):
-            pyautogui.press(instructions.pop())
-            if (not agent.map.food):
-                time.sleep(0.01)
-                print("looked for food")
-                frame = capture_region(screen_region)
-                get_color_masks(frame, red_color_ranges, red_mask)
-                red_cells_ratios = ratio_blocks(red_mask, block_size)
-                apple_coord = np.unravel_index(np.argmax(red_cells_ratios), red_cells_ratios.shape)
-                print(apple_coord[1], apple_coord[2])
-                agent.map.create_food(Pos(apple_coord[1]+1, apple_coord[2] +1))
-                print(agent.map.food)
-
-            while(next_direc == last_direc):
-                agent.snake.move(next_direc)
-                next_direc = agent.solver.next_direc()
-
-            instructions.append(direc_to_str(next_direc))
-            print(next_direc)
-            last_direc = next_direc
-
-            targets.append((agent.snake.head().x - 1, agent.snake.head().y - 1))
-
-            next_target = targets.pop()
-            print(next_target)
-            print("---")
-            target_region = (35 * next_target[1] + 691, 35 * next_target[0] + 346,  35, 35)
-            #print(target_region)
-            if (target_in_apple_zone(next_target, apple_coord)):
-                BLUE_THRESHOLD = 150
-            else:
-                BLUE_THRESHOLD = 120
+    agent = TriggerAgent(load_or_calibrate())
+    agent.set_food(Pos(8, 13))
+    agent.run()
@@ -0,0 +1,3 @@
+from rl.env import BatchEnv
+from rl.network import QNetwork
+from rl.solver import LearnedSolver
@@ -0,0 +1,115 @@
+"""Entorno por lotes: muchos tableros que avanzan juntos con una acción por tablero.
+
+Las reglas corren en Python tablero por tablero, pero la observación y las características
+de todo el lote se escriben en buffers de numpy fijos, así la política evalúa el lote de una vez.
+"""
+
+import random
+
+import numpy as np
+
+from base.direc import Direc
+from base.observation import Observation, write_batch
+from simulation import new_game
+
+# Acciones relativas a la dirección actual: nunca hay una acción en sentido contrario
+STRAIGHT, LEFT, RIGHT = range(3)
+ACTIONS = ("straight", "left", "right")
+
+# TURNS[acción][valor de la dirección] -> nueva dirección
+TURNS = (
+    (Direc.NONE, Direc.LEFT, Direc.UP, Direc.RIGHT, Direc.DOWN),
+    (Direc.NONE, Direc.DOWN, Direc.LEFT, Direc.UP, Direc.RIGHT),
+    (Direc.NONE, Direc.UP, Direc.RIGHT, Direc.DOWN, Direc.LEFT),
+)
+
+# Cuartos de vuelta (np.rot90) que dejan la dirección de cada valor apuntando hacia arriba
+_ROTATIONS = (0, 3, 0, 1, 2)
+
+# Recompensas
+REWARD_FOOD = 1.0
+REWARD_DEATH = -1.0
+
+
+def featurize(obs, direcs, out):
+    """
+    Características de un lote: cada ventana se gira para que la serpiente mire hacia arriba
+    y se aplana, así las acciones relativas significan lo mismo en todos los tableros.
+    Parametros:
+    obs (ndarray): Lote (n, planos, lado, lado) de Observation con recorte
+    direcs (list): Dirección actual de cada tablero
+    out (ndarray): Buffer (n, planos * lado * lado)
+    Regresa:
+    ndarray: out
+    """
+    rotations = np.fromiter((_ROTATIONS[d._value_] for d in direcs), np.int8, len(direcs))
+    for k in range(4):
+        idx = np.flatnonzero(rotations == k)
+        if len(idx):
+            out[idx] = np.rot90(obs[idx], k, axes=(2, 3)).reshape(len(idx), -1)
+    return out
+
+
+class BatchEnv:
+    """
+    num_envs partidas del mismo tamaño que se juegan a la vez. Cuando una termina (muere,
+    llena el tablero o pasa max_idle pasos sin comer) se reinicia sola y su puntaje queda en
+    finished; la observación que se regresa para ese tablero ya es la de la partida nueva.
+    """
+
+    def __init__(self, num_envs=64, rows=15, cols=17, crop=5, seed=0, max_idle=None):
+        """
+        Args:
+        num_envs (int): Tableros en el lote.
+        rows, cols (int): Tamaño de cada tablero sin muros.
+        crop (int): Radio de la ventana egocéntrica de Observation.
+        seed (int): Semilla de la comida.
+        max_idle (int): Pasos sin comer antes de cortar la partida, por defecto 2 * rows * cols.
+        """
+        random.seed(seed)
+        self.num_envs = num_envs
+        self.max_idle = max_idle or 2 * rows * cols
+        self.games = [new_game(rows, cols) for _ in range(num_envs)]
+        self.observations = [Observation(snake, crop) for _, snake in self.games]
+        self.obs = self.observations[0].new_buffer(num_envs)
+        self.num_features = self.obs[0].size
+        self.features = np.empty((num_envs, self.num_features), dtype=np.float32)
+        self._start_len = self.games[0][1].len()
+        self._idle = [0] * num_envs
+        self.steps = 0
+        self.finished = []  # Puntaje de cada partida terminada
+
+    def observe(self):
+        """Características actuales del lote, escritas en self.features."""
+        write_batch(self.observations, self.obs)
+        return featurize(self.obs, [snake.direc for _, snake in self.games], self.features)
+
+    def step(self, actions):
+        """
+        Mueve cada tablero con su acción relativa.
+        Regresa:
+        tuple: (características, recompensas, terminados), los dos últimos como arreglos
+        """
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        for k, (game_map, snake) in enumerate(self.games):
+            prev_len = snake.len()
+            snake.move(TURNS[actions[k]][snake.direc._value_])
+            if snake.dead:
+                rewards[k], dones[k] = REWARD_DEATH, True
+            elif snake.len() > prev_len:
+                rewards[k] = REWARD_FOOD
+                self._idle[k] = 0
+                dones[k] = snake.is_full()
+            else:
+                self._idle[k] += 1
+                dones[k] = self._idle[k] > self.max_idle
+
+            if dones[k]:
+                self.finished.append(snake.len() - self._start_len)
+                self._idle[k] = 0
+                snake.setup()
+            if not game_map.has_food():
+                game_map.create_rand_food()
+        self.steps += self.num_envs
+        return self.observe(), rewards, dones
@@ -0,0 +1,109 @@
+"""Red densa pequeña en numpy que estima el valor Q de cada acción relativa."""
+
+import json
+
+import numpy as np
+
+
+class QNetwork:
+    """
+    Perceptrón con capas ocultas ReLU y una salida lineal por acción. Se entrena con la
+    pérdida de Huber sobre la acción tomada y Adam; no depende de nada más que numpy.
+    """
+
+    def __init__(self, num_inputs, hidden=(128,), num_actions=3, seed=0, lr=1e-3):
+        """
+        Args:
+        num_inputs (int): Largo del vector de características.
+        hidden (tuple): Neuronas de cada capa oculta.
+        num_actions (int): Salidas, una por acción.
+        seed (int): Semilla de la inicialización.
+        lr (float): Tasa de aprendizaje de Adam.
+        """
+        rng = np.random.default_rng(seed)
+        self.sizes = (num_inputs,) + tuple(hidden) + (num_actions,)
+        self.lr = lr
+        self.meta = {}  # Datos extra que se guardan con los pesos, ej: el recorte del entorno
+        self.weights, self.biases = [], []
+        for n_in, n_out in zip(self.sizes, self.sizes[1:]):
+            # Inicialización de He, adecuada para ReLU
+            self.weights.append(rng.standard_normal((n_in, n_out)).astype(np.float32) * np.sqrt(2 / n_in))
+            self.biases.append(np.zeros(n_out, dtype=np.float32))
+        self._m = [np.zeros_like(p) for p in self.params]
+        self._v = [np.zeros_like(p) for p in self.params]
+        self._t = 0
+
+    @property
+    def params(self):
+        return self.weights + self.biases
+
+    def predict(self, x):
+        """Valores Q (n, num_actions) para un lote de características (n, num_inputs)."""
+        for w, b in zip(self.weights[:-1], self.biases[:-1]):
+            x = np.maximum(x @ w + b, 0)
+        return x @ self.weights[-1] + self.biases[-1]
+
+    def train_step(self, x, actions, targets):
+        """
+        Un paso de Adam hacia targets en la acción tomada de cada fila.
+        Parametros:
+        x (ndarray): Características (n, num_inputs)
+        actions (ndarray): Acción tomada en cada fila
+        targets (ndarray): Valor objetivo de esa acción
+        Regresa:
+        float: Pérdida de Huber promedio antes del paso
+        """
+        n = len(x)
+        rows = np.arange(n)
+        activations = [x]
+        for w, b in zip(self.weights[:-1], self.biases[:-1]):
+            activations.append(np.maximum(activations[-1] @ w + b, 0))
+        q = activations[-1] @ self.weights[-1] + self.biases[-1]
+
+        error = q[rows, actions] - targets
+        loss = float(np.mean(np.where(np.abs(error) < 1, 0.5 * error ** 2, np.abs(error) - 0.5)))
+        grad = np.zeros_like(q)
+        grad[rows, actions] = np.clip(error, -1, 1) / n
+
+        grads_w, grads_b = [], []
+        for layer in range(len(self.weights) - 1, -1, -1):
+            grads_w.append(activations[layer].T @ grad)
+            grads_b.append(grad.sum(axis=0))
+            if layer:
+                grad = (grad @ self.weights[layer].T) * (activations[layer] > 0)
+        grads = grads_w[::-1] + grads_b[::-1]
+
+        self._t += 1
+        beta1, beta2 = 0.9, 0.999
+        scale = self.lr * np.sqrt(1 - beta2 ** self._t) / (1 - beta1 ** self._t)
+        for p, g, m, v in zip(self.params, grads, self._m, self._v):
+            m *= beta1
+            m += (1 - beta1) * g
+            v *= beta2
+            v += (1 - beta2) * g * g
+            p -= scale * m / (np.sqrt(v) + 1e-8)
+        return loss
+
+    def copy_from(self, other):
+        """Copia los pesos de otra red con la misma forma, ej: la red objetivo del entrenamiento."""
+        for p, q in zip(self.params, other.params):
+            np.copyto(p, q)
+
+    def save(self, path):
+        """Guarda los pesos y meta en un .npz."""
+        arrays = {f"w{k}": w for k, w in enumerate(self.weights)}
+        arrays.update({f"b{k}": b for k, b in enumerate(self.biases)})
+        np.savez(path, meta=json.dumps({"sizes": self.sizes, **self.meta}), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Red guardada con save(), lista para predict()."""
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            sizes = meta.pop("sizes")
+            net = cls(sizes[0], sizes[1:-1], sizes[-1])
+            for k in range(len(net.weights)):
+                net.weights[k][...] = data[f"w{k}"]
+                net.biases[k][...] = data[f"b{k}"]
+        net.meta = meta
+        return net
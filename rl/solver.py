@@ -0,0 +1,56 @@
+"""Solver que elige la dirección con una QNetwork entrenada con rl.train."""
+
+import numpy as np
+
+from base.observation import Observation
+from rl.env import TURNS, featurize
+from rl.network import QNetwork
+from solver.base import BaseSolver
+
+# TURNS_FROM[valor de la dirección] -> dirección de cada acción, en el orden de la salida de la red
+TURNS_FROM = tuple(tuple(turn[value] for turn in TURNS) for value in range(len(TURNS[0])))
+
+
+class LearnedSolver(BaseSolver):
+    """
+    Política aprendida con la misma interfaz que los demás solvers. Cada decisión escribe la
+    observación en buffers reservados al crear el solver y evalúa la red una vez.
+    """
+
+    def __init__(self, snake, checkpoint=None, network=None, mask_unsafe=True):
+        """
+        Args:
+        snake (Snake): Serpiente a controlar.
+        checkpoint (str): Archivo .npz guardado con QNetwork.save.
+        network (QNetwork): Red ya cargada, en lugar de checkpoint.
+        mask_unsafe (bool): Descarta las acciones que chocan de inmediato si queda alguna segura.
+        """
+        super().__init__(snake)
+        if network is None:
+            if checkpoint is None:
+                raise ValueError("LearnedSolver necesita un checkpoint o una red")
+            network = QNetwork.load(checkpoint)
+        self.network = network
+        self.crop = network.meta.get("crop")
+        self.mask_unsafe = mask_unsafe
+        self._observation = Observation(snake, self.crop)
+        self._obs = self._observation.new_buffer(1)
+        self._features = np.empty((1, self._obs[0].size), dtype=np.float32)
+
+    def next_direc(self):
+        if self._observation.snake is not self.snake:
+            # Se cambió la serpiente con el setter de BaseSolver
+            self._observation.close()
+            self._observation = Observation(self.snake, self.crop)
+
+        self._observation.write(self._obs[0])
+        featurize(self._obs, (self.snake.direc,), self._features)
+        q = self.network.predict(self._features)[0]
+
+        direcs = TURNS_FROM[self.snake.direc._value_]
+        if self.mask_unsafe:
+            head = self.snake.head()
+            safe = [self.map.is_safe(head.adj(d)) for d in direcs]
+            if any(safe):
+                q = np.where(safe, q, -np.inf)
+        return direcs[int(np.argmax(q))]
@@ -0,0 +1,196 @@
+"""Entrenamiento de una política Q en numpy sobre BatchEnv.
+
+Uso:
+    python -m rl.train --envs 64 --steps 3000 --out policy.npz
+    python -m rl.train --eval policy.npz --games 20
+
+Q-learning con red objetivo (DQN doble) y un buffer de repetición en uint8. Cada paso mueve
+los --envs tableros con una sola evaluación de la red; los pasos de gradiente se hacen sobre
+lotes sacados del buffer. Se reportan como métricas principales los pasos de entorno por
+segundo, los microsegundos de inferencia por decisión y el puntaje de las últimas partidas.
+Al final se compara LearnedSolver con GreedySolver en partidas completas de simulation.
+"""
+
+import argparse
+import statistics
+from time import perf_counter
+
+import numpy as np
+
+from rl.env import BatchEnv
+from rl.network import QNetwork
+from rl.solver import LearnedSolver
+from simulation import play_game
+
+
+class ReplayBuffer:
+    """Transiciones en arreglos circulares. Las características son 0/1 y se guardan en uint8."""
+
+    def __init__(self, capacity, num_features):
+        self.capacity = capacity
+        self.states = np.zeros((capacity, num_features), dtype=np.uint8)
+        self.next_states = np.zeros((capacity, num_features), dtype=np.uint8)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=bool)
+        self.size = 0
+        self._next = 0
+
+    def add(self, states, actions, rewards, next_states, dones):
+        """Agrega un lote de transiciones, una por tablero."""
+        idx = (self._next + np.arange(len(states))) % self.capacity
+        self.states[idx] = states
+        self.next_states[idx] = next_states
+        self.actions[idx] = actions
+        self.rewards[idx] = rewards
+        self.dones[idx] = dones
+        self._next = (self._next + len(states)) % self.capacity
+        self.size = min(self.size + len(states), self.capacity)
+
+    def sample(self, rng, batch):
+        idx = rng.integers(0, self.size, batch)
+        return (
+            self.states[idx].astype(np.float32),
+            self.actions[idx],
+            self.rewards[idx],
+            self.next_states[idx].astype(np.float32),
+            self.dones[idx],
+        )
+
+
+def train(
+    envs=64, steps=3000, rows=15, cols=17, crop=5, hidden=(128,), gamma=0.95,
+    lr=1e-3, batch=256, buffer=50000, target_every=250, eps_start=1.0, eps_end=0.02,
+    eps_steps=1500, log_every=250, seed=0, network=None,
+):
+    """
+    Entrena una QNetwork. Cada paso son envs pasos de entorno y un paso de gradiente.
+    Parametros:
+    network (QNetwork): Red para seguir entrenando, ej: cargada de un checkpoint
+    El resto de parámetros son los del entorno (BatchEnv) y los del DQN.
+    Regresa:
+    tuple: (red entrenada, métricas del último registro)
+    """
+    rng = np.random.default_rng(seed)
+    if network is not None:
+        # Una red guardada solo sirve con el recorte con el que se entrenó
+        crop = network.meta.get("crop", crop)
+    env = BatchEnv(envs, rows, cols, crop, seed)
+    if network is None:
+        network = QNetwork(env.num_features, hidden, seed=seed, lr=lr)
+    network.meta.update(crop=crop, rows=rows, cols=cols)
+    target = QNetwork(env.num_features, network.sizes[1:-1], seed=seed)
+    target.copy_from(network)
+    replay = ReplayBuffer(buffer, env.num_features)
+
+    features = env.observe()
+    states = np.empty_like(features)
+    env_time = infer_time = train_time = 0.0
+    losses = []
+    metrics = {}
+    for step in range(1, steps + 1):
+        eps = max(eps_end, eps_start - (eps_start - eps_end) * step / eps_steps)
+
+        start = perf_counter()
+        actions = network.predict(features).argmax(axis=1)
+        infer_time += perf_counter() - start
+        explore = rng.random(envs) < eps
+        actions[explore] = rng.integers(0, 3, explore.sum())
+
+        np.copyto(states, features)
+        start = perf_counter()
+        features, rewards, dones = env.step(actions)
+        env_time += perf_counter() - start
+        replay.add(states, actions, rewards, features, dones)
+
+        if replay.size >= batch:
+            start = perf_counter()
+            x, a, r, x_next, done = replay.sample(rng, batch)
+            # DQN doble: la red elige la acción siguiente y la red objetivo la evalúa
+            best = network.predict(x_next).argmax(axis=1)
+            q_next = target.predict(x_next)[np.arange(batch), best]
+            losses.append(network.train_step(x, a, r + gamma * q_next * ~done))
+            train_time += perf_counter() - start
+            if step % target_every == 0:
+                target.copy_from(network)
+
+        if step % log_every == 0 or step == steps:
+            recent = env.finished[-100:]
+            metrics = {
+                "step": step,
+                "env_steps": env.steps,
+                "env_steps_per_s": env.steps / env_time,
+                "inference_us": 1e6 * infer_time / env.steps,
+                "train_ms": 1000 * train_time / max(1, len(losses)),
+                "games": len(env.finished),
+                "mean_score": statistics.fmean(recent) if recent else 0.0,
+                "loss": statistics.fmean(losses[-log_every:]) if losses else float("nan"),
+                "eps": eps,
+            }
+            print(
+                f"paso {step:>6} entorno {metrics['env_steps_per_s']:>8.0f} pasos/s "
+                f"inferencia {metrics['inference_us']:>6.2f} us/decisión "
+                f"gradiente {metrics['train_ms']:>6.2f} ms "
+                f"partidas {metrics['games']:>5} puntaje {metrics['mean_score']:>6.2f} "
+                f"pérdida {metrics['loss']:.4f} eps {eps:.2f}"
+            )
+    return network, metrics
+
+
+def evaluate(network, games=20, rows=15, cols=17, max_steps=5000):
+    """
+    Partidas completas de simulation.play_game con LearnedSolver y con GreedySolver.
+    Regresa:
+    dict: nombre -> (puntaje promedio, ms promedio por decisión)
+    """
+    config = {"rows": rows, "cols": cols, "max_steps": max_steps}
+    factories = {
+        "learned": lambda snake: LearnedSolver(snake, network=network),
+        "greedy": None,
+    }
+    result = {}
+    for name, factory in factories.items():
+        runs = [play_game(config, seed, factory) for seed in range(games)]
+        result[name] = (
+            statistics.fmean(r["score"] for r in runs),
+            statistics.fmean(r["decision_ms"] for r in runs),
+        )
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--envs", type=int, default=64, help="Tableros que se juegan a la vez")
+    parser.add_argument("--steps", type=int, default=3000, help="Pasos del lote completo")
+    parser.add_argument("--rows", type=int, default=15)
+    parser.add_argument("--cols", type=int, default=17)
+    parser.add_argument("--crop", type=int, default=5, help="Radio de la ventana egocéntrica")
+    parser.add_argument("--hidden", type=int, nargs="+", default=[128])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--resume", help="Checkpoint desde el que se sigue entrenando")
+    parser.add_argument(
+        "--eps-start", type=float, default=1.0,
+        help="Exploración inicial, conviene bajarla al seguir un checkpoint",
+    )
+    parser.add_argument("--out", default="policy.npz", help="Checkpoint de salida")
+    parser.add_argument("--eval", help="Solo evalúa este checkpoint, sin entrenar")
+    parser.add_argument("--games", type=int, default=20, help="Partidas de la evaluación")
+    args = parser.parse_args(argv)
+
+    if args.eval:
+        network = QNetwork.load(args.eval)
+    else:
+        network = QNetwork.load(args.resume) if args.resume else None
+        network, _ = train(
+            args.envs, args.steps, args.rows, args.cols, args.crop, tuple(args.hidden),
+            eps_start=args.eps_start, seed=args.seed, network=network,
+        )
+        network.save(args.out)
+        print(f"Checkpoint en {args.out}")
+
+    for name, (score, ms) in evaluate(network, args.games, args.rows, args.cols).items():
+        print(f"{name:<8} puntaje {score:>7.2f} decisión {ms:>6.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,81 @@
 import os
 from time import sleep
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import cv2
 import numpy as np
-from mss import mss
 
 from base import Pos
+from frames import FrameSource, ScreenSource, record_stack
 
 ROWS = 15
 COLS = 17
 
 RED_COLOR_RANGES = [([0, 70, 50], [10, 255, 255]), ([170, 70, 50], [179, 255, 255])]
+BLUE_COLOR_RANGES = [([100, 50, 50], [130, 255, 255])]
+# Ojos de la cabeza: poca saturación y mucho brillo
+WHITE_COLOR_RANGES = [([0, 0, 200], [179, 40, 255])]
+
+# Proporción mínima de azul en un bloque para decir que ahí está la serpiente
+BLUE_THRESHOLD = 0.5
 
 
 class Scanner:
-    def __init__(self, region: Tuple[int, int, int, int]):
-        """Region es una tupla (x, y, width, height)"""
+    def __init__(
+        self,
+        region: Tuple[int, int, int, int],
+        rows: int = ROWS,
+        cols: int = COLS,
+        source: Optional[FrameSource] = None,
+    ):
+        """Region es una tupla (x, y, width, height) alineada a la grilla de rows x cols.
+        La región se puede obtener con calibration.load_or_calibrate().
+        Si no se da una fuente de cuadros se captura la región de la pantalla; para leer
+        cuadros grabados (StackSource, DirectorySource) basta con region=(0, 0, W, H)."""
         self._x = region[0]
         self._y = region[1]
         self._width = region[2]
         self._height = region[3]
-        self._block_size = (self._width // COLS, self._height // ROWS)
-        self._sct = mss()  # Se guarda la instacia de mss
+        self._rows = rows
+        self._cols = cols
+        if self._width % cols != 0 or self._height % rows != 0:
+            raise ValueError(
+                f"La region {self._width}x{self._height} no es multiplo de la grilla {rows}x{cols}"
+            )
+        self._block_size = (self._width // cols, self._height // rows)
+        self._source = source or ScreenSource(region)
+
+        # Buffers (hsv, mascara, mascara temporal) por tamaño de imagen que se reutilizan
+        # en cada llamada: el cuadro completo y un solo bloque
+        self._buffers = {}
+        self._ensure_buffers((self._height, self._width, 3))
+        self._ensure_buffers((self._block_size[1], self._block_size[0], 3))
+        self._ratios = np.empty((rows, cols), dtype=np.float64)
+        self._bounds = {}
+
+    @property
+    def rows(self):
+        return self._rows
+
+    @property
+    def cols(self):
+        return self._cols
+
+    @property
+    def block_size(self):
+        return self._block_size
 
-    def capture_region(self) -> np.ndarray:
+    @property
+    def source(self):
+        return self._source
+
+    def capture_region(self) -> Optional[np.ndarray]:
         """
-        Hace una captura de pantalla según las regiones dadas en el constructor.
+        Lee el siguiente cuadro de la fuente, por defecto una captura de la región de la pantalla.
         Regresa:
-        np.ndarray: Un arreglo de numpy con la captura en formato BGR.
-        """
-        monitor = {
-            "left": self._x,
-            "top": self._y,
-            "width": self._width,
-            "height": self._height,
-        }
-        shot = self._sct.grab(monitor)
-        img = np.array(shot)
-        img_bgr = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
-        return img_bgr
+        np.ndarray: Un arreglo de numpy con la captura en formato BGR, o None si la fuente se termino.
+        """
+        return self._source.read()
 
     def save_image(self, file_path: str) -> None:
         """
@@ -72,6 +108,21 @@ class Scanner:
             n += 1
             sleep(delay)
 
+    def record_frames(self, file_path: str, num: int, delay: float = 0.0) -> int:
+        """
+        Graba muchos cuadros en un solo archivo .npy sin codificar imagenes.
+        El archivo se puede leer después con frames.StackSource.
+        Parametros:
+        file_path (str): Ruta del archivo .npy
+        num (int): Cuantos cuadros se quieren grabar
+        delay (float): Cuantos segundos se espera entre cuadros
+        Regresa:
+        int: Numero de cuadros grabados
+        """
+        n = record_stack(self._source, file_path, num, delay)
+        print(f"{n} cuadros guardados en {file_path}")
+        return n
+
     def load_image(self, file_path: str) -> np.ndarray:
         """
         Carga una imagen desde el disco y la retorna.
@@ -89,31 +140,52 @@ class Scanner:
         self, img_bgr: np.ndarray, color_ranges: List[Tuple]
     ) -> np.ndarray:
         """
-        Dada una imagen en BGR regresa una mascara según los rangos del color
+        Dada una imagen en BGR regresa una mascara según los rangos del color.
+        La mascara es un buffer interno del Scanner que se sobreescribe en la siguiente llamada.
         Parametros:
         img_bgr (np.ndarray): Arreglo de numpy que representa una imagen en formato BGR
         color_ranges (List(Tuple)): Una lista con los rangos de color en HSV
         Regresa:
         np.ndarray: Una mascara binaria con solo los puntos donde esta el color
         """
-        # Se convierte la imagen de BGR a HSV por simplicidad
-        # TODO: Se podria poner la imagen directamente en HSV?
-        image_hsv = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2HSV)
-        img_w, img_h = image_hsv.shape[:2]
+        hsv, mask, temp_mask = self._ensure_buffers(img_bgr.shape)
 
-        # Se crea una mascara inicial de ceros para filtrar el color
-        color_mask = np.zeros((img_w, img_h), dtype=np.uint8)
+        # Se convierte la imagen de BGR a HSV por simplicidad
+        cv2.cvtColor(img_bgr, cv2.COLOR_BGR2HSV, dst=hsv)
 
         # En HSV los colores pueden tener distintos rangos.
         # Para crear una única mascara que detecte ese color hay que combinar los rangos
-        for color_range in color_ranges:
-            lower, upper = color_range
-            temp_mask = cv2.inRange(image_hsv, np.array(lower), np.array(upper))
+        for i, (lower, upper) in enumerate(self._color_bounds(color_ranges)):
+            if i == 0:
+                cv2.inRange(hsv, lower, upper, dst=mask)
+            else:
+                cv2.inRange(hsv, lower, upper, dst=temp_mask)
+                # Combina la mascara acual con la temporal
+                cv2.bitwise_or(mask, temp_mask, dst=mask)
+
+        return mask
 
-            # Combina la mascara acual con la temporal
-            color_mask = cv2.bitwise_or(color_mask, temp_mask)
+    def _ensure_buffers(self, shape):
+        """Regresa los buffers para imagenes de ese tamaño, se crean solo la primera vez."""
+        buffers = self._buffers.get(shape)
+        if buffers is None:
+            buffers = self._buffers[shape] = (
+                np.empty(shape, dtype=np.uint8),
+                np.empty(shape[:2], dtype=np.uint8),
+                np.empty(shape[:2], dtype=np.uint8),
+            )
+        return buffers
 
-        return color_mask
+    def _color_bounds(self, color_ranges):
+        """Convierte una sola vez los rangos de color a arreglos de numpy."""
+        cached = self._bounds.get(id(color_ranges))
+        if cached is None or cached[0] is not color_ranges:
+            bounds = [
+                (np.array(lower, dtype=np.uint8), np.array(upper, dtype=np.uint8))
+                for lower, upper in color_ranges
+            ]
+            cached = self._bounds[id(color_ranges)] = (color_ranges, bounds)
+        return cached[1]
 
     def ratio_blocks(self, mask: np.ndarray):
         """
@@ -121,26 +193,79 @@ class Scanner:
         Argumentos:
         (np.ndarray): Mascara de un color en especifico
         Regresa:
-        np.ndarray: Arreglo de tamaño (ROWS, COLS) con los promedios del color en cada bloque
+        np.ndarray: Arreglo de tamaño (rows, cols) con los promedios del color en cada bloque.
+        Es un buffer interno que se sobreescribe en la siguiente llamada.
         """
         block_w, block_h = self._block_size
-        mask_w, mask_h = mask.shape
+        mask_h, mask_w = mask.shape
+        rows, cols = self._rows, self._cols
 
         # Verificar que la imagen encaja exactemente con la grilla
-        assert mask_h == block_h * COLS, (
-            f"La altura no coincide {mask_h} != {block_h} * {COLS} == {block_h * COLS}"
+        assert mask_h == block_h * rows, (
+            f"La altura no coincide {mask_h} != {block_h} * {rows} == {block_h * rows}"
         )
-        assert mask_w == block_w * ROWS, (
-            f"La anchura no coincide {mask_w} != {block_w} * {ROWS} == {block_w * ROWS}"
+        assert mask_w == block_w * cols, (
+            f"La anchura no coincide {mask_w} != {block_w} * {cols} == {block_w * cols}"
         )
 
         # Se subdivide la mascara en bloques de tamaño block_h y block_w
-        reshaped = mask.reshape(ROWS, block_h, COLS, block_w, copy=False)
+        reshaped = mask.reshape(rows, block_h, cols, block_w, copy=False)
 
         # Se saca el promedio cuanto color hay en el bloque
-        results = reshaped.mean(axis=(1, 3))
+        return reshaped.mean(axis=(1, 3), out=self._ratios)
 
-        return results
+    def cell_ratio(
+        self, img_bgr: np.ndarray, pos: Pos, color_ranges: List[Tuple]
+    ) -> float:
+        """
+        Proporción de un color en un solo bloque del tablero, sin procesar el cuadro completo.
+        Parametros:
+        img_bgr (np.ndarray): Cuadro completo de la región en formato BGR
+        pos (Pos): Posición del bloque en coordenadas del mapa (con muros)
+        color_ranges (List(Tuple)): Una lista con los rangos de color en HSV
+        Regresa:
+        float: Proporción entre 0 y 1 de pixeles del color en el bloque
+        """
+        block_w, block_h = self._block_size
+        y, x = (pos.x - 1) * block_h, (pos.y - 1) * block_w
+        mask = self.get_color_mask(img_bgr[y : y + block_h, x : x + block_w], color_ranges)
+        return cv2.countNonZero(mask) / mask.size
+
+    def snake_in_cell(self, img_bgr: np.ndarray, pos: Pos) -> bool:
+        """Indica si el bloque en pos está ocupado por la serpiente (azul)."""
+        return self.cell_ratio(img_bgr, pos, BLUE_COLOR_RANGES) > BLUE_THRESHOLD
+
+    def snake_cells(self, img_bgr: np.ndarray) -> List[Pos]:
+        """Casillas del tablero ocupadas por la serpiente (azul), en coordenadas del mapa."""
+        ratios = self.ratio_blocks(self.get_color_mask(img_bgr, BLUE_COLOR_RANGES))
+        return [Pos(int(i) + 1, int(j) + 1) for i, j in zip(*np.nonzero(ratios > BLUE_THRESHOLD))]
+
+    def snake_body(self, img_bgr: np.ndarray, prior: Optional[List[Pos]] = None) -> List[Pos]:
+        """
+        Lee la serpiente completa del cuadro, ej: para resincronizar el modelo. Recorre todo
+        el tablero, así que es mucho más cara que snake_in_cell. Las casillas azules no dicen
+        en qué orden las recorre el cuerpo cuando dos tramos se tocan; el orden se toma del
+        cuerpo esperado donde coincide con la pantalla, que después de una desincronización
+        suele ser todo menos los últimos pasos de la cabeza.
+        Parametros:
+        img_bgr (np.ndarray): Cuadro completo de la región en formato BGR
+        prior (List[Pos]): Cuerpo esperado de la cabeza a la cola, ej: el del modelo
+        Regresa:
+        List[Pos]: Casillas de la cabeza a la cola, vacía si no se ve la serpiente
+        """
+        cells = set(self.snake_cells(img_bgr))
+        if not cells:
+            return []
+
+        # La cabeza es la casilla azul con más blanco (los ojos); si no hay, el extremo
+        # del cuerpo más cercano a la cabeza esperada
+        white = self.ratio_blocks(self.get_color_mask(img_bgr, WHITE_COLOR_RANGES))
+        head = max(cells, key=lambda pos: white[pos.x - 1, pos.y - 1])
+        if white[head.x - 1, head.y - 1] <= 0:
+            ends = [pos for pos in cells if sum(adj in cells for adj in pos.all_adj()) <= 1]
+            hint = prior[0] if prior else next(iter(cells))
+            head = min(ends or cells, key=lambda pos: Pos.manhattan_dist(pos, hint))
+        return trace_body(cells, head, prior)
 
     def apple_coords(self, img_bgr: np.ndarray) -> Pos:
         """
@@ -155,9 +280,62 @@ class Scanner:
         max_index = np.argmax(red_cells)
         location = np.unravel_index(max_index, red_cells.shape)
 
-        # No detecta niguna manzana o lengua
-        if max_index <= 0:
+        # No detecta niguna manzana o lengua. Se revisa el valor y no el indice
+        # porque la manzana puede estar en la primera casilla (indice 0)
+        if red_cells[location] <= 0:
             return Pos(0, 0)
         # Detecta manzana o lengua
-        elif max_index > 0:
-            return Pos(int(location[0]) + 1, int(location[1]) + 1)
+        return Pos(int(location[0]) + 1, int(location[1]) + 1)
+
+
+def trace_body(
+    cells, head: Pos, prior: Optional[List[Pos]] = None, budget: Optional[int] = None
+) -> List[Pos]:
+    """
+    Ordena las casillas de una serpiente vista en pantalla desde la cabeza. Busca en
+    profundidad un camino que pase por todas. En cada casilla prueba primero la que le sigue
+    en prior y luego el vecino con menos salidas (regla de Warnsdorff), así los tramos del
+    cuerpo que se tocan casi no hacen retroceder.
+    Parametros:
+    cells (Iterable[Pos]): Casillas azules
+    head (Pos): Casilla de la cabeza
+    prior (List[Pos]): Cuerpo esperado de la cabeza a la cola
+    budget (int): Máximo de pasos de la búsqueda, por defecto 50 por casilla
+    Regresa:
+    List[Pos]: Camino desde la cabeza; si no se cubren todas, el más largo encontrado
+    """
+    cells = set(cells)
+    if head not in cells:
+        return []
+    budget = budget or 50 * len(cells)
+    follows = {}  # Casilla -> la que le sigue hacia la cola en prior
+    if prior:
+        follows = {prior[i]: prior[i + 1] for i in range(len(prior) - 1)}
+
+    def moves(pos):
+        free = [adj for adj in pos.all_adj() if adj in cells and adj not in visited]
+        nxt = follows.get(pos)
+        return iter(sorted(free, key=lambda adj: (
+            adj != nxt, sum(a in cells and a not in visited for a in adj.all_adj())
+        )))
+
+    path, visited = [head], {head}
+    best = list(path)
+    stack = [moves(head)]
+    while stack and budget > 0:
+        nxt = next(stack[-1], None)
+        if nxt is None:
+            stack.pop()
+            visited.discard(path.pop())
+            continue
+        if nxt in visited:
+            continue
+        budget -= 1
+        path.append(nxt)
+        visited.add(nxt)
+        if len(path) == len(cells):
+            return path
+        if len(path) > len(best):
+            best = list(path)
+        stack.append(moves(nxt))
+    return best
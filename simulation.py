@@ -0,0 +1,101 @@
+"""Partidas sin pantalla para comparar configuraciones de los solvers."""
+
+import random
+from time import perf_counter
+
+from base import Direc, Map, PointType, Pos, Snake
+from solver import GreedySolver
+
+# Configuración por defecto de una partida. Las llaves de solver se pasan a GreedySolver
+DEFAULT_CONFIG = {
+    "rows": 15,
+    "cols": 17,
+    "survival": "space",
+    "reuse_field": True,
+    "bitboard": True,
+    "tie_break": "straight",
+    "max_steps": 20000,
+}
+SOLVER_KEYS = ("survival", "reuse_field", "bitboard", "tie_break")
+
+
+def initial_layout(rows, cols, length=4):
+    """
+    Posición inicial para un tablero de cualquier tamaño. En la fila del medio, cabeza en la
+    columna 5 mirando a la derecha y comida en la columna 13, como en el juego de Google;
+    en tableros angostos se corre todo para que quepa.
+    Parametros:
+    rows, cols (int): Tamaño del tablero sin muros, al menos 3 x 3
+    length (int): Largo inicial de la serpiente
+    Regresa:
+    tuple: (dirección, cuerpos, tipos, comida). La comida es None si no cabe en la fila
+    """
+    if rows < 3 or cols < 3:
+        raise ValueError(f"El tablero tiene que ser de al menos 3 x 3, no {rows} x {cols}")
+    mid = rows // 2 + 1
+    head = min(length + 1, cols)
+    length = min(length, head)
+    bodies = [Pos(mid, head - k) for k in range(length)]
+    types = [PointType.HEAD_R] + [PointType.BODY_HOR] * (length - 1)
+    food = Pos(mid, min(13, cols)) if min(13, cols) > head else None
+    return Direc.RIGHT, bodies, types, food
+
+
+def new_game(rows, cols):
+    """Mapa y serpiente con la posición inicial de initial_layout."""
+    game_map = Map(rows + 2, cols + 2)
+    direc, bodies, types, food = initial_layout(rows, cols)
+    snake = Snake(game_map, direc, bodies, types)
+    if food is not None:
+        game_map.create_food(food)
+    else:
+        game_map.create_rand_food()
+    return game_map, snake
+
+
+def play_game(config=None, seed=0, solver_factory=None):
+    """
+    Juega una partida completa con GreedySolver.
+    Parametros:
+    config (dict): Llaves de DEFAULT_CONFIG que se quieren cambiar
+    seed (int): Semilla de la comida y de los desempates al azar
+    solver_factory (callable): Crea otro solver a partir de la serpiente, ej: LearnedSolver.
+        Las llaves de solver de config se ignoran
+    Regresa:
+    dict: score, steps, steps_per_apple, decision_ms, decision_p99_ms, won, dead
+    """
+    cfg = dict(DEFAULT_CONFIG)
+    if config:
+        cfg.update(config)
+    random.seed(seed)
+    game_map, snake = new_game(cfg["rows"], cfg["cols"])
+    if solver_factory is None:
+        solver = GreedySolver(snake, **{key: cfg[key] for key in SOLVER_KEYS})
+    else:
+        solver = solver_factory(snake)
+    start_len = snake.len()
+
+    times = []
+    steps = 0
+    while steps < cfg["max_steps"]:
+        if not game_map.has_food():
+            game_map.create_rand_food()
+        start = perf_counter()
+        direc = solver.next_direc()
+        times.append(perf_counter() - start)
+        snake.move(direc)
+        steps += 1
+        if snake.dead or snake.is_full():
+            break
+
+    score = snake.len() - start_len
+    times.sort()
+    return {
+        "score": score,
+        "steps": steps,
+        "steps_per_apple": steps / score if score else float("nan"),
+        "decision_ms": 1000 * sum(times) / len(times),
+        "decision_p99_ms": 1000 * times[min(len(times) - 1, int(0.99 * len(times)))],
+        "won": snake.is_full(),
+        "dead": snake.dead,
+    }
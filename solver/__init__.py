@@ -1,2 +1,5 @@
 from solver.greedy import GreedySolver
-from solver.path import PathSolver
\ No newline at end of file
+from solver.hamilton import HamiltonSolver
+from solver.lookahead import LookaheadSolver
+from solver.path import PathSolver
+from solver.portfolio import PortfolioSolver
@@ -18,6 +18,11 @@ class BaseSolver:
         self._snake = val
         self._map = val.map
 
+    def rebind(self, snake):
+        """Pasa el solver a otra serpiente y su mapa, ej: un estado nuevo en un trabajador del
+        portafolio. Los solvers que guardan ayudantes atados al mapa los vuelven a crear."""
+        self.snake = snake
+
     def next_direc(self):
         """Genera la próxima dirección para la serpiente."""
         return NotImplemented
@@ -0,0 +1,56 @@
+"""Configuración de GreedySolver guardada en disco, ej: la que deja benchmarks.tune."""
+
+import json
+import os
+import warnings
+
+from solver.greedy import GreedySolver
+
+CONFIG_FILE = "solver.json"
+
+# Argumentos de GreedySolver que se leen del archivo
+SOLVER_ARGS = ("survival", "reuse_field", "bitboard", "tie_break", "weights")
+
+
+def save(solver_args, path=CONFIG_FILE, **extra):
+    """
+    Guarda los argumentos del solver y datos extra, ej: el puntaje con el que se eligieron.
+    Parametros:
+    solver_args (dict): Argumentos de GreedySolver, llaves de SOLVER_ARGS
+    path (str): Ruta del archivo
+    """
+    with open(path, "w") as f:
+        json.dump(dict(extra, solver=solver_args), f, indent=2)
+
+
+def load(path=CONFIG_FILE, rows=None, cols=None):
+    """
+    Argumentos del solver guardados en disco, o {} si no existe o está dañado.
+    Parametros:
+    path (str): Ruta del archivo
+    rows, cols (int): Tamaño del tablero sin muros donde se va a jugar. Si el archivo se
+    ajustó en otro tamaño se avisa y se regresa {}, los pesos no se trasladan de tablero.
+    """
+    if not os.path.isfile(path):
+        return {}
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        solver_args = data["solver"]
+    except (ValueError, KeyError, TypeError):
+        return {}
+    tuned = (data.get("rows"), data.get("cols"))
+    if None not in tuned and None not in (rows, cols) and tuned != (rows, cols):
+        warnings.warn(
+            f"{path} se ajustó en un tablero de {tuned[0]}x{tuned[1]}, no en {rows}x{cols}: "
+            "se usa la configuración de siempre"
+        )
+        return {}
+    return {key: solver_args[key] for key in SOLVER_ARGS if key in solver_args}
+
+
+def make_solver(snake, path=CONFIG_FILE):
+    """GreedySolver con la configuración guardada para el tamaño del tablero de la serpiente, o
+    con la de siempre si no hay archivo o es de otro tamaño."""
+    game_map = snake.map
+    return GreedySolver(snake, **load(path, game_map.num_rows - 2, game_map.num_cols - 2))
@@ -0,0 +1,165 @@
+from collections import deque
+
+import random
+
+from base.direc import DELTAS, MOVES, PREFERRED
+from base.point import PointType
+
+_EMPTY = PointType.EMPTY
+_FOOD = PointType.FOOD
+_INF = float("inf")
+
+
+class DistanceField:
+    """
+    Distancias de todas las casillas a un objetivo, calculadas con un solo BFS desde el
+    objetivo y reutilizadas mientras el objetivo no cambie, ej: la comida que se queda
+    varios ticks en el mismo lugar.
+
+    Cada distancia es una cota inferior de la real: ocupar casillas solo puede alargar los
+    caminos, y cuando la cola libera una casilla el campo se corrige con una propagación local.
+    Para sacar un camino se baja por el gradiente desde la cabeza revisando en el mapa que
+    cada casilla siga libre; si el campo ya no sirve se recalcula una vez. Un camino completo
+    tiene largo igual a la cota, así que siempre es uno de los más cortos.
+    """
+
+    def __init__(self, game_map):
+        self._map = game_map
+        self._cols = game_map.num_cols
+        self._dist = [_INF] * (game_map.num_rows * game_map.num_cols)
+        self._target = None
+        self._steps = (-self._cols, 1, self._cols, -1)
+        self.computes = 0
+        game_map.add_watcher(self)
+
+    @property
+    def map(self):
+        return self._map
+
+    @property
+    def target(self):
+        return self._target
+
+    def distance(self, pos):
+        """Cota inferior de la distancia de pos al objetivo, inf si no lo alcanza."""
+        return self._dist[pos.x * self._cols + pos.y]
+
+    def compute(self, target):
+        """Recalcula el campo con un BFS desde el objetivo."""
+        cols = self._cols
+        dist = self._dist
+        for i in range(len(dist)):
+            dist[i] = _INF
+        free = self._free_flags()
+        start = target.x * cols + target.y
+        dist[start] = 0
+        queue = deque([start])
+        steps = self._steps
+        while queue:
+            idx = queue.popleft()
+            nd = dist[idx] + 1
+            for step in steps:
+                nxt = idx + step
+                if free[nxt] and dist[nxt] == _INF:
+                    dist[nxt] = nd
+                    queue.append(nxt)
+        self._target = target
+        self.computes += 1
+
+    def path(self, src, target, first_direc=None, straight=True):
+        """
+        Camino más corto de src al objetivo como una cola de direcciones. src y el objetivo
+        pueden estar ocupados, ej: de la cabeza a la cola.
+        Parametros:
+        src (Pos): Inicio del camino
+        target (Pos): Objetivo del campo
+        first_direc (Direc): Dirección preferida en los empates, ej: la actual de la serpiente
+        straight (bool): Prefiere seguir derecho en los empates, si no se rompen al azar
+        Regresa:
+        deque: Direcciones a seguir, vacía si no hay camino
+        """
+        if target != self._target:
+            self.compute(target)
+        path = self._walk(src, first_direc, straight)
+        if path is None:
+            # El campo está viejo, un recálculo lo deja exacto para el mapa actual
+            self.compute(target)
+            path = self._walk(src, first_direc, straight)
+        return path if path is not None else deque()
+
+    # Avisos del mapa
+    def reset(self):
+        self._target = None
+
+    def occupied(self, pos):
+        # Ocupar una casilla no rompe la cota inferior, el recorrido revisa el mapa
+        pass
+
+    def food_changed(self, pos):
+        # El objetivo se da en cada path(), si la comida se mueve ahí se recalcula
+        pass
+
+    def freed(self, pos):
+        if self._target is None:
+            return
+        cols = self._cols
+        dist = self._dist
+        idx = pos.x * cols + pos.y
+        best = min(dist[idx + step] for step in self._steps) + 1
+        if best >= dist[idx]:
+            return
+        dist[idx] = best
+        content = self._map.content
+        queue = deque([idx])
+        while queue:
+            cur = queue.popleft()
+            nd = dist[cur] + 1
+            for step in self._steps:
+                nxt = cur + step
+                if dist[nxt] > nd:
+                    t = content[nxt // cols][nxt % cols].type
+                    if t is _EMPTY or t is _FOOD:
+                        dist[nxt] = nd
+                        queue.append(nxt)
+
+    def _walk(self, src, first_direc, straight):
+        cols = self._cols
+        dist = self._dist
+        content = self._map.content
+        target = self._target.x * cols + self._target.y
+        cur = src.x * cols + src.y
+        # src suele estar ocupada y el BFS no la recorre, su distancia sale de sus vecinas
+        d = dist[cur] if cur == target else min(dist[cur + step] for step in self._steps) + 1
+        if d == _INF:
+            return deque()
+        path = deque()
+        prev = first_direc
+        while cur != target:
+            # Se prefiere seguir derecho, luego las otras direcciones en orden fijo
+            if not straight:
+                order = random.sample(MOVES, 4)
+            else:
+                order = MOVES if prev is None else PREFERRED[prev._value_]
+            for direc in order:
+                dx, dy = DELTAS[direc._value_]
+                nxt = cur + dx * cols + dy
+                if dist[nxt] != d - 1:
+                    continue
+                if nxt != target:
+                    t = content[nxt // cols][nxt % cols].type
+                    if t is not _EMPTY and t is not _FOOD:
+                        continue
+                break
+            else:
+                return None
+            path.append(direc)
+            cur, prev, d = nxt, direc, d - 1
+        return path
+
+    def _free_flags(self):
+        free = []
+        for row in self._map.content:
+            for point in row:
+                t = point.type
+                free.append(t is _EMPTY or t is _FOOD)
+        return free
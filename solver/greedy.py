@@ -1,7 +1,16 @@
-from base.direc import Direc
+from base.direc import DELTAS
 from base.pos import Pos
 from solver.base import BaseSolver
 from solver.path import PathSolver
+from solver.space import SpaceLabeler
+
+# Pesos de las heurísticas, un punto de partida cercano al orden fijo del paso 5:
+# - tail: la región del vecino toca la cola.
+# - area: fracción del tablero que ocupa la región del vecino.
+# - food: distancia Manhattan a la comida sobre filas + columnas, positiva para alejarse.
+# - straight: el vecino está en la dirección actual.
+# - straight_path: probabilidad de desempatar derecho los caminos cortos (straight_bias).
+DEFAULT_WEIGHTS = {"tail": 1.0, "area": 0.5, "food": 0.001, "straight": 0.0, "straight_path": 1.0}
 
 
 class GreedySolver(BaseSolver):
@@ -21,46 +30,192 @@ class GreedySolver(BaseSolver):
     4. Calcula el camino más largo P3 desde la cabeza S1 hasta su cola. Si P3 existe, la serpiente camina
     en la dirección del primer paso de P3. Si no existe P3, va al paso 5.
 
-    5. La serpiente entra en modo supervivencia, elige la dirección segura que la aleje más de la comida.
+    5. La serpiente entra en modo supervivencia. Con survival="space" elige la dirección segura
+    cuya región libre toca la cola y, después, la de mayor área; las regiones se etiquetan una
+    sola vez por decisión. Con survival="manhattan" elige la dirección segura que la aleje más
+    de la comida. Con weights el paso 5 suma los pesos de DEFAULT_WEIGHTS en lugar del orden fijo.
     """
 
-    def __init__(self, snake):
+    def __init__(
+        self, snake, survival="space", reuse_field=True, bitboard=True, tie_break="straight",
+        weights=None,
+    ):
+        """
+        Args:
+        snake (Snake): Serpiente a controlar.
+        survival (str): Estrategia del paso 5, "space" o "manhattan".
+        reuse_field (bool): El paso 1 usa un campo de distancias a la comida que se reutiliza
+        entre ticks en lugar de un BFS nuevo desde la cabeza.
+        bitboard (bool): Las búsquedas y el área del paso 5 usan un Bitboard.
+        tie_break (str): Desempate entre caminos igual de cortos, "straight" o "random".
+        weights (dict): Pesos de las heurísticas, las llaves que falten toman el valor de
+        DEFAULT_WEIGHTS. Reemplazan a survival y a tie_break, ej: los que deja benchmarks.tune.
+        """
+        if survival not in ("space", "manhattan"):
+            raise ValueError(f"Modo de supervivencia no válido '{survival}'.")
+        if weights is not None:
+            unknown = set(weights) - set(DEFAULT_WEIGHTS)
+            if unknown:
+                raise ValueError(
+                    f"Pesos desconocidos {sorted(unknown)}, opciones: {list(DEFAULT_WEIGHTS)}"
+                )
+            weights = dict(DEFAULT_WEIGHTS, **weights)
         super().__init__(snake)
-        self._path_solver = PathSolver(snake)
+        self.weights = weights
+        self._path_solver = PathSolver(
+            snake, reuse_field, bitboard, tie_break,
+            weights["straight_path"] if weights is not None else None,
+        )
+        self.bitboard = bitboard
+        if bitboard:
+            snake.map.track_bitboard()
+        self.survival = survival
+        self._space = SpaceLabeler(snake.map)
 
-    def next_direc(self):
-        # Crea la serpiente virtual
-        s_copy, m_copy = self.snake.copy()
+    def rebind(self, snake):
+        """Cambia de serpiente rehaciendo lo que depende del mapa: el campo de distancias, el
+        Bitboard que el mapa mantiene al día y las etiquetas de regiones si cambia el tamaño."""
+        super().rebind(snake)
+        self._path_solver.rebind(snake)
+        if self.bitboard:
+            snake.map.track_bitboard()
+        if len(self._space.labels) != snake.map.num_rows * snake.map.num_cols:
+            self._space = SpaceLabeler(snake.map)
 
+    def next_direc(self):
         # Paso 1
         self._path_solver.snake = self.snake
         path_to_food = self._path_solver.shortest_path_to_food()
 
         if path_to_food:
-            # Paso 2
-            s_copy.move_path(path_to_food)
-            if m_copy.is_full():
-                return path_to_food[0]
+            # Pasos 2 y 3, solo hace falta saber si el camino largo a la cola tiene más de un paso
+            if self.bitboard and self.map.has_food():
+                if self._virtual_safe(path_to_food):
+                    return path_to_food[0]
+            else:
+                s_copy, m_copy = self.snake.copy()
+                s_copy.move_path(path_to_food)
+                if s_copy.is_full():
+                    return path_to_food[0]
 
-            # Paso 3
-            self._path_solver.snake = s_copy
-            path_to_tail = self._path_solver.longest_path_to_tail()
-            if len(path_to_tail) > 1:
-                return path_to_food[0]
+                self._path_solver.snake = s_copy
+                path_to_tail = self._path_solver.longest_path_to_tail(prefix=1)
+                if len(path_to_tail) > 1:
+                    return path_to_food[0]
 
         # Paso 4
         self._path_solver.snake = self.snake
-        path_to_tail = self._path_solver.longest_path_to_tail()
+        path_to_tail = self._path_solver.longest_path_to_tail(prefix=1)
         if len(path_to_tail) > 1:
             return path_to_tail[0]
 
         # Paso 5
+        if self.survival == "space" or self.weights is not None:
+            return self._space_direc()
+        return self._manhattan_direc()
+
+    def _virtual_safe(self, path):
+        """Pasos 2 y 3 sobre bits: la serpiente virtual sigue el camino y come al final sin
+        copiar el mapa. Su cuerpo queda [casillas del camino al revés] + [cuerpo actual]
+        recortado a largo + 1, así que solo se tocan el camino y la parte que se libera de
+        la cola: O(largo del camino) en vez de O(casillas)."""
+        board = self._path_solver.board()
+        cols = board.num_cols
+        free = board.free
+        bodies = self.snake.bodies
+        length = len(bodies)
+        if length + 1 >= self.map.capacity:
+            return True
+
+        head = bodies[0]
+        cur = head.x * cols + head.y
+        cells = []
+        for direc in path:
+            dx, dy = DELTAS[direc._value_]
+            cur += dx * cols + dy
+            cells.append(cur)
+            free &= ~(1 << cur)
+
+        def body(idx):
+            # Casilla idx del cuerpo virtual contando desde la cabeza, como índice plano
+            if idx < len(cells):
+                return cells[len(cells) - 1 - idx]
+            pos = bodies[idx - len(cells)]
+            return pos.x * cols + pos.y
+
+        for idx in range(length + 1, length + len(cells)):
+            free |= 1 << body(idx)
+        path_to_tail = self._path_solver.longest_path_on(
+            free, board.pos(cells[-1]), board.pos(body(length)), path[-1], prefix=1
+        )
+        return len(path_to_tail) > 1
+
+    def _manhattan_direc(self):
         head = self.snake.head()
+        food = self.map.food
         direc, max_dist = self.snake.direc, -1
         for adj in head.all_adj():
             if self.map.is_safe(adj):
-                dist = Pos.manhattan_dist(adj, self.map.food)
+                dist = Pos.manhattan_dist(adj, food) if food is not None else 0
                 if dist > max_dist:
                     max_dist = dist
                     direc = head.direc_to(adj)
         return direc
+
+    def _space_direc(self):
+        """Puntúa cada vecino seguro por (acceso a la cola, área de su región, distancia a la comida)."""
+        if self.bitboard:
+            return self._bitboard_space_direc()
+        self._space.label(self.map)
+        head, tail = self.snake.head(), self.snake.tail()
+        food = self.map.food
+        direc, best = self.snake.direc, None
+        for adj in head.all_adj():
+            region = self._space.region(adj)
+            if region == 0:
+                continue
+            # La cola se libera en el siguiente paso, si la región la toca la serpiente puede seguirla
+            score = self._score(
+                head, adj, self._space.touches(region, tail), self._space.sizes[region], food
+            )
+            if best is None or score > best:
+                best = score
+                direc = head.direc_to(adj)
+        return direc
+
+    def _bitboard_space_direc(self):
+        """Igual que _space_direc pero cada región es un flood fill de bits. Los vecinos que
+        caen en una región ya calculada la reutilizan, así que el total es una pasada."""
+        board = self._path_solver.board()
+        head = self.snake.head()
+        tail_adj = board.expand(board.bit(self.snake.tail()))
+        food = self.map.food
+        direc, best = self.snake.direc, None
+        regions = []
+        for adj in head.all_adj():
+            bit = board.bit(adj)
+            if not board.free & bit:
+                continue
+            region = next((r for r in regions if r & bit), None)
+            if region is None:
+                region = board.reachable(bit)
+                regions.append(region)
+            score = self._score(head, adj, bool(region & tail_adj), region.bit_count(), food)
+            if best is None or score > best:
+                best = score
+                direc = head.direc_to(adj)
+        return direc
+
+    def _score(self, head, adj, touches_tail, area, food):
+        """Puntaje de un vecino en el paso 5: la tupla (cola, área, distancia) que se compara
+        en orden, o con weights la suma de cada criterio por su peso."""
+        dist = Pos.manhattan_dist(adj, food) if food is not None else 0
+        if self.weights is None:
+            return (touches_tail, area, dist)
+        w = self.weights
+        return (
+            w["tail"] * touches_tail
+            + w["area"] * area / self.map.capacity
+            + w["food"] * dist / (self.map.num_rows + self.map.num_cols)
+            + w["straight"] * (head.direc_to(adj) == self.snake.direc)
+        )
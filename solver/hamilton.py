@@ -0,0 +1,73 @@
+from base.pos import Pos
+from solver.base import BaseSolver
+
+
+def build_cycle(rows, cols):
+    """
+    Ciclo que recorre las casillas interiores de un tablero rows x cols (sin muros).
+    Regresa la lista de casillas en orden, en coordenadas del Map (con muros).
+
+    Con alguna dimensión par el ciclo es hamiltoniano. Si las dos son impares no existe un
+    ciclo que cubra todo el tablero, así que se deja fuera la esquina inferior derecha.
+    """
+    if rows % 2 == 1 and cols % 2 == 0:
+        return [Pos(p.y, p.x) for p in build_cycle(cols, rows)]
+
+    # Filas pares: se va por la fila 0 hacia la derecha, se baja en serpentina por las
+    # columnas 1..cols-1 y se regresa por la columna 0
+    body_rows = rows if rows % 2 == 0 else rows - 1
+    cells = [(0, j) for j in range(cols)]
+    for i in range(1, body_rows):
+        js = range(cols - 1, 0, -1) if i % 2 == 1 else range(1, cols)
+        cells.extend((i, j) for j in js)
+    cells.extend((i, 0) for i in range(body_rows - 1, 0, -1))
+
+    if body_rows != rows:
+        # Ambas impares: la última fila se agrega en parejas de columnas (j, j+1) desviando
+        # la arista (r, j)-(r, j+1) de la fila de arriba; la esquina final queda fuera
+        r = rows - 2
+        order = {cell: k for k, cell in enumerate(cells)}
+        for j in range(cols - 3, -1, -2):
+            a, b = order[(r, j)], order[(r, j + 1)]
+            if a > b:
+                cells[b + 1 : b + 1] = [(r + 1, j + 1), (r + 1, j)]
+            else:
+                cells[a + 1 : a + 1] = [(r + 1, j), (r + 1, j + 1)]
+            order = {cell: k for k, cell in enumerate(cells)}
+
+    return [Pos(i + 1, j + 1) for i, j in cells]
+
+
+class HamiltonSolver(BaseSolver):
+    """
+    Sigue siempre el mismo ciclo por el tablero. Si la serpiente ya va sobre el ciclo nunca
+    choca, pero tarda en promedio medio ciclo en llegar a cada manzana.
+    """
+
+    def __init__(self, snake):
+        super().__init__(snake)
+        # Dirección a seguir en cada casilla, índice fila * columnas + columna. Los miembros
+        # de Direc son compartidos, así que la tabla pesa un puntero por casilla en lugar de
+        # un Pos por casilla como un dict de siguiente posición
+        cols = snake.map.num_cols
+        self._direcs = [None] * (snake.map.num_rows * cols)
+        cycle = self.cycle
+        for k, pos in enumerate(cycle):
+            self._direcs[pos.x * cols + pos.y] = pos.direc_to(cycle[(k + 1) % len(cycle)])
+
+    @property
+    def cycle(self):
+        """Casillas del ciclo en orden, se arma de nuevo en cada consulta."""
+        return build_cycle(self.map.num_rows - 2, self.map.num_cols - 2)
+
+    def next_direc(self):
+        head = self.snake.head()
+        cols = self.map.num_cols
+        direc = self._direcs[head.x * cols + head.y]
+        if direc is None:
+            # La cabeza está en la casilla que el ciclo deja fuera, se busca volver a él
+            for adj in head.all_adj():
+                if self._direcs[adj.x * cols + adj.y] is not None and self.map.is_safe(adj):
+                    return head.direc_to(adj)
+            return self.snake.direc
+        return direc
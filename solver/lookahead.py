@@ -0,0 +1,62 @@
+from base.bitboard import Bitboard
+from base.direc import MOVES, OPPOSITE
+from base.pos import Pos
+from solver.base import BaseSolver
+
+
+def evaluate(snake, start_len):
+    """
+    Puntaje de un estado, mayor es mejor: (segura, manzanas comidas, área libre alcanzable
+    desde la cabeza, -distancia a la comida). Es segura si la cabeza sigue alcanzando la
+    cola o si el área alcanzable alcanza para todo el cuerpo.
+    """
+    if snake.dead:
+        return (False, 0, 0, 0)
+    game_map = snake.map
+    board = Bitboard.from_map(game_map)
+    head, tail = snake.head(), snake.tail()
+    area = board.area(head)
+    safe = area >= snake.len() or board.distance(head, tail) > 0
+    food = game_map.food
+    dist = Pos.manhattan_dist(head, food) if food is not None else 0
+    return (safe, snake.len() - start_len, area, -dist)
+
+
+class LookaheadSolver(BaseSolver):
+    """
+    Prueba todas las secuencias de movimientos hasta una profundidad fija sobre copias de la
+    serpiente y elige el primer movimiento de la mejor, según evaluate().
+    """
+
+    def __init__(self, snake, depth=2):
+        """
+        Args:
+        snake (Snake): Serpiente a controlar.
+        depth (int): Movimientos que se simulan hacia adelante.
+        """
+        super().__init__(snake)
+        self.depth = depth
+
+    def next_direc(self):
+        direc, _ = self._search(self.snake, self.depth, self.snake.len())
+        return direc if direc is not None else self.snake.direc
+
+    def _search(self, snake, depth, start_len):
+        best_direc, best = None, None
+        for direc in MOVES:
+            if direc is OPPOSITE[snake.direc._value_]:
+                continue
+            if not snake.map.is_safe(snake.head().adj(direc)):
+                continue
+            s_copy, _ = snake.copy()
+            s_copy.move(direc)
+            if depth > 1 and not s_copy.dead:
+                _, score = self._search(s_copy, depth - 1, start_len)
+                if score is None:
+                    # Sin movimientos seguros en el siguiente paso la serpiente muere
+                    score = (False,) + evaluate(s_copy, start_len)[1:]
+            else:
+                score = evaluate(s_copy, start_len)
+            if best is None or score > best:
+                best_direc, best = direc, score
+        return best_direc, best
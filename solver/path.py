@@ -2,13 +2,21 @@ import random
 import sys
 from collections import deque
 
-from base import Direc, PointType
+from base import PointType
+from base.bitboard import Bitboard
+from base.direc import DELTAS, OPPOSITE, PERPENDICULAR
 from solver.base import BaseSolver
+from solver.field import DistanceField
+
+
+TIE_BREAKS = ("straight", "random")
 
 
 class _TableCell:
     """Clase auxiliar para almacenar información durante la búsqueda de rutas."""
 
+    __slots__ = ("parent", "dist", "visit")
+
     def __init__(self):
         self.reset()
 
@@ -31,9 +39,32 @@ class PathSolver(BaseSolver):
     """Calcula todas las rutas que puede tomar la serpiente para encontrar la
     distancia más corta a la comida BFS y la distancia más larga a la cola"""
 
-    def __init__(self, snake):
+    def __init__(
+        self, snake, reuse_field=False, bitboard=False, tie_break="straight", straight_bias=None
+    ):
+        """
+        Args:
+        snake (Snake): Serpiente a controlar.
+        reuse_field (bool): Reutiliza entre llamadas un campo de distancias a la comida en
+        lugar de buscar desde la cabeza cada vez. Solo aplica al mapa de esta serpiente.
+        bitboard (bool): Busca con un Bitboard, expandiendo el frente del BFS completo con
+        corrimientos, y marca las casillas visitadas del camino largo en un entero de bits.
+        tie_break (str): Entre caminos igual de cortos, "straight" prefiere seguir derecho y
+        "random" elige al azar.
+        straight_bias (float): Probabilidad de desempatar derecho en cada búsqueda, entre 0 y 1.
+        Si se da reemplaza a tie_break, que equivale a 1 ("straight") o 0 ("random").
+        """
+        if tie_break not in TIE_BREAKS:
+            raise ValueError(f"Desempate no válido '{tie_break}', opciones: {TIE_BREAKS}")
         super().__init__(snake)
-        self._table = [
+        if straight_bias is None:
+            straight_bias = 1.0 if tie_break == "straight" else 0.0
+        self.straight_bias = straight_bias
+        self._field = DistanceField(snake.map) if reuse_field else None
+        self._bitboard = bitboard
+        self._avail = None  # Casillas libres sin visitar en modo bitboard
+        # En modo bitboard la tabla no se usa, en tableros grandes son megas de celdas
+        self._table = None if bitboard else [
             [_TableCell() for _ in range(snake.map.num_cols)]
             for _ in range(snake.map.num_rows)
         ]
@@ -42,23 +73,53 @@ class PathSolver(BaseSolver):
     def table(self):
         return self._table
 
+    def rebind(self, snake):
+        old_map = self.map
+        super().rebind(snake)
+        if self._field is not None and self._field.map is not snake.map:
+            # El campo observa el mapa anterior, se suelta para no mantenerlo vivo
+            old_map.remove_watcher(self._field)
+            self._field = DistanceField(snake.map)
+        if self._table is not None and (
+            len(self._table) != snake.map.num_rows or len(self._table[0]) != snake.map.num_cols
+        ):
+            self._table = [
+                [_TableCell() for _ in range(snake.map.num_cols)]
+                for _ in range(snake.map.num_rows)
+            ]
+
     def shortest_path_to_food(self):
         # return self.path_to(self.map.food, "shortest")
         if self.map.has_food():
+            if self._field is not None and self._field.map is self.map:
+                return self._field.path(
+                    self.snake.head(), self.map.food, self.snake.direc, self._prefer_straight()
+                )
             return self.path_to(self.map.food, "shortest")
         else:
             return self.longest_path_to_tail()
 
-    def longest_path_to_tail(self):
-        return self.path_to(self.snake.tail(), "longest")
+    def longest_path_to_tail(self, prefix=None):
+        return self.path_to(self.snake.tail(), "longest", prefix)
+
+    def board(self):
+        """Bitboard del mapa: el que el mapa mantiene al día si se activó con
+        Map.track_bitboard, si no uno nuevo leído del mapa."""
+        board = self.map.bitboard
+        return board if board is not None else Bitboard.from_map(self.map)
+
+    def path_to(self, des, path_type, prefix=None):
+        # Si el mapa sigue sus regiones libres, no se busca cuando no hay camino posible
+        conn = self.map.connectivity
+        if conn is not None and not conn.may_reach(self.snake.head(), des):
+            return deque()
 
-    def path_to(self, des, path_type):
         ori_type = self.map.point(des).type
         self.map.point(des).type = PointType.EMPTY
         if path_type == "shortest":
             path = self.shortest_path_to(des)
         elif path_type == "longest":
-            path = self.longest_path_to(des)
+            path = self.longest_path_to(des, prefix)
         self.map.point(des).type = ori_type
         return path
 
@@ -67,7 +128,15 @@ class PathSolver(BaseSolver):
         des: La posición de destino en el mapa.
         Retorna: Una cola con las direcciones que debe tomar la serpiente.
         """
+        if self._bitboard:
+            board = self.board()
+            self._avail = board.free
+            return board.path(
+                self.snake.head(), des, self.snake.direc, straight=self._prefer_straight()
+            )
+
         self._reset_table()
+        straight = self._prefer_straight()
 
         head = self.snake.head()
         self._table[head.x][head.y].dist = 0
@@ -79,18 +148,19 @@ class PathSolver(BaseSolver):
             if cur == des:
                 return self._build_path(head, des)
 
-            # Reajustar el orden de las posiciones adyacentes para favorecer la
-            # el movimiento en la misma dirección ya que es más rapido
-            if cur == head:
-                first_direc = self.snake.direc
-            else:
-                first_direc = self._table[cur.x][cur.y].parent.direc_to(cur)
             adjs = cur.all_adj()
             random.shuffle(adjs)
-            for i, pos in enumerate(adjs):
-                if first_direc == cur.direc_to(pos):
-                    adjs[0], adjs[i] = adjs[i], adjs[0]
-                    break
+            if straight:
+                # Reajustar el orden de las posiciones adyacentes para favorecer la
+                # el movimiento en la misma dirección ya que es más rapido
+                if cur == head:
+                    first_direc = self.snake.direc
+                else:
+                    first_direc = self._table[cur.x][cur.y].parent.direc_to(cur)
+                for i, pos in enumerate(adjs):
+                    if first_direc == cur.direc_to(pos):
+                        adjs[0], adjs[i] = adjs[i], adjs[0]
+                        break
 
             # Traverse adjacent positions
             for pos in adjs:
@@ -103,25 +173,30 @@ class PathSolver(BaseSolver):
 
         return deque()
 
-    def longest_path_to(self, des):
+    def longest_path_to(self, des, prefix=None):
         """Calcula el camino más largo hasta la posición del destino.
         Calcular un ciclo en un grafo es un problema NP-hard, por lo que se utiliza
         una heurística para extender el camino más corto encontrado previamente.
         des: La posición de destino en el mapa.
+        prefix: Si se da, el alargamiento para cuando ya no puede cambiar los primeros prefix
+        pasos. Esos pasos, y si el camino tiene más de prefix pasos, son los mismos que los del
+        camino completo, que en tableros grandes cuesta O(casillas libres) inserciones.
         Retorna: Una cola con las direcciones que debe tomar la serpiente.
         """
         path = self.shortest_path_to(des)
         if not path:
             return deque()
+        if self._bitboard:
+            return self._extend_bits(path, self.snake.head(), prefix)
 
         self._reset_table()
         cur = head = self.snake.head()
 
         # Se marcan las posiciones del camino corto como visitadas
-        self._table[cur.x][cur.y].visit = True
+        self._visit(cur)
         for direc in path:
             cur = cur.adj(direc)
-            self._table[cur.x][cur.y].visit = True
+            self._visit(cur)
 
         # Se recorre la serpiente y por cada pareja de posiciones adyacentes
         # se intenta extender el camino con un movimiento en perpendicular
@@ -130,21 +205,16 @@ class PathSolver(BaseSolver):
             cur_direc = path[idx]
             nxt = cur.adj(cur_direc)
 
-            if cur_direc == Direc.LEFT or cur_direc == Direc.RIGHT:
-                tests = [Direc.UP, Direc.DOWN]
-            elif cur_direc == Direc.UP or cur_direc == Direc.DOWN:
-                tests = [Direc.LEFT, Direc.RIGHT]
-
             extended = False
-            for test_direc in tests:
+            for test_direc in PERPENDICULAR[cur_direc._value_]:
                 cur_test = cur.adj(test_direc)
                 nxt_test = nxt.adj(test_direc)
                 # Verifica si se puede añador un zig-zag
                 if self._is_valid(cur_test) and self._is_valid(nxt_test):
-                    self._table[cur_test.x][cur_test.y].visit = True
-                    self._table[nxt_test.x][nxt_test.y].visit = True
+                    self._visit(cur_test)
+                    self._visit(nxt_test)
                     path.insert(idx, test_direc)
-                    path.insert(idx + 2, Direc.opposite(test_direc))
+                    path.insert(idx + 2, OPPOSITE[test_direc._value_])
                     extended = True
                     break
 
@@ -152,12 +222,79 @@ class PathSolver(BaseSolver):
             if not extended:
                 cur = nxt
                 idx += 1
-                if idx >= len(path):
+                if idx >= len(path) or idx == prefix:
                     break
 
         return path
 
+    def longest_path_on(self, free, src, des, direc, prefix=None):
+        """
+        Camino largo de src a des sobre las casillas libres dadas, sin leer ni tocar el mapa.
+        Sirve para estados virtuales, ej: la serpiente después de seguir un camino.
+        Parametros:
+        free (int): Bits de las casillas libres, índice fila * columnas + columna
+        src, des (Pos): Inicio y destino, pueden estar ocupados
+        direc (Direc): Dirección actual en src, se prefiere en los empates
+        prefix (int): Igual que en longest_path_to
+        Regresa:
+        deque: Direcciones a seguir, vacía si no hay camino
+        """
+        board = Bitboard(self.map.num_rows, self.map.num_cols, free)
+        path = board.path(src, des, direc, straight=self._prefer_straight())
+        if not path:
+            return path
+        self._avail = free
+        return self._extend_bits(path, src, prefix)
+
+    def _extend_bits(self, path, head, prefix=None):
+        """El mismo alargamiento en zig-zag de longest_path_to, con índices planos y las
+        casillas libres sin visitar en un entero de bits."""
+        cols = self.map.num_cols
+        offsets = [0 if d is None else d[0] * cols + d[1] for d in DELTAS]
+        cur = head.x * cols + head.y
+
+        avail = self._avail & ~(1 << cur)
+        pos = cur
+        for direc in path:
+            pos += offsets[direc._value_]
+            avail &= ~(1 << pos)
+
+        path = list(path)
+        idx = 0
+        while True:
+            cur_direc = path[idx]
+            nxt = cur + offsets[cur_direc._value_]
+
+            extended = False
+            for test_direc in PERPENDICULAR[cur_direc._value_]:
+                off = offsets[test_direc._value_]
+                cur_test, nxt_test = cur + off, nxt + off
+                if (avail >> cur_test) & 1 and (avail >> nxt_test) & 1:
+                    avail &= ~((1 << cur_test) | (1 << nxt_test))
+                    path.insert(idx, test_direc)
+                    path.insert(idx + 2, OPPOSITE[test_direc._value_])
+                    extended = True
+                    break
+
+            if not extended:
+                cur = nxt
+                idx += 1
+                if idx >= len(path) or idx == prefix:
+                    break
+
+        self._avail = avail
+        return deque(path)
+
+    def _prefer_straight(self):
+        """Si esta búsqueda desempata derecho. Solo usa el azar con un sesgo entre 0 y 1."""
+        if self.straight_bias >= 1 or self.straight_bias <= 0:
+            return self.straight_bias >= 1
+        return random.random() < self.straight_bias
+
     def _reset_table(self):
+        if self._bitboard:
+            # La tabla no se usa, las visitas se quitan de _avail
+            return
         for row in self._table:
             for col in row:
                 col.reset()
@@ -171,5 +308,13 @@ class PathSolver(BaseSolver):
             tmp = parent
         return path
 
+    def _visit(self, pos):
+        if self._bitboard:
+            self._avail &= ~(1 << (pos.x * self.map.num_cols + pos.y))
+        else:
+            self._table[pos.x][pos.y].visit = True
+
     def _is_valid(self, pos):
+        if self._bitboard:
+            return (self._avail >> (pos.x * self.map.num_cols + pos.y)) & 1 == 1
         return self.map.is_safe(pos) and not self._table[pos.x][pos.y].visit
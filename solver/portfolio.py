@@ -0,0 +1,247 @@
+import threading
+from time import perf_counter
+
+from base.direc import Direc
+from base.map import Map
+from base.point import PointType
+from base.pos import Pos
+from base.snake import Snake
+from solver.base import BaseSolver
+from solver.greedy import GreedySolver
+from solver.hamilton import HamiltonSolver
+from solver.lookahead import LookaheadSolver, evaluate
+
+# Estrategias por defecto: nombre -> (clase, argumentos). Se pasan así y no como objetos
+# para poder crearlas dentro de cada hilo o proceso
+STRATEGIES = {
+    "greedy": (GreedySolver, {}),
+    "hamilton": (HamiltonSolver, {}),
+    "lookahead": (LookaheadSolver, {"depth": 2}),
+}
+POLICIES = ("first_safe", "best_score")
+
+_HEADS = {
+    Direc.LEFT: PointType.HEAD_L,
+    Direc.UP: PointType.HEAD_U,
+    Direc.RIGHT: PointType.HEAD_R,
+    Direc.DOWN: PointType.HEAD_D,
+}
+
+# Solvers ya creados en cada trabajador, por (nombre, hilo, tamaño del mapa). Cada estado
+# trae un mapa nuevo y el solver se pasa a él con rebind()
+_worker_solvers = {}
+
+
+def snake_state(snake):
+    """Estado mínimo de la serpiente para mandarlo a otro hilo o proceso."""
+    game_map = snake.map
+    food = game_map.food
+    return (
+        game_map.num_rows,
+        game_map.num_cols,
+        tuple((p.x, p.y) for p in snake.bodies),
+        snake.direc,
+        None if food is None else (food.x, food.y),
+    )
+
+
+def restore_snake(state):
+    """Crea una serpiente y su mapa a partir de snake_state(). Las casillas del cuerpo quedan
+    como BODY_HOR, a los solvers solo les importa que estén ocupadas."""
+    num_rows, num_cols, bodies, direc, food = state
+    game_map = Map(num_rows, num_cols)
+    bodies = [Pos(x, y) for x, y in bodies]
+    types = [_HEADS.get(direc, PointType.HEAD_R)] + [PointType.BODY_HOR] * (len(bodies) - 1)
+    snake = Snake(game_map, direc, bodies, types)
+    if food is not None:
+        game_map.create_food(Pos(*food))
+    return snake
+
+
+def propose(name, factory, state):
+    """
+    Corre una estrategia sobre una copia del estado y revisa su propuesta.
+    Regresa:
+    tuple: (dirección, puntaje de evaluate() después de moverse, segundos)
+    """
+    start = perf_counter()
+    snake = restore_snake(state)
+    key = (name, threading.get_ident(), state[0], state[1])
+    solver = _worker_solvers.get(key)
+    if solver is None:
+        cls, kwargs = factory
+        solver = _worker_solvers[key] = cls(snake, **kwargs)
+    else:
+        solver.rebind(snake)
+    direc = solver.next_direc()
+
+    s_copy, _ = snake.copy()
+    s_copy.move(direc)
+    if s_copy.head() == snake.head():
+        # El movimiento se ignoró (ej: dirección contraria), la serpiente sigue derecho
+        s_copy.move(snake.direc)
+    return direc, evaluate(s_copy, snake.len()), perf_counter() - start
+
+
+class PortfolioSolver(BaseSolver):
+    """
+    Corre varias estrategias en paralelo en hilos o procesos y elige una dirección antes de
+    un tiempo límite por tick. Cada propuesta llega con un veredicto de seguridad calculado
+    después de simular el movimiento.
+
+    Políticas:
+    - first_safe: la primera propuesta segura en el orden de las estrategias. Se decide en cuanto
+      terminan todas las estrategias anteriores a ella, sin esperar a las siguientes.
+    - best_score: espera a todas hasta el límite y elige la de mayor puntaje.
+
+    Una estrategia que no termina a tiempo cuenta como timeout y no se le manda otro tick
+    hasta que acabe (cuenta como skipped), así una estrategia lenta no acumula trabajo.
+    """
+
+    def __init__(
+        self,
+        snake,
+        strategies=None,
+        policy="first_safe",
+        deadline=0.05,
+        executor="thread",
+        workers=None,
+    ):
+        """
+        Args:
+        snake (Snake): Serpiente a controlar.
+        strategies (dict): nombre -> (clase, argumentos), por defecto STRATEGIES.
+        policy (str): "first_safe" o "best_score".
+        deadline (float): Segundos por tick para esperar propuestas.
+        executor (str): "thread" o "process".
+        workers (int): Trabajadores del pool, por defecto uno por estrategia.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Política no válida '{policy}', opciones: {POLICIES}")
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Executor no válido '{executor}'.")
+        super().__init__(snake)
+        self.strategies = dict(STRATEGIES if strategies is None else strategies)
+        self.policy = policy
+        self.deadline = deadline
+        # concurrent.futures (con logging) y el pool de procesos (con multiprocessing) se
+        # cargan al crear el portafolio, importar solver no los paga
+        if executor == "thread":
+            from concurrent.futures import ThreadPoolExecutor as pool
+        else:
+            from concurrent.futures import ProcessPoolExecutor as pool
+        self._pool = pool(max_workers=workers or len(self.strategies))
+        self._running = {}  # nombre -> future que sigue corriendo de un tick anterior
+        self.stats = {
+            name: {
+                "proposals": 0,
+                "timeouts": 0,
+                "skipped": 0,
+                "wins": 0,
+                "unsafe": 0,
+                "errors": 0,
+                "time": 0.0,
+            }
+            for name in self.strategies
+        }
+        self.fallbacks = 0
+
+    def next_direc(self):
+        # Ya se cargó al crear el pool, aquí solo se busca en sys.modules
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        state = snake_state(self.snake)
+        futures = {}
+        for name, factory in self.strategies.items():
+            prev = self._running.get(name)
+            if prev is not None and not prev.done():
+                self.stats[name]["skipped"] += 1
+                continue
+            self._running.pop(name, None)
+            futures[self._pool.submit(propose, name, factory, state)] = name
+
+        end = perf_counter() + self.deadline
+        order = list(self.strategies)
+        results = {}  # nombre -> (dirección, puntaje)
+        chosen = None
+        pending = set(futures)
+        while pending:
+            timeout = end - perf_counter()
+            if timeout <= 0:
+                break
+            done, pending = wait(pending, timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures[future]
+                stats = self.stats[name]
+                try:
+                    direc, score, secs = future.result()
+                except Exception:
+                    stats["errors"] += 1
+                    continue
+                stats["proposals"] += 1
+                stats["time"] += secs
+                if not score[0]:
+                    stats["unsafe"] += 1
+                results[name] = (direc, score)
+            if self.policy == "first_safe":
+                chosen = self._first_safe(order, results, set(futures[f] for f in pending))
+                if chosen is not None:
+                    break
+
+        # Las que siguen corriendo solo cuentan como timeout si se llegó al límite, no si
+        # first_safe ya había decidido sin ellas
+        timed_out = perf_counter() >= end
+        for future in pending:
+            name = futures[future]
+            if future.cancel():
+                continue
+            if timed_out:
+                self.stats[name]["timeouts"] += 1
+            self._running[name] = future
+
+        if self.policy == "first_safe" and chosen is None:
+            chosen = self._first_safe(order, results, set())
+        if chosen is None and results:
+            # Sin propuestas seguras o con best_score: la de mayor puntaje, en empate la primera
+            name = max(results, key=lambda n: (results[n][1], -order.index(n)))
+            chosen = (name, results[name][0])
+        if chosen is None:
+            self.fallbacks += 1
+            return self._fallback()
+        self.stats[chosen[0]]["wins"] += 1
+        return chosen[1]
+
+    @staticmethod
+    def _first_safe(order, results, waiting):
+        """Primera propuesta segura en el orden dado, None si falta que termine una anterior."""
+        for name in order:
+            if name in waiting:
+                return None
+            result = results.get(name)
+            if result is not None and result[1][0]:
+                return (name, result[0])
+        return None
+
+    def _fallback(self):
+        """Sin propuestas a tiempo: sigue derecho si es seguro, si no cualquier vecina segura."""
+        head = self.snake.head()
+        if self.map.is_safe(head.adj(self.snake.direc)):
+            return self.snake.direc
+        for adj in head.all_adj():
+            if self.map.is_safe(adj):
+                return head.direc_to(adj)
+        return self.snake.direc
+
+    def summary(self):
+        """Estadísticas por estrategia con el tiempo medio en milisegundos."""
+        out = {}
+        for name, stats in self.stats.items():
+            row = dict(stats)
+            row["mean_ms"] = 1000 * stats["time"] / stats["proposals"] if stats["proposals"] else 0.0
+            del row["time"]
+            out[name] = row
+        out["fallbacks"] = self.fallbacks
+        return out
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,93 @@
+from base.point import PointType
+
+_EMPTY = PointType.EMPTY
+_FOOD = PointType.FOOD
+
+
+class SpaceLabeler:
+    """
+    Etiqueta las regiones conectadas de casillas libres (vacías o con comida) del mapa
+    con un solo recorrido. Después cada consulta de región o área es una lectura de tabla,
+    en vez de un flood fill por cada vecino de la cabeza.
+    """
+
+    def __init__(self, game_map):
+        self._map = game_map
+        self._cols = game_map.num_cols
+        # Etiqueta de cada casilla en un arreglo plano [fila * columnas + columna], 0 si ocupada
+        self._labels = [0] * (game_map.num_rows * game_map.num_cols)
+        self._sizes = [0]
+
+    @property
+    def labels(self):
+        return self._labels
+
+    @property
+    def sizes(self):
+        """Área de cada región, indexada por etiqueta. La etiqueta 0 son las casillas ocupadas."""
+        return self._sizes
+
+    def label(self, game_map=None):
+        """
+        Etiqueta todas las regiones libres del mapa.
+        Parametros:
+        game_map (Map): Mapa a etiquetar, por defecto el del constructor
+        Regresa:
+        int: Número de regiones
+        """
+        if game_map is not None:
+            self._map = game_map
+        cols = self._cols
+        labels = self._labels
+        for i in range(len(labels)):
+            labels[i] = 0
+
+        # Las casillas libres se marcan con -1 y el flood fill las cambia por su etiqueta
+        for i, row in enumerate(self._map.content):
+            base = i * cols
+            for j, point in enumerate(row):
+                t = point.type
+                if t is _EMPTY or t is _FOOD:
+                    labels[base + j] = -1
+
+        sizes = self._sizes
+        del sizes[1:]
+        steps = (-1, 1, -cols, cols)
+        for start, val in enumerate(labels):
+            if val != -1:
+                continue
+            # Los muros rodean el tablero, así que los vecinos nunca salen del arreglo
+            region = len(sizes)
+            labels[start] = region
+            stack = [start]
+            area = 0
+            while stack:
+                idx = stack.pop()
+                area += 1
+                for step in steps:
+                    nxt = idx + step
+                    if labels[nxt] == -1:
+                        labels[nxt] = region
+                        stack.append(nxt)
+            sizes.append(area)
+        return len(sizes) - 1
+
+    def region(self, pos):
+        """Etiqueta de la región de la posición, 0 si está ocupada."""
+        return self._labels[pos.x * self._cols + pos.y]
+
+    def area(self, pos):
+        """Casillas libres alcanzables desde la posición, contándola a ella."""
+        return self._sizes[self.region(pos)]
+
+    def touches(self, region, pos):
+        """Indica si alguna casilla vecina de pos pertenece a la región."""
+        idx = pos.x * self._cols + pos.y
+        labels = self._labels
+        cols = self._cols
+        return region != 0 and region in (
+            labels[idx - 1],
+            labels[idx + 1],
+            labels[idx - cols],
+            labels[idx + cols],
+        )
@@ -0,0 +1,284 @@
+"""Genera cuadros sintéticos con el aspecto de Google Snake junto con la grilla real.
+
+Uso:
+    python synthetic.py frames.npy --num 5000 --block 32 --noise 4
+    python -m benchmarks.scanner frames.npy --labels frames_apples.npy
+"""
+
+import argparse
+import random
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from base import Direc, Map, PointType, Pos, Snake
+
+# Colores de Google Snake en BGR
+COLOR_GREEN_LIGHT = (81, 215, 170)
+COLOR_GREEN_DARK = (73, 209, 162)
+COLOR_BODY_BLUE = (246, 124, 78)
+COLOR_APPLE_RED = (29, 71, 231)
+COLOR_EYE_WHITE = (255, 255, 255)
+
+# Códigos de la grilla real
+CELL_EMPTY = 0
+CELL_BODY = 1
+CELL_HEAD = 2
+CELL_FOOD = 3
+
+_PALETTE = np.array(
+    [(0, 0, 0), COLOR_BODY_BLUE, COLOR_BODY_BLUE, COLOR_APPLE_RED], dtype=np.uint8
+)
+
+_HEAD_TYPES = {PointType.HEAD_L, PointType.HEAD_U, PointType.HEAD_R, PointType.HEAD_D}
+
+# Tableros vacíos ya dibujados por (rows, cols, block)
+_BOARDS = {}
+
+
+def ground_truth(game_map: Map, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Grilla (rows, cols) sin muros con el código de cada casilla del mapa.
+    Parametros:
+    game_map (Map): Mapa del juego
+    out (np.ndarray): Arreglo int8 opcional donde escribir la grilla
+    Regresa:
+    np.ndarray: Grilla con CELL_EMPTY, CELL_BODY, CELL_HEAD o CELL_FOOD
+    """
+    rows, cols = game_map.num_rows - 2, game_map.num_cols - 2
+    if out is None:
+        out = np.empty((rows, cols), dtype=np.int8)
+    for i in range(rows):
+        for j in range(cols):
+            t = game_map.point(Pos(i + 1, j + 1)).type
+            if t == PointType.FOOD:
+                out[i, j] = CELL_FOOD
+            elif t in _HEAD_TYPES:
+                out[i, j] = CELL_HEAD
+            elif t.value >= PointType.HEAD_L.value:
+                out[i, j] = CELL_BODY
+            else:
+                out[i, j] = CELL_EMPTY
+    return out
+
+
+def _board(rows: int, cols: int, block: int) -> np.ndarray:
+    """Tablero de ajedrez vacío, se calcula una vez por tamaño."""
+    key = (rows, cols, block)
+    board = _BOARDS.get(key)
+    if board is None:
+        parity = (np.add.outer(np.arange(rows), np.arange(cols)) % 2).astype(bool)
+        cells = np.where(
+            parity[..., None], np.array(COLOR_GREEN_DARK), np.array(COLOR_GREEN_LIGHT)
+        ).astype(np.uint8)
+        board = np.repeat(np.repeat(cells, block, axis=0), block, axis=1)
+        _BOARDS[key] = board
+    return board
+
+
+def render_grid(
+    grid: np.ndarray, block_size: int, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Dibuja una grilla de códigos como un cuadro BGR de Google Snake.
+    Parametros:
+    grid (np.ndarray): Grilla (rows, cols) de códigos CELL_*
+    block_size (int): Tamaño en pixeles de cada casilla
+    out (np.ndarray): Cuadro (rows * block, cols * block, 3) donde dibujar
+    Regresa:
+    np.ndarray: El cuadro dibujado en formato BGR
+    """
+    rows, cols = grid.shape
+    if out is None:
+        out = np.empty((rows * block_size, cols * block_size, 3), dtype=np.uint8)
+    np.copyto(out, _board(rows, cols, block_size))
+
+    # Contenido de cada casilla con un pequeño margen como en el juego
+    pad = max(1, block_size // 8)
+    blocks = out.reshape(rows, block_size, cols, block_size, 3)
+    inner = blocks[:, pad : block_size - pad, :, pad : block_size - pad]
+    np.copyto(
+        inner,
+        _PALETTE[grid][:, None, :, None, :],
+        where=(grid != CELL_EMPTY)[:, None, :, None, None],
+    )
+
+    # Ojos blancos en la cabeza
+    eye = max(1, block_size // 6)
+    for i, j in zip(*np.nonzero(grid == CELL_HEAD)):
+        y, x = i * block_size + block_size // 3, j * block_size + block_size // 4
+        out[y : y + eye, x : x + eye] = COLOR_EYE_WHITE
+        x = j * block_size + block_size - block_size // 4 - eye
+        out[y : y + eye, x : x + eye] = COLOR_EYE_WHITE
+    return out
+
+
+def render_frame(
+    game_map: Map, block_size: int, out: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Dibuja el estado de un mapa como un cuadro de Google Snake.
+    Parametros:
+    game_map (Map): Mapa con la serpiente y la comida
+    block_size (int): Tamaño en pixeles de cada casilla
+    out (np.ndarray): Cuadro opcional donde dibujar
+    Regresa:
+    Tuple[np.ndarray, np.ndarray]: El cuadro BGR y la grilla real
+    """
+    grid = ground_truth(game_map)
+    return render_grid(grid, block_size, out), grid
+
+
+def random_snake(
+    rows: int, cols: int, rng: random.Random, max_len: Optional[int] = None
+) -> Snake:
+    """
+    Crea una serpiente en una posición aleatoria con una caminata que no se cruza,
+    y una manzana en una casilla libre.
+    """
+    game_map = Map(rows + 2, cols + 2)
+    max_len = max_len or max(2, rows * cols // 3)
+    length = rng.randint(2, max_len)
+
+    head = Pos(rng.randint(1, rows), rng.randint(1, cols))
+    bodies, used = [head], {head}
+    while len(bodies) < length:
+        tail = bodies[-1]
+        options = [p for p in tail.all_adj() if game_map.is_inside(p) and p not in used]
+        if not options:
+            break
+        nxt = rng.choice(options)
+        bodies.append(nxt)
+        used.add(nxt)
+
+    # La cabeza mira en sentido contrario al primer segmento del cuerpo
+    direc = bodies[1].direc_to(bodies[0])
+    head_type = {
+        Direc.LEFT: PointType.HEAD_L,
+        Direc.UP: PointType.HEAD_U,
+        Direc.RIGHT: PointType.HEAD_R,
+        Direc.DOWN: PointType.HEAD_D,
+    }[direc]
+    types = [head_type] + [PointType.BODY_HOR] * (len(bodies) - 1)
+    snake = Snake(game_map, direc, bodies, types)
+
+    empty = [
+        Pos(i, j)
+        for i in range(1, rows + 1)
+        for j in range(1, cols + 1)
+        if Pos(i, j) not in used
+    ]
+    if empty:
+        game_map.create_food(rng.choice(empty))
+    return snake
+
+
+def scaled_block(block_size: int, scale: float) -> int:
+    """
+    Tamaño de casilla después de escalar, redondeado a pixeles enteros para que el cuadro
+    siga siendo un múltiplo exacto del bloque, como lo espera Scanner.
+    Regresa:
+    int: Tamaño en pixeles de cada casilla del cuadro escalado
+    """
+    block = int(round(block_size * scale))
+    if block < 1:
+        raise ValueError(
+            f"La escala {scale} deja casillas de menos de 1 pixel (bloque {block_size})"
+        )
+    return block
+
+
+def render_batch(
+    num: int,
+    rows: int,
+    cols: int,
+    block_size: int,
+    noise: float = 0.0,
+    scale: float = 1.0,
+    seed: Optional[int] = None,
+    frames_out: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Genera muchos cuadros etiquetados de estados aleatorios.
+    Parametros:
+    num (int): Cantidad de cuadros
+    rows, cols (int): Tamaño del tablero sin muros
+    block_size (int): Tamaño en pixeles de cada casilla
+    noise (float): Desviación estándar del ruido gaussiano por pixel
+    scale (float): Factor de escala del cuadro, simula el zoom del navegador. El bloque
+    escalado se redondea a pixeles enteros, ver scaled_block
+    seed (int): Semilla para que los lotes sean reproducibles
+    frames_out (np.ndarray): Arreglo (num, H, W, 3) donde escribir, ej: un np.memmap
+    Regresa:
+    Tuple: cuadros (num, H, W, 3), grillas (num, rows, cols) y posición (x, y) de la manzana (num, 2)
+    """
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+
+    height, width = rows * block_size, cols * block_size
+    block = scaled_block(block_size, scale)
+    out_h, out_w = rows * block, cols * block
+    if frames_out is None:
+        frames_out = np.empty((num, out_h, out_w, 3), dtype=np.uint8)
+    grids = np.empty((num, rows, cols), dtype=np.int8)
+    apples = np.zeros((num, 2), dtype=np.int16)
+
+    canvas = np.empty((height, width, 3), dtype=np.uint8)
+    noisy = np.empty((out_h, out_w, 3), dtype=np.float32) if noise > 0 else None
+    for n in range(num):
+        snake = random_snake(rows, cols, rng)
+        ground_truth(snake.map, grids[n])
+        target = frames_out[n] if block == block_size else canvas
+        render_grid(grids[n], block_size, target)
+        if block != block_size:
+            cv2.resize(canvas, (out_w, out_h), dst=frames_out[n], interpolation=cv2.INTER_AREA)
+        if noisy is not None:
+            np_rng.standard_normal(dtype=np.float32, out=noisy)
+            noisy *= noise
+            noisy += frames_out[n]
+            np.clip(noisy, 0, 255, out=noisy)
+            frames_out[n] = noisy
+        food = snake.map.food
+        if food is not None:
+            apples[n] = (food.x, food.y)
+    return frames_out, grids, apples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="Archivo .npy donde guardar los cuadros")
+    parser.add_argument("--num", type=int, default=1000)
+    parser.add_argument("--rows", type=int, default=15)
+    parser.add_argument("--cols", type=int, default=17)
+    parser.add_argument("--block", type=int, default=32)
+    parser.add_argument("--noise", type=float, default=0.0)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    block = scaled_block(args.block, args.scale)
+    out_h, out_w = args.rows * block, args.cols * block
+    frames = np.lib.format.open_memmap(
+        args.path, mode="w+", dtype=np.uint8, shape=(args.num, out_h, out_w, 3)
+    )
+    _, grids, apples = render_batch(
+        args.num,
+        args.rows,
+        args.cols,
+        args.block,
+        args.noise,
+        args.scale,
+        args.seed,
+        frames,
+    )
+    frames.flush()
+
+    base_path = args.path[:-4] if args.path.endswith(".npy") else args.path
+    np.save(base_path + "_grids.npy", grids)
+    np.save(base_path + "_apples.npy", apples)
+    print(f"{args.num} cuadros guardados en {args.path}")
+
+
+if __name__ == "__main__":
+    main()
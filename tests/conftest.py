@@ -0,0 +1,74 @@
+import random
+from collections import deque
+
+from base import Direc, PointType, Pos
+from simulation import new_game
+from solver import GreedySolver
+
+MOVES = (Direc.UP, Direc.RIGHT, Direc.DOWN, Direc.LEFT)
+
+
+def play_greedy(seed, rows=8, cols=10, steps=400, blunders=0.05, relocate=0.05):
+    """
+    Juega partidas de GreedySolver y entrega (mapa, serpiente) antes del primer movimiento,
+    para registrar observadores en el mapa, y después de cada movimiento.
+    Con probabilidad blunders la serpiente toma una dirección al azar para que también haya
+    muertes, y con probabilidad relocate la comida cambia de lugar. Al morir o llenar el
+    tablero la serpiente vuelve a la posición inicial con Snake.setup(), que reinicia el mapa.
+    """
+    random.seed(seed)
+    rng = random.Random(seed)
+    game_map, snake = new_game(rows, cols)
+    solver = GreedySolver(snake)
+    yield game_map, snake
+    for _ in range(steps):
+        if snake.dead or snake.is_full():
+            snake.setup()
+            game_map.create_rand_food()
+        elif rng.random() < relocate:
+            game_map.rm_food()
+            game_map.create_rand_food()
+        if not game_map.has_food():
+            game_map.create_rand_food()
+        if rng.random() < blunders:
+            snake.move(rng.choice(MOVES))
+        else:
+            snake.move(solver.next_direc())
+        yield game_map, snake
+
+
+def grow_snake(moves, rows=15, cols=17):
+    """Partida nueva donde la serpiente come en cada uno de los movimientos dados, así el
+    cuerpo queda con la forma de todo el recorrido. Regresa (mapa, serpiente)."""
+    game_map, snake = new_game(rows, cols)
+    for direc in moves:
+        game_map.rm_food()
+        game_map.create_food(snake.head().adj(direc))
+        snake.move(direc)
+    return game_map, snake
+
+
+def free_cells(game_map):
+    """Casillas vacías o con comida."""
+    return [
+        Pos(i, j)
+        for i, row in enumerate(game_map.content)
+        for j, point in enumerate(row)
+        if point.type in (PointType.EMPTY, PointType.FOOD)
+    ]
+
+
+def bfs(game_map, sources, passable=None):
+    """Distancias por casillas libres desde sources, que pueden estar ocupadas. passable
+    reemplaza al conjunto de casillas libres del mapa."""
+    passable = set(free_cells(game_map)) if passable is None else passable
+    dist = {src: 0 for src in sources}
+    queue = deque(sources)
+    while queue:
+        cur = queue.popleft()
+        for direc in MOVES:
+            nxt = cur.adj(direc)
+            if nxt in passable and nxt not in dist:
+                dist[nxt] = dist[cur] + 1
+                queue.append(nxt)
+    return dist
@@ -0,0 +1,76 @@
+from time import perf_counter
+
+import pytest
+
+from actuator import Actuator
+from base.direc import Direc
+from input_backends import RecordingBackend
+
+
+class FailingBackend(RecordingBackend):
+    """Falla en la primera tecla y registra las demás."""
+
+    def __init__(self):
+        super().__init__()
+        self.failed = False
+
+    def press(self, key: str):
+        if not self.failed:
+            self.failed = True
+            raise OSError("teclado desconectado")
+        super().press(key)
+
+
+def test_backend_error_is_raised_from_flush_and_worker_keeps_running():
+    backend = FailingBackend()
+    act = Actuator(backend=backend)
+    act.send(Direc.UP)
+    with pytest.raises(OSError):
+        act.flush(timeout=1)
+
+    # El error ya se entregó: el hilo sigue enviando teclas
+    act.send(Direc.LEFT)
+    assert act.flush(timeout=1)
+    assert [key for _, key in backend.events] == ["left"]
+    assert [event.direc for event in act.log] == [Direc.LEFT]
+    act.close()
+
+
+def test_backend_error_is_raised_from_close():
+    act = Actuator(backend=FailingBackend())
+    act.send(Direc.UP)
+    with pytest.raises(OSError):
+        act.close()
+    assert not act._worker.is_alive()
+
+
+def test_failed_key_is_raised_from_schedule_and_can_be_scheduled_again():
+    backend = FailingBackend()
+    act = Actuator(backend=backend)
+    act.send(Direc.UP)
+    with act._cond:
+        act._cond.wait_for(lambda: not act._queue and not act._busy, timeout=1)
+    assert act.last_direc is None
+
+    # El tick loop solo programa teclas: ahí se entera del error
+    with pytest.raises(OSError):
+        act.send(Direc.UP)
+    assert act.send(Direc.UP)
+    assert act.flush(timeout=1)
+    assert [key for _, key in backend.events] == ["up"]
+    assert not act.send(Direc.UP)
+    act.close()
+
+
+def test_reset_drops_pending_keys_without_marking_them_sent():
+    backend = RecordingBackend()
+    act = Actuator(backend=backend)
+    act.schedule(Direc.UP, at=perf_counter() + 10)
+    assert act.last_direc == Direc.UP
+    act.reset(Direc.LEFT)
+    assert act.last_direc == Direc.LEFT
+    assert not act.send(Direc.LEFT)
+    assert act.send(Direc.UP)
+    assert act.flush(timeout=1)
+    assert [key for _, key in backend.events] == ["up"]
+    act.close()
@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from base import Map, PointType, Pos
+from base.bitboard import Bitboard
+from conftest import MOVES, bfs, play_greedy
+
+# Tableros con muros incluidos, cuadrados y no cuadrados
+SHAPES = [(9, 9), (7, 13), (12, 6), (5, 21)]
+
+
+def _random_board(rows, cols, seed, fill=0.3):
+    """Map con casillas ocupadas al azar y comida, y su Bitboard."""
+    rng = random.Random(seed)
+    game_map = Map(rows, cols)
+    interior = [Pos(i, j) for i in range(1, rows - 1) for j in range(1, cols - 1)]
+    for pos in interior:
+        if rng.random() < fill:
+            game_map.point(pos).type = PointType.BODY_HOR
+    empty = [pos for pos in interior if game_map.is_empty(pos)]
+    game_map.create_food(rng.choice(empty))
+    return game_map, Bitboard.from_map(game_map), interior, rng
+
+
+def _bits(board, cells):
+    return sum(board.bit(pos) for pos in set(cells))
+
+
+def _free(board, interior):
+    return {pos for pos in interior if board.is_free(pos)}
+
+
+@pytest.mark.parametrize("rows,cols", SHAPES)
+@pytest.mark.parametrize("seed", range(3))
+def test_expand_matches_neighbors(rows, cols, seed):
+    game_map, board, interior, rng = _random_board(rows, cols, seed)
+    free = _free(board, interior)
+    # Incluye las casillas de la primera y la última columna, donde un corrimiento de un bit
+    # cruza a la fila vecina
+    edges = [Pos(i, j) for i in range(1, rows - 1) for j in (1, cols - 2)]
+    for cells in [edges] + [rng.sample(interior, 5) for _ in range(20)]:
+        expected = {pos.adj(d) for pos in cells for d in MOVES} & free
+        assert board.expand(_bits(board, cells)) & board.free == _bits(board, expected)
+
+
+@pytest.mark.parametrize("rows,cols", SHAPES)
+@pytest.mark.parametrize("seed", range(3))
+def test_searches_match_per_cell_bfs(rows, cols, seed):
+    game_map, board, interior, rng = _random_board(rows, cols, seed)
+    free = _free(board, interior)
+    for src in rng.sample(interior, 10):
+        dist = bfs(game_map, [src], free)
+        assert board.reachable(src) == _bits(board, dist) & board.free
+        assert board.area(src) == len(set(dist) & free)
+
+        layers = board.distance_layers(src)
+        assert len(layers) == max(dist.values()) + 1
+        for k, layer in enumerate(layers):
+            assert layer == _bits(board, [pos for pos, d in dist.items() if d == k])
+
+        for des in rng.sample(interior, 10):
+            # des puede estar ocupada, ej: la cola
+            exact = bfs(game_map, [src], free | {des}).get(des, -1)
+            assert board.distance(src, des) == exact
+            path = board.path(src, des, straight=seed % 2 == 0)
+            if exact <= 0:
+                assert not path
+                continue
+            assert len(path) == exact
+            cur = src
+            for direc in path:
+                cur = cur.adj(direc)
+                assert cur in free or cur == des
+            assert cur == des
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_tracked_bitboard_matches_map_after_every_move(seed):
+    for game_map, snake in play_greedy(seed):
+        # GreedySolver activa el Bitboard del mapa, Snake.move lo mantiene al día
+        tracked = game_map.bitboard
+        fresh = Bitboard.from_map(game_map)
+        assert (tracked.free, tracked.walls, tracked.food) == (fresh.free, fresh.walls, fresh.food)
@@ -0,0 +1,59 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from calibration import BoardGeometry, find_board, validate
+from synthetic import render_batch
+
+SCREENSHOT = os.path.join(os.path.dirname(__file__), os.pardir, "calibrate_board.png")
+
+
+def _framed(frame, x=50, y=40):
+    """El cuadro sintético dentro de una pantalla con el marco verde oscuro de Google Snake."""
+    height, width = frame.shape[0] + 2 * y, frame.shape[1] + 2 * x
+    screen = np.full((height, width, 3), (40, 120, 60), np.uint8)
+    screen[y : y + frame.shape[0], x : x + frame.shape[1]] = frame
+    return screen
+
+
+def _region(img, geometry):
+    x, y = geometry.x, geometry.y
+    return img[y : y + geometry.height, x : x + geometry.width]
+
+
+def test_screenshot():
+    img = cv2.imread(SCREENSHOT, cv2.IMREAD_COLOR)
+    geometry = find_board(img)
+    assert geometry == BoardGeometry(0, 0, 32, 15, 17)
+    assert validate(geometry, _region(img, geometry))
+
+
+@pytest.mark.parametrize("noise", [0, 4, 8])
+@pytest.mark.parametrize("block", [12, 20, 32])
+def test_synthetic_frames_with_noise(noise, block):
+    frames, _, _ = render_batch(4, 15, 17, block, noise=noise, seed=block + noise)
+    for frame in frames:
+        img = _framed(frame)
+        geometry = find_board(img)
+        assert geometry == BoardGeometry(50, 40, block, 15, 17)
+        assert validate(geometry, _region(img, geometry))
+
+
+def test_validate_small_blocks_with_noise():
+    # Con bloques chicos el cuadro que se promedia tiene pocos pixeles y el ruido pesa más
+    geometry = BoardGeometry(50, 40, 12, 15, 17)
+    for seed in range(30):
+        for frame in render_batch(4, 15, 17, 12, noise=8, seed=seed)[0]:
+            assert validate(geometry, _region(_framed(frame), geometry))
+
+
+@pytest.mark.parametrize("wrong", [-2, 3])
+def test_validate_rejects_wrong_block(wrong):
+    frame = render_batch(1, 15, 17, 32, noise=4, seed=0)[0][0]
+    img = _framed(frame)
+    block = 32 + wrong
+    rows, cols = round(frame.shape[0] / block), round(frame.shape[1] / block)
+    geometry = BoardGeometry(50, 40, block, rows, cols)
+    assert not validate(geometry, _region(img, geometry))
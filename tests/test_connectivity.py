@@ -0,0 +1,49 @@
+import pytest
+
+from base import Pos
+from conftest import bfs, free_cells, play_greedy
+
+
+def _flood_regions(game_map):
+    """Región de cada casilla libre con un flood fill desde cero: {pos: (etiqueta, tamaño)}."""
+    regions = {}
+    for pos in free_cells(game_map):
+        if pos not in regions:
+            region = bfs(game_map, [pos])
+            for cell in region:
+                regions[cell] = (pos, len(region))
+    return regions
+
+
+def _assert_matches_flood(game_map, conn):
+    regions = _flood_regions(game_map)
+    cells = [Pos(i, j) for i in range(game_map.num_rows) for j in range(game_map.num_cols)]
+    anchor = next(iter(regions), None)
+    ids = {}
+    for pos in cells:
+        if pos not in regions:
+            assert conn.region(pos) == -1
+            assert conn.region_size(pos) == 0
+            assert not conn.same_region(pos, pos)
+            continue
+        label, size = regions[pos]
+        assert conn.region_size(pos) == size
+        assert conn.same_region(pos, anchor) == (label == regions[anchor][0])
+        ids.setdefault(label, set()).add(conn.region(pos))
+    # Cada región del flood fill es exactamente una región del union-find
+    assert all(len(found) == 1 for found in ids.values())
+    assert len(set().union(*ids.values())) == len(ids)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_regions_match_flood_fill_after_every_move(seed):
+    deaths = 0
+    conn = None
+    for game_map, snake in play_greedy(seed):
+        conn = conn or game_map.track_connectivity()
+        deaths += snake.dead
+        _assert_matches_flood(game_map, conn)
+    # Las muertes avisan watcher.reset() y la partida sigue con Snake.setup()
+    assert deaths > 0
+    # La mayoría de los movimientos se resuelven sin reconstruir las regiones
+    assert conn.rebuilds < 100
@@ -0,0 +1,67 @@
+import math
+
+import pytest
+
+from base import PointType
+from conftest import MOVES, bfs, free_cells, play_greedy
+from solver.field import DistanceField
+
+
+def _follow(game_map, src, path):
+    cur = src
+    for direc in path:
+        cur = cur.adj(direc)
+        assert game_map.point(cur).type in (PointType.EMPTY, PointType.FOOD)
+    return cur
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_field_is_a_lower_bound_and_paths_are_shortest(seed):
+    field = None
+    moves = 0
+    for game_map, snake in play_greedy(seed, relocate=0.1):
+        if field is None:
+            field = DistanceField(game_map)
+        moves += 1
+        if snake.dead:
+            # La muerte reinicia el mapa y el campo se olvida del objetivo
+            assert field.target is None
+            continue
+        if not game_map.has_food():
+            continue
+        food = game_map.food
+        exact = bfs(game_map, [food])
+        if field.target == food:
+            # Cada distancia que quedó de movimientos anteriores es una cota inferior
+            for pos, d in exact.items():
+                assert field.distance(pos) <= d
+
+        head = snake.head()
+        best = min((exact[head.adj(d)] + 1 for d in MOVES if head.adj(d) in exact), default=None)
+        path = field.path(head, food, snake.direc)
+        if best is None:
+            assert not path
+        else:
+            assert len(path) == best
+            assert _follow(game_map, head, path) == food
+    # El campo se reutiliza entre movimientos mientras la comida no cambie
+    assert field.computes < moves / 2
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_freed_cells_keep_the_field_exact(seed):
+    for game_map, snake in play_greedy(seed, steps=60 * (seed + 1), blunders=0):
+        pass
+    assert not snake.dead
+    if not game_map.has_food():
+        game_map.create_rand_food()
+    field = DistanceField(game_map)
+    field.compute(game_map.food)
+    # La cola libera casillas una por una, como en Snake.move
+    for pos in list(snake.bodies)[:0:-1]:
+        game_map.point(pos).type = PointType.EMPTY
+        for watcher in game_map.watchers:
+            watcher.freed(pos)
+        exact = bfs(game_map, [game_map.food])
+        for cell in free_cells(game_map):
+            assert field.distance(cell) == exact.get(cell, math.inf)
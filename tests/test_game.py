@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+import game
+from conftest import play_greedy
+
+
+def _full_frame(game_map, size, cell):
+    """Cuadro dibujado completo por un Renderer nuevo."""
+    screen = game.pygame.Surface(size)
+    renderer = game.Renderer(screen, game_map, cell, cell)
+    renderer.draw(0)
+    game_map.remove_watcher(renderer)
+    return game.pygame.image.tostring(screen, "RGB")
+
+
+@pytest.mark.parametrize("seed", range(2))
+def test_renderer_follows_the_map_without_manual_marks(seed):
+    # Sin pantalla, pygame dibuja en memoria
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame = game.load_pygame()
+    pygame.init()
+    cell = 10
+    renderer = screen = None
+    for game_map, snake in play_greedy(seed, steps=200):
+        if renderer is None:
+            size = ((game_map.num_cols - 2) * cell, (game_map.num_rows - 2) * cell)
+            screen = pygame.display.set_mode(size)
+            renderer = game.Renderer(screen, game_map, cell, cell)
+        # Solo se redibujan las casillas que marcaron los avisos del mapa
+        renderer.draw(0)
+        assert pygame.image.tostring(screen, "RGB") == _full_frame(game_map, size, cell)
+    game_map.remove_watcher(renderer)
+    pygame.quit()
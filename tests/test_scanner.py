@@ -0,0 +1,36 @@
+from base import Direc, Pos
+from conftest import grow_snake
+from frames import FrameSource
+from scanner import Scanner, trace_body
+from synthetic import render_frame
+
+R, L, U, D = Direc.RIGHT, Direc.LEFT, Direc.UP, Direc.DOWN
+
+# Tres tramos horizontales que se tocan uno con otro
+MOVES = [R] * 6 + [U] + [L] * 8 + [U] + [R] * 8 + [U] + [L] * 3
+
+
+def _scanner(frame, rows=15, cols=17):
+    # Los cuadros se pasan directo a snake_body, la fuente no se lee
+    return Scanner((0, 0, frame.shape[1], frame.shape[0]), rows, cols, FrameSource())
+
+
+def test_snake_body_reads_touching_segments_in_order():
+    game_map, snake = grow_snake(MOVES)
+    game_map.create_food(Pos(13, 13))
+    frame, _ = render_frame(game_map, 20)
+    scanner = _scanner(frame)
+    assert scanner.snake_body(frame) == list(snake.bodies)
+
+    # Con el cuerpo de unos pasos antes, como después de una desincronización
+    _, before = grow_snake(MOVES[:-4])
+    assert scanner.snake_body(frame, list(before.bodies)) == list(snake.bodies)
+
+
+def test_trace_body_follows_prior_when_segments_touch():
+    # Un bloque de 2 x 4 se puede recorrer en U o en zigzag desde la misma esquina
+    u_shape = [Pos(1, 1), Pos(1, 2), Pos(1, 3), Pos(1, 4), Pos(2, 4), Pos(2, 3), Pos(2, 2), Pos(2, 1)]
+    zigzag = [Pos(1, 1), Pos(2, 1), Pos(2, 2), Pos(1, 2), Pos(1, 3), Pos(2, 3), Pos(2, 4), Pos(1, 4)]
+    for body in (u_shape, zigzag):
+        assert trace_body(set(body), body[0], body) == body
+    assert trace_body(set(zigzag), Pos(3, 3), zigzag) == []
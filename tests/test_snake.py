@@ -0,0 +1,45 @@
+from base import Direc, PointType, Pos
+from base.snake import body_types
+from conftest import grow_snake
+from simulation import new_game
+
+R, L, U, D = Direc.RIGHT, Direc.LEFT, Direc.UP, Direc.DOWN
+
+# Recorrido con giros en los dos sentidos y tramos que se tocan
+MOVES = [R] * 6 + [U] + [L] * 8 + [U] + [R] * 8 + [U] + [L] * 3 + [U, L, D]
+
+
+def _types(game_map, bodies):
+    return [game_map.point(pos).type for pos in bodies]
+
+
+def test_body_types_match_a_snake_that_moved():
+    game_map, snake = grow_snake(MOVES)
+    assert not snake.dead
+    bodies = list(snake.bodies)
+    assert body_types(bodies) == _types(game_map, bodies)
+
+
+def test_rebuild_matches_a_snake_that_moved():
+    moved_map, moved = grow_snake(MOVES)
+    bodies = list(moved.bodies)
+    game_map, snake = new_game(15, 17)
+    snake.rebuild(bodies)
+    assert list(snake.bodies) == bodies
+    assert snake.direc == moved.direc
+    assert _types(game_map, bodies) == _types(moved_map, bodies)
+    # Las casillas que dejó el cuerpo anterior quedan vacías
+    occupied = {
+        Pos(i, j)
+        for i, row in enumerate(game_map.content)
+        for j, point in enumerate(row)
+        if point.type.value >= PointType.HEAD_L.value
+    }
+    assert occupied == set(bodies)
+
+    # Desde ahí las dos serpientes se mueven igual
+    for direc in (L, L, U, U):
+        snake.move(direc)
+        moved.move(direc)
+        assert list(snake.bodies) == list(moved.bodies)
+        assert _types(game_map, snake.bodies) == _types(moved_map, moved.bodies)
@@ -0,0 +1,160 @@
+from math import ceil
+
+# Periodo inicial del juego de Google en velocidad normal, se corrige en linea
+DEFAULT_PERIOD = 0.1235
+
+
+class TickEstimator:
+    """
+    Estima el periodo y la fase de los ticks del juego con un lazo de seguimiento de fase (PLL).
+    Cada cuadro se reporta con observe(t, head). Cuando la cabeza cambia de casilla, el tick
+    ocurrió entre el cuadro anterior y el actual, así que se usa el punto medio como medición.
+    Los tiempos son los de time.perf_counter().
+    """
+
+    def __init__(
+        self,
+        period: float = DEFAULT_PERIOD,
+        phase_gain: float = 0.3,
+        period_gain: float = 0.05,
+        min_period: float = 0.03,
+        max_period: float = 0.5,
+        lock_ticks: int = 5,
+        lock_tolerance: float = 0.15,
+    ):
+        """
+        Args:
+        period (float): Periodo inicial en segundos.
+        phase_gain (float): Fracción del error que corrige la fase en cada tick.
+        period_gain (float): Fracción del error que corrige el periodo en cada tick.
+        min_period, max_period (float): Limites del periodo estimado.
+        lock_ticks (int): Ticks seguidos con error pequeño para considerar el lazo enganchado.
+        lock_tolerance (float): Error máximo, en fracción del periodo, para contar un tick como bueno.
+        """
+        self._init_period = period
+        self.phase_gain = phase_gain
+        self.period_gain = period_gain
+        self.min_period = min_period
+        self.max_period = max_period
+        self.lock_ticks = lock_ticks
+        self.lock_tolerance = lock_tolerance
+        self.reset()
+
+    def reset(self):
+        self._period = self._init_period
+        self._phase = None  # Tiempo estimado del ultimo tick
+        self._last_head = None
+        self._last_frame = None
+        self._good = 0
+        self.ticks = 0
+        self.missed = 0  # Ticks que pasaron sin verse un cambio de cabeza
+        self.last_error = 0.0
+
+    @property
+    def period(self):
+        return self._period
+
+    @property
+    def phase(self):
+        return self._phase
+
+    @property
+    def locked(self):
+        return self._good >= self.lock_ticks
+
+    def observe(self, t: float, head) -> bool:
+        """
+        Reporta un cuadro tomado en el tiempo t donde la cabeza está en head.
+        Regresa:
+        bool: True si en este cuadro se detecto un tick
+        """
+        prev_frame, self._last_frame = self._last_frame, t
+        if head == self._last_head:
+            return False
+        first = self._last_head is None
+        self._last_head = head
+        if first:
+            return False
+
+        measured = t if prev_frame is None else (prev_frame + t) / 2
+        if self._phase is None:
+            self._phase = measured
+            self.ticks += 1
+            return True
+
+        # Cuantos ticks pasaron desde la ultima fase estimada
+        n = max(1, round((measured - self._phase) / self._period))
+        predicted = self._phase + n * self._period
+        err = measured - predicted
+        limit = self._period / 2
+        err = max(-limit, min(limit, err))
+
+        self._phase = predicted + self.phase_gain * err
+        self._period += self.period_gain * err / n
+        self._period = max(self.min_period, min(self.max_period, self._period))
+
+        self.ticks += n
+        self.missed += n - 1
+        self.last_error = err
+        if abs(err) <= self.lock_tolerance * self._period and n == 1:
+            self._good += 1
+        else:
+            self._good = 0
+        return True
+
+    def next_tick(self, now: float) -> float:
+        """Tiempo estimado del siguiente tick después de now."""
+        if self._phase is None:
+            return now + self._period
+        n = ceil((now - self._phase) / self._period)
+        tick = self._phase + max(n, 1) * self._period
+        if tick <= now:
+            tick += self._period
+        return tick
+
+    def window(self, now: float, ticks_ahead: int = 0):
+        """Intervalo (inicio, fin) entre dos ticks en el que una tecla afecta el tick
+        número ticks_ahead + 1 contado desde now."""
+        end = self.next_tick(now) + ticks_ahead * self._period
+        return end - self._period, end
+
+    def press_time(
+        self, now: float, ticks_ahead: int = 0, fraction: float = 0.5, latency: float = 0.0
+    ) -> float:
+        """
+        Tiempo en el que hay que enviar una tecla para que llegue dentro de la ventana.
+        Parametros:
+        now (float): Tiempo actual
+        ticks_ahead (int): 0 para el siguiente tick, 1 para el que le sigue, etc.
+        fraction (float): Posición dentro de la ventana, 0 es justo después del tick anterior
+        latency (float): Retraso del envío de la tecla, se adelanta ese tiempo
+        Regresa:
+        float: Tiempo de perf_counter() para Actuator.schedule
+        """
+        start, end = self.window(now, ticks_ahead)
+        at = start + fraction * (end - start) - latency
+        return max(at, now)
+
+
+class ControlScheduler:
+    """Programa las teclas del actuador según la fase de los ticks estimada."""
+
+    def __init__(self, actuator, estimator: TickEstimator = None, fraction: float = 0.5):
+        self.actuator = actuator
+        self.estimator = estimator or TickEstimator()
+        self.fraction = fraction
+
+    def observe(self, t: float, head) -> bool:
+        return self.estimator.observe(t, head)
+
+    def latency(self) -> float:
+        """Latencia de envío medida por el backend del actuador."""
+        return self.actuator.stats.mean
+
+    def schedule(self, direc, now: float, ticks_ahead: int = 0) -> bool:
+        """Programa la dirección en la ventana del tick indicado. Mientras el lazo no esté
+        enganchado la fase no es confiable y la tecla se envía de inmediato."""
+        if not self.estimator.locked and ticks_ahead == 0:
+            return self.actuator.schedule(direc, now)
+        at = self.estimator.press_time(now, ticks_ahead, self.fraction, self.latency())
+        return self.actuator.schedule(direc, at)
@@ -0,0 +1,237 @@
+"""Modo de agente por puntos de giro.
+
+El modelo de la serpiente se adelanta al juego hasta cada cambio de dirección y deja en
+una cola los disparadores (casilla, tecla). En producción solo se vigila el bloque de la
+casilla del siguiente disparador: cuando la cabeza azul llega ahí se presiona la tecla.
+La comida y el plan se actualizan en un hilo aparte.
+"""
+
+import threading
+from collections import deque
+from time import perf_counter, sleep
+from typing import Optional
+
+from actuator import Actuator
+from base import Direc, Map, PointType, Pos, Snake
+from calibration import BoardGeometry
+from frames import FrameSource, ScreenSource
+from scanner import BLUE_COLOR_RANGES, Scanner
+from solver.config import make_solver
+
+# Proporción de azul para disparar. Cerca de la manzana se pide más azul porque la
+# lengua y la manzana tapan parte del bloque
+TRIGGER_THRESHOLD = 120 / 255
+APPLE_ZONE_THRESHOLD = 150 / 255
+APPLE_ZONE = 2
+
+
+class Trigger:
+    """Casilla que hay que vigilar y tecla que se presiona cuando la cabeza llega.
+    Si direc es None el disparador solo avisa que la serpiente se comió la manzana."""
+
+    def __init__(self, cell: Pos, direc: Optional[Direc]):
+        self.cell = cell
+        self.direc = direc
+
+    def __str__(self):
+        name = self.direc.name if self.direc is not None else "FOOD"
+        return f"Trigger({self.cell}, {name})"
+
+    __repr__ = __str__
+
+
+class TriggerAgent:
+    def __init__(
+        self,
+        geometry: BoardGeometry,
+        actuator: Actuator = None,
+        source: FrameSource = None,
+        horizon: int = 8,
+    ):
+        """
+        Args:
+        geometry (BoardGeometry): Geometría calibrada del tablero.
+        actuator (Actuator): Actuador para las teclas, por defecto uno con pyautogui.
+        source (FrameSource): Fuente del tablero completo. Por defecto la pantalla, y en ese
+        caso cada sondeo captura solo el bloque del disparador.
+        horizon (int): Máximo de disparadores planeados por adelantado.
+        """
+        self.geometry = geometry
+        self.actuator = actuator or Actuator()
+        self.horizon = horizon
+
+        self.map = Map(geometry.rows + 2, geometry.cols + 2)
+        mid = geometry.rows // 2 + 1
+        self.snake = Snake(
+            self.map,
+            Direc.RIGHT,
+            [Pos(mid, 5), Pos(mid, 4), Pos(mid, 3), Pos(mid, 2)],
+            [PointType.HEAD_D] + [PointType.BODY_HOR] * 3,
+        )
+        self.solver = make_solver(self.snake)
+
+        self._source = source
+        block = geometry.block_size
+        if source is None:
+            # Sondeo de un solo bloque con buffers fijos; la región se mueve en cada disparador
+            self._cell_source = ScreenSource(geometry.cell_region(0, 0))
+            self._probe_scanner = Scanner((0, 0, block, block), 1, 1, self._cell_source)
+        else:
+            self._probe_scanner = Scanner(
+                geometry.region, geometry.rows, geometry.cols, source
+            )
+
+        self._triggers = deque()
+        self._cond = threading.Condition()
+        self._food_eaten = threading.Event()
+        self._running = False
+        self._planner = None
+        self._apple = None  # Ultima manzana vista en pantalla
+
+        self.polls = 0
+        self.presses = 0
+
+    @property
+    def triggers(self):
+        with self._cond:
+            return list(self._triggers)
+
+    def set_food(self, pos: Pos):
+        """Pone la comida en el modelo antes de empezar, ej: la posición inicial conocida."""
+        self.map.rm_food()
+        self.map.create_food(pos)
+        self._apple = pos
+
+    def run(self, max_presses: int = None, timeout: float = None):
+        """Vigila los disparadores hasta que el modelo muere o se cumple un limite."""
+        self._running = True
+        if not self.map.has_food():
+            # Sin comida conocida se busca la manzana en pantalla antes de planear
+            self._food_eaten.set()
+        self._planner = threading.Thread(target=self._plan_loop, daemon=True)
+        self._planner.start()
+
+        start = perf_counter()
+        try:
+            while self._running:
+                if max_presses is not None and self.presses >= max_presses:
+                    break
+                if timeout is not None and perf_counter() - start > timeout:
+                    break
+                with self._cond:
+                    if not self._triggers:
+                        if self.snake.dead:
+                            break
+                        self._cond.wait(0.05)
+                        continue
+                    trigger = self._triggers[0]
+
+                if self._probe(trigger.cell) > self._threshold(trigger.cell):
+                    if trigger.direc is not None:
+                        self.actuator.schedule(trigger.direc)
+                        self.presses += 1
+                    else:
+                        self._food_eaten.set()
+                    with self._cond:
+                        self._triggers.popleft()
+                        self._cond.notify_all()
+        finally:
+            self.stop()
+
+        elapsed = perf_counter() - start
+        if elapsed > 0:
+            print(f"Sondeos: {self.polls} ({self.polls / elapsed:.0f}/s), teclas: {self.presses}")
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._food_eaten.set()
+        if self._planner is not None and self._planner is not threading.current_thread():
+            self._planner.join()
+
+    def _threshold(self, cell: Pos) -> float:
+        apple = self._apple
+        if apple is not None and max(abs(cell.x - apple.x), abs(cell.y - apple.y)) <= APPLE_ZONE:
+            return APPLE_ZONE_THRESHOLD
+        return TRIGGER_THRESHOLD
+
+    def _probe(self, cell: Pos) -> float:
+        """Proporción de azul en el bloque de la casilla."""
+        self.polls += 1
+        if self._source is None:
+            x, y, _, _ = self.geometry.cell_region(cell.x - 1, cell.y - 1)
+            self._cell_source.move_to(x, y)
+            frame = self._cell_source.read()
+            return self._probe_scanner.cell_ratio(frame, Pos(1, 1), BLUE_COLOR_RANGES)
+        frame = self._source.read()
+        if frame is None:
+            self._running = False
+            return 0.0
+        return self._probe_scanner.cell_ratio(frame, cell, BLUE_COLOR_RANGES)
+
+    def _plan_loop(self):
+        # El escáner del tablero completo se crea en este hilo porque mss no se comparte entre hilos
+        if self._source is None:
+            board = Scanner(self.geometry.region, self.geometry.rows, self.geometry.cols)
+        else:
+            board = Scanner(
+                self.geometry.region, self.geometry.rows, self.geometry.cols, self._source
+            )
+
+        while self._running and not self.snake.dead:
+            with self._cond:
+                while self._running and len(self._triggers) >= self.horizon:
+                    self._cond.wait()
+            if not self._running:
+                return
+
+            if not self.map.has_food():
+                # El plan no puede seguir hasta ver donde aparece la nueva manzana
+                self._food_eaten.wait()
+                self._food_eaten.clear()
+                if not self._running:
+                    return
+                food = self._scan_food(board)
+                if food is None:
+                    # Se vuelve a intentar en la siguiente vuelta
+                    self._food_eaten.set()
+                    continue
+                self.set_food(food)
+
+            self._plan_step()
+
+    def _plan_step(self):
+        """Avanza el modelo un paso y agrega un disparador si cambia la dirección."""
+        direc = self.solver.next_direc()
+        head = self.snake.head()
+        trigger = None
+        if direc != self.snake.direc:
+            trigger = Trigger(head, direc)
+
+        had_food = self.map.has_food()
+        self.snake.move(direc)
+        if had_food and not self.map.has_food():
+            # Se avisa cuando la cabeza real llegue a la manzana para buscar la siguiente
+            food_trigger = Trigger(self.snake.head(), None)
+        else:
+            food_trigger = None
+
+        with self._cond:
+            if trigger is not None:
+                self._triggers.append(trigger)
+            if food_trigger is not None:
+                self._triggers.append(food_trigger)
+            self._cond.notify_all()
+
+    def _scan_food(self, board: Scanner, retries: int = 20) -> Optional[Pos]:
+        """Busca en el tablero completo una manzana distinta a la anterior."""
+        for _ in range(retries):
+            frame = board.capture_region()
+            if frame is None:
+                return None
+            pos = board.apple_coords(frame)
+            if pos != Pos(0, 0) and pos != self._apple and self.map.is_empty(pos):
+                return pos
+            sleep(0.005)
+        return None